@@ -1,6 +1,9 @@
 from _icepyx_version import version as __version__
 
+from icepyx.core.batch import BatchQuery
+from icepyx.core.local_catalog import LocalCatalog
 from icepyx.core.query import GenQuery, Query
 from icepyx.core.read import Read
+from icepyx.core.store import GranuleStore
 from icepyx.core.variables import Variables
 from icepyx.quest.quest import Quest
@@ -66,6 +66,8 @@ def _fmt_readable_granules(dset, **kwds):
         List of 91-day orbital cycle strings to query
     tracks : list
         List of Reference Ground Track (RGT) strings to query
+    regions : list
+        List of granule region strings to query (for each cycle and RGT)
     files : list
         List of full or partial file name strings to query
 
@@ -82,20 +84,28 @@ def _fmt_readable_granules(dset, **kwds):
         # default character wildcards for cycles and tracks
         kwargs.setdefault("cycles", ["??"])
         kwargs.setdefault("tracks", ["????"])
+        kwargs.setdefault("regions", ["??"])
         # for each available cycle of interest
         for c in kwargs["cycles"]:
             # for each available track of interest
             for t in kwargs["tracks"]:
-                # use single character wildcards "?" for date strings
-                # and ATLAS granule region number
-                if dset in ("ATL07", "ATL10", "ATL20", "ATL21"):
-                    granule_name = "{0}-??_{1}_{2}{3}??_*".format(dset, 14 * "?", t, c)
-                elif dset in ("ATL11",):
-                    granule_name = "{0}_{1}??_*".format(dset, t)
-                else:
-                    granule_name = "{0}_{1}_{2}{3}??_*".format(dset, 14 * "?", t, c)
-                # append the granule
-                readable_granule_list.append(granule_name)
+                # for each granule region of interest
+                for r in kwargs["regions"]:
+                    # use single character wildcards "?" for date strings
+                    # and (by default) ATLAS granule region number
+                    if dset in ("ATL07", "ATL10", "ATL20", "ATL21"):
+                        granule_name = "{0}-??_{1}_{2}{3}{4}_*".format(
+                            dset, 14 * "?", t, c, r
+                        )
+                    elif dset in ("ATL11",):
+                        granule_name = "{0}_{1}??_*".format(dset, t)
+                    else:
+                        granule_name = "{0}_{1}_{2}{3}{4}_*".format(
+                            dset, 14 * "?", t, c, r
+                        )
+                    # append the granule
+                    if granule_name not in readable_granule_list:
+                        readable_granule_list.append(granule_name)
     # extend with explicitly named files (full or partial)
     kwargs.setdefault("files", [])
     readable_granule_list.extend(kwargs["files"])
@@ -0,0 +1,189 @@
+import json
+from pathlib import Path
+from typing import Union
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from icepyx.core.download import download_files
+import icepyx.core.granules as granules
+from icepyx.core.query import Query
+
+
+class BatchQuery:
+    """
+    Search for and download ICESat-2 data for many areas of interest (AOIs) at once.
+
+    Rather than a separate Query (with its own CMR search and download) for each AOI,
+    a single search is made over the combined extent of all the AOIs.
+    The returned granules are then assigned to each AOI whose geometry
+    intersects the granule footprint, and each granule is downloaded only once,
+    no matter how many AOIs it covers.
+
+    Parameters
+    ----------
+    product : string
+        ICESat-2 data product ID, also known as "short name" (e.g. ATL03).
+    aois : geopandas.GeoDataFrame
+        The areas of interest, one per row.
+        The index (or `id_column`) identifies each AOI in the manifest.
+    date_range, start_time, end_time, version, cycles, tracks :
+        As for Query, applied to all AOIs.
+    id_column : string, default None
+        Column of `aois` identifying each AOI. By default, the index is used.
+
+    See Also
+    --------
+    icepyx.Query
+
+    Examples
+    --------
+    >>> aois = gpd.read_file("glacier_outlets.geojson") # doctest: +SKIP
+    >>> batch = ipx.BatchQuery("ATL06", aois, ["2019-02-20", "2019-02-28"], id_column="name") # doctest: +SKIP
+    >>> batch.avail_granules() # doctest: +SKIP
+    >>> batch.manifest["Jakobshavn"] # doctest: +SKIP
+    ['ATL06_20190221121851_08410203_006_01.h5', 'ATL06_20190225121032_09020203_006_01.h5']
+    """
+
+    def __init__(
+        self,
+        product: str,
+        aois: gpd.GeoDataFrame,
+        date_range=None,
+        start_time=None,
+        end_time=None,
+        version=None,
+        cycles=None,
+        tracks=None,
+        id_column: Union[str, None] = None,
+    ):
+        if aois.crs is not None:
+            aois = aois.to_crs("epsg:4326")
+        if id_column is not None:
+            aois = aois.set_index(id_column)
+        assert aois.index.is_unique, "Each area of interest must have a unique ID"
+        self.aois = aois
+
+        # a single search over the bounding box of all the AOIs
+        self.query = Query(
+            product,
+            [float(b) for b in aois.total_bounds],
+            date_range,
+            start_time=start_time,
+            end_time=end_time,
+            version=version,
+            cycles=cycles,
+            tracks=tracks,
+        )
+
+    def __str__(self):
+        return "{0} areas of interest\n{1}".format(len(self.aois), self.query)
+
+    # ----------------------------------------------------------------------
+    # Properties
+
+    @property
+    def assignments(self) -> pd.DataFrame:
+        """
+        The AOI ("aoi") and granule ID ("granule") of each AOI-granule intersection.
+        """
+        if not hasattr(self, "_assignments"):
+            self.avail_granules()
+        return self._assignments
+
+    @property
+    def manifest(self) -> dict:
+        """
+        The granule IDs intersecting each AOI, as a dictionary keyed by AOI ID.
+        AOIs without any granules have an empty list.
+        """
+        grouped = self.assignments.groupby("aoi", sort=False)["granule"]
+        by_aoi = {aoi: list(grans) for aoi, grans in grouped}
+        return {aoi: by_aoi.get(aoi, []) for aoi in self.aois.index}
+
+    # ----------------------------------------------------------------------
+    # Methods
+
+    def avail_granules(self, **kwargs) -> pd.DataFrame:
+        """
+        Search for the available granules over the combined extent of all the AOIs
+        and assign them to the AOIs their footprints intersect.
+        Granules without a footprint are assigned to every AOI.
+
+        Parameters
+        ----------
+        **kwargs
+            Passed to Query.avail_granules (e.g. shards or cache_ttl).
+
+        Returns
+        -------
+        pandas.DataFrame
+            The AOI-granule assignments (see `assignments`).
+        """
+        self.query.avail_granules(**kwargs)
+        grans = self.query.granules.avail
+
+        footprints = np.array(
+            [granules._granule_footprint(gran) for gran in grans], dtype=object
+        )
+        aoi_idx, gran_idx = shapely.STRtree(footprints).query(
+            np.asarray(self.aois.geometry), predicate="intersects"
+        )
+        no_footprint = np.flatnonzero(shapely.is_missing(footprints))
+        aoi_idx = np.concatenate(
+            [aoi_idx, np.repeat(np.arange(len(self.aois)), len(no_footprint))]
+        )
+        gran_idx = np.concatenate([gran_idx, np.tile(no_footprint, len(self.aois))])
+
+        ids = np.array([gran["producer_granule_id"] for gran in grans], dtype=object)
+        order = np.lexsort((gran_idx, aoi_idx))
+        self._assignments = pd.DataFrame(
+            {
+                "aoi": self.aois.index[aoi_idx[order]],
+                "granule": ids[gran_idx[order]],
+            }
+        )
+        return self._assignments
+
+    def download_granules(
+        self, path: Union[str, Path], max_workers: int = 4, priority: str = "bulk"
+    ) -> dict:
+        """
+        Download (whole) each granule intersecting at least one AOI, once,
+        and write a manifest of the files for each AOI to "manifest.json" in `path`.
+
+        Parameters
+        ----------
+        path : str or Path
+            The directory where granules should be saved.
+        max_workers : int, default 4
+            Maximum number of granules downloaded at the same time.
+            Interrupted downloads are resumed when this is run again.
+        priority : {"interactive", "bulk"}, default "bulk"
+            Priority class of the downloads. By default, these (typically large)
+            downloads give way to interactive ones (see `scheduler.DownloadScheduler`).
+
+        Returns
+        -------
+        dict
+            The downloaded file paths for each AOI, keyed by AOI ID.
+        """
+        path = Path(path)
+        wanted = set(self.assignments["granule"])
+        grans = [
+            gran
+            for gran in self.query.granules.avail
+            if gran["producer_granule_id"] in wanted
+        ]
+        links = granules.catalog(grans)["data_url"].dropna().tolist()
+        download_files(links, path, max_workers=max_workers, priority=priority)
+
+        manifest = {
+            str(aoi): [str(path / gran) for gran in grans]
+            for aoi, grans in self.manifest.items()
+        }
+        with open(path / "manifest.json", "w") as fid:
+            json.dump(manifest, fid, indent=2)
+        return manifest
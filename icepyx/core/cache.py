@@ -0,0 +1,76 @@
+"""Local on-disk caching of metadata that icepyx repeatedly requests from remote services."""
+
+import gzip
+import json
+import os
+from pathlib import Path
+import tempfile
+from typing import Any, Union
+
+CACHE_DIR_ENV = "ICEPYX_CACHE_DIR"
+
+
+def cache_dir(*subdirs: str) -> Path:
+    """
+    Return the (created if needed) icepyx cache directory, or a subdirectory of it.
+
+    The location can be set with the ``ICEPYX_CACHE_DIR`` environment variable.
+    Otherwise ``$XDG_CACHE_HOME/icepyx`` is used, falling back to ``~/.cache/icepyx``.
+
+    Parameters
+    ----------
+    *subdirs : str
+        Optional subdirectory components within the cache directory.
+
+    Examples
+    --------
+    >>> import os
+    >>> os.environ["ICEPYX_CACHE_DIR"] = "/tmp/icepyx_cache"
+    >>> str(cache_dir("variables"))
+    '/tmp/icepyx_cache/variables'
+    >>> del os.environ["ICEPYX_CACHE_DIR"]
+    """
+    root = os.environ.get(CACHE_DIR_ENV)
+    if root is None:
+        xdg = os.environ.get("XDG_CACHE_HOME", os.path.join("~", ".cache"))
+        root = os.path.join(xdg, "icepyx")
+
+    path = Path(root).expanduser().joinpath(*subdirs)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def read_json(path: Union[str, Path]) -> Union[Any, None]:
+    """
+    Read a cached JSON file, returning None if it is missing or unreadable.
+    Files with a ``.gz`` suffix are decompressed.
+    """
+    opener = gzip.open if str(path).endswith(".gz") else open
+    try:
+        with opener(path, "rt") as fid:
+            return json.load(fid)
+    except (OSError, EOFError, ValueError):
+        return None
+
+
+def write_json(path: Union[str, Path], content: Any) -> None:
+    """
+    Atomically write content to a cached JSON file.
+    Files with a ``.gz`` suffix are gzip compressed.
+
+    The file is written to a temporary file in the same directory and renamed into
+    place, so concurrent readers never see a partially written cache entry.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            if path.suffix == ".gz":
+                with gzip.open(raw, "wt") as fid:
+                    json.dump(content, fid)
+            else:
+                raw.write(json.dumps(content).encode())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
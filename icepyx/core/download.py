@@ -0,0 +1,201 @@
+"""
+Parallel, resumable downloads of whole files (e.g. granules) over HTTPS.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
+import os
+from pathlib import Path
+import time
+from typing import Union
+from urllib.parse import urlsplit
+
+import earthaccess
+
+from icepyx.core.exceptions import DownloadError
+from icepyx.core.scheduler import scheduler
+
+CHUNK_SIZE = 2**20
+
+
+def _earthdata_session():
+    """
+    Return a requests session authenticated with NASA Earthdata Login.
+    """
+    earthaccess.login()
+    return earthaccess.get_requests_https_session()
+
+
+def _verify(path: Path, size=None, checksum=None):
+    """
+    Check the size (bytes) and checksum ((algorithm, value) tuple) of a file.
+    """
+    if size is not None and path.stat().st_size != size:
+        raise ValueError(
+            f"expected {size} bytes but downloaded {path.stat().st_size} bytes"
+        )
+    if checksum is not None:
+        algorithm, value = checksum
+        # CMR algorithm names are e.g. "MD5" or "SHA-256"
+        h = hashlib.new(algorithm.replace("-", "").lower())
+        with open(path, "rb") as fid:
+            for chunk in iter(lambda: fid.read(CHUNK_SIZE), b""):
+                h.update(chunk)
+        if h.hexdigest().lower() != value.lower():
+            raise ValueError(f"{algorithm} checksum does not match")
+
+
+def _download_file(
+    session,
+    url: str,
+    dest: Path,
+    size=None,
+    checksum=None,
+    overwrite=False,
+    priority="interactive",
+) -> int:
+    """
+    Download url to dest, resuming from a partial download if there is one.
+    Data is written to a ".part" file, which is renamed to dest once it is complete
+    and verified. The transfer is scheduled (and throttled) by the shared
+    download scheduler. Returns the number of bytes transferred.
+    """
+    if dest.exists() and not overwrite:
+        return 0
+
+    part = dest.with_name(dest.name + ".part")
+    offset = part.stat().st_size if part.exists() else 0
+    # ask for the file as stored, so byte offsets and lengths are of the file itself
+    headers = {"Accept-Encoding": "identity"}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+    transferred = 0
+    sched = scheduler()
+
+    with (
+        sched.slot(url, priority=priority),
+        session.get(url, headers=headers, stream=True) as response,
+    ):
+        # 416: the partial download already has all the requested bytes
+        if response.status_code != 416:
+            response.raise_for_status()
+            if response.status_code != 206:
+                # the server doesn't support ranges, so start from the beginning
+                offset = 0
+
+            total = None
+            content_range = response.headers.get("Content-Range", "")
+            if content_range and not content_range.endswith("*"):
+                total = int(content_range.rsplit("/", 1)[-1])
+            elif "Content-Length" in response.headers and offset == 0:
+                total = int(response.headers["Content-Length"])
+
+            with open(part, "ab" if offset else "wb") as fid:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    sched.throttle(len(chunk), priority=priority)
+                    fid.write(chunk)
+                    transferred += len(chunk)
+
+            # an interrupted transfer keeps the partial file, to be resumed later
+            if total is not None and part.stat().st_size != total:
+                raise IOError(
+                    f"connection closed after {part.stat().st_size} of {total} bytes"
+                )
+
+    try:
+        _verify(part, size=size, checksum=checksum)
+    except ValueError:
+        part.unlink()
+        raise
+    os.replace(part, dest)
+    return transferred
+
+
+def download_files(
+    urls: list[str],
+    path: Union[str, Path],
+    max_workers: int = 4,
+    overwrite: bool = False,
+    file_info: Union[dict, None] = None,
+    session=None,
+    priority: str = "interactive",
+) -> list[str]:
+    """
+    Download files in parallel, resuming any partial downloads from a previous attempt.
+
+    Each file is downloaded to a ".part" file, which is renamed to its final name only
+    once it is complete (and verified, if `file_info` is given),
+    so existing files are always complete.
+    If a download is interrupted, running it again only transfers the missing bytes
+    (using HTTP range requests).
+
+    Parameters
+    ----------
+    urls : list of str
+        The (https) URLs of the files.
+    path : str or Path
+        The directory where files should be saved.
+    max_workers : int, default 4
+        Maximum number of files downloaded at the same time.
+    overwrite : bool, default False
+        Download files that already exist in `path` again.
+    file_info : dict, default None
+        Expected "size" (bytes) and "checksum" ((algorithm, value) tuple) of the files,
+        keyed by file name, as returned by `granules.Granules.archive_info`.
+        Files that don't match are deleted and reported as failed.
+    session : requests.Session, default None
+        The session to download with. By default, a session authenticated with
+        NASA Earthdata Login.
+    priority : {"interactive", "bulk"}, default "interactive"
+        Priority class of the downloads. Waiting interactive downloads are started
+        before bulk ones, and bulk downloads get a smaller share of a capped bandwidth
+        (see `scheduler.DownloadScheduler`).
+
+    Returns
+    -------
+    list of str
+        The paths of the downloaded files, in the order of `urls`.
+
+    Raises
+    ------
+    DownloadError
+        If any of the files could not be downloaded (after all the others have finished).
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    file_info = file_info or {}
+    if session is None:
+        session = _earthdata_session()
+
+    dests = [path / Path(urlsplit(url).path).name for url in urls]
+    failed = {}
+    transferred = 0
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                _download_file,
+                session,
+                url,
+                dest,
+                overwrite=overwrite,
+                priority=priority,
+                **file_info.get(dest.name, {}),
+            ): url
+            for url, dest in zip(urls, dests)
+        }
+        for future in as_completed(futures):
+            try:
+                transferred += future.result()
+            except Exception as e:
+                failed[futures[future]] = e
+
+    elapsed = time.monotonic() - start
+    print(
+        f"Downloaded {len(urls) - len(failed)} of {len(urls)} files "
+        f"({transferred / 2**20:.1f} MB in {elapsed:.1f} s, "
+        f"{transferred / 2**20 / max(elapsed, 1e-6):.1f} MB/s)"
+    )
+    if failed:
+        raise DownloadError(failed)
+    return [str(dest) for dest in dests]
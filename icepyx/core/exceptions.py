@@ -53,3 +53,32 @@ class ExhaustiveTypeGuardException(TypeGuardException):
     Used exclusively in cases where the typechecker needs a typeguard to tell it that a
     check is exhaustive.
     """
+
+
+class DownloadError(Exception):
+    """
+    Raised when one or more files could not be downloaded.
+    The files that were downloaded are kept, so the download can be resumed.
+    """
+
+    def __init__(self, failed):
+        self.failed = failed
+        super().__init__()
+
+    def __str__(self):
+        errors = "\n".join(f"{url}: {err}" for url, err in self.failed.items())
+        return f"{len(self.failed)} file(s) could not be downloaded:\n{errors}"
+
+
+class PipelineError(DownloadError):
+    """
+    Raised when one or more files could not be downloaded or processed
+    by a download pipeline.
+    """
+
+    def __str__(self):
+        errors = "\n".join(f"{url}: {err}" for url, err in self.failed.items())
+        return (
+            f"{len(self.failed)} file(s) could not be downloaded or processed:\n"
+            f"{errors}"
+        )
@@ -1,17 +1,24 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 import datetime
+import hashlib
 import json
 import logging
-import re
+from pathlib import Path
+from typing import Iterator, Union
 
 from deprecated import deprecated
 import numpy as np
+import pandas as pd
 import requests
+import shapely
 
 import icepyx.core.APIformatting as apifmt
 from icepyx.core.auth import EarthdataAuthMixin
+import icepyx.core.cache as cache
 import icepyx.core.exceptions
+import icepyx.core.http_client as http_client
 from icepyx.core.types import CMRParams
 from icepyx.core.urls import GRANULE_SEARCH_BASE_URL
 
@@ -20,33 +27,378 @@ def info(grans):
     """
     Return some basic summary information about a set of granules for an
     query object. Granule info may be from a list of those available
-    from NSIDC (for ordering/download) or a list of granules present on the
-    file system.
+    from NSIDC (for ordering/download), a list of granules present on the
+    file system, or a granule catalog (see `catalog`).
     """
     assert len(grans) > 0, "Your data object has no granules associated with it"
     gran_info = {}
     gran_info.update({"Number of available granules": len(grans)})
 
-    gran_sizes = [float(gran["granule_size"]) for gran in grans]
+    if isinstance(grans, pd.DataFrame):
+        gran_sizes = grans["size_mb"].to_numpy(dtype=float)
+    else:
+        gran_sizes = np.array([gran["granule_size"] for gran in grans], dtype=float)
     gran_info.update({"Average size of granules (MB)": np.mean(gran_sizes)})
     gran_info.update({"Total size of all granules (MB)": sum(gran_sizes)})
 
     return gran_info
 
 
+# named groups for the parts of ICESat-2 granule IDs
+# (see `gran_IDs` for a description of each part)
+_GRANULE_ID_PATTERN = (
+    r"(?P<product>ATL\d{2})(?P<hemisphere>-\d{2})?_(?P<datetime>\d{14})"
+    r"_(?P<rgt>\d{4})(?P<cycle>\d{2})(?P<region>\d{2})"
+    r"_(?P<release>\d{3})_(?P<version>\d{2})(?P<aux>.*?)\.(?P<suffix>.*?)$"
+)
+
+
+def parse_granule_ids(ids, raw=False) -> pd.DataFrame:
+    """
+    Parse the parts of many ICESat-2 granule IDs (file names) in a single pass.
+
+    Parameters
+    ----------
+    ids : list or pandas.Series of str
+        Granule IDs or file names.
+    raw : bool, default False
+        Return each part as the (zero padded) string from the granule ID,
+        rather than as typed columns.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per granule ID, with the columns product, hemisphere, datetime, rgt, cycle,
+        region, release, version, aux and suffix.
+        Numeric parts are nullable integers and datetime is a datetime64 column.
+        Granule IDs that do not follow the ICESat-2 file naming convention
+        (e.g. gridded products) have missing values.
+
+    Examples
+    --------
+    >>> parse_granule_ids(["ATL06_20190221121851_08410203_006_01.h5",
+    ...                    "ATL07-02_20190624063616_13290301_006_01.h5"])[["product", "datetime", "rgt", "cycle"]]
+      product            datetime   rgt  cycle
+    0   ATL06 2019-02-21 12:18:51   841      2
+    1   ATL07 2019-06-24 06:36:16  1329      3
+    """
+    parts = pd.Series(ids, dtype=str).str.extract(_GRANULE_ID_PATTERN)
+    if raw:
+        return parts
+
+    parts["product"] = parts["product"].astype("category")
+    parts["datetime"] = pd.to_datetime(parts["datetime"], format="%Y%m%d%H%M%S")
+    for col in ["rgt", "cycle", "region", "release", "version"]:
+        parts[col] = pd.to_numeric(parts[col]).astype("Int16")
+    return parts
+
+
+def _canonical_ids(ids) -> pd.Series:
+    """
+    Return the ICESat-2 granule IDs in file names, without any prefix (e.g. the item ID
+    harmony-py adds to staged results) or auxiliary suffix (e.g. of subset outputs).
+    Names that do not follow the ICESat-2 file naming convention are returned unchanged.
+    """
+    names = pd.Series(ids, dtype=str)
+    p = parse_granule_ids(names, raw=True)
+    canonical = (
+        p["product"]
+        + p["hemisphere"].fillna("")
+        + "_"
+        + p["datetime"]
+        + "_"
+        + p["rgt"]
+        + p["cycle"]
+        + p["region"]
+        + "_"
+        + p["release"]
+        + "_"
+        + p["version"]
+        + "."
+        + p["suffix"]
+    )
+    return canonical.fillna(names)
+
+
+_DATA_REL = "http://esipfed.org/ns/fedsearch/1.1/data#"
+_S3_REL = "http://esipfed.org/ns/fedsearch/1.1/s3#"
+
+
+def _granule_links(gran):
+    """
+    Return the (https data, s3) links of a CMR granule entry, either of which may be None.
+    """
+    data_url = s3_url = None
+    for link in gran.get("links", []):
+        href = link["href"]
+        if (
+            data_url is None
+            and link.get("rel") == _DATA_REL
+            and link.get("type") in ["application/x-hdf5", "application/x-hdfeos"]
+        ):
+            data_url = href
+        elif s3_url is None and href.startswith("s3") and href.endswith((".h5", "nc")):
+            s3_url = href
+    return data_url, s3_url
+
+
+def _umm_files(item: dict) -> dict:
+    """
+    Return the size (in bytes) and checksum ((algorithm, value) tuple) of each data file
+    of a CMR UMM-JSON granule search result, keyed by file name.
+    """
+    files = {}
+    data_granule = item["umm"].get("DataGranule", {})
+    for f in data_granule.get("ArchiveAndDistributionInformation", []):
+        file_info = {}
+        if "SizeInBytes" in f:
+            file_info["size"] = int(f["SizeInBytes"])
+        if "Checksum" in f:
+            file_info["checksum"] = (f["Checksum"]["Algorithm"], f["Checksum"]["Value"])
+        files[f["Name"]] = file_info
+    return files
+
+
+def _granule_bounds(gran):
+    """
+    Return the (west, south, east, north) bounds of the footprint of a CMR granule entry.
+    CMR polygons and boxes are given as space separated latitude, longitude pairs.
+    """
+    if "polygons" in gran:
+        rings = [ring for polygon in gran["polygons"] for ring in polygon]
+    elif "boxes" in gran:
+        rings = gran["boxes"]
+    else:
+        return (np.nan,) * 4
+    latlon = np.array(" ".join(rings).split(), dtype=float).reshape(-1, 2)
+    return (
+        latlon[:, 1].min(),
+        latlon[:, 0].min(),
+        latlon[:, 1].max(),
+        latlon[:, 0].max(),
+    )
+
+
+def catalog(grans) -> pd.DataFrame:
+    """
+    Build a compact, columnar catalog from a list of CMR granule entries.
+
+    Each row is a granule, with columns for the granule ID, the product, acquisition
+    datetime, RGT, cycle, granule region, release and version (parsed from the granule ID),
+    the granule size (MB), https and s3 data links, and the footprint bounds.
+    Parts of the granule ID that cannot be parsed (e.g. for gridded products) are missing.
+
+    Parameters
+    ----------
+    grans : list of dictionaries
+        List of CMR granule json dictionaries, as in `Granules.avail`.
+
+    Examples
+    --------
+    >>> grans = [{"producer_granule_id": "ATL06_20190221121851_08410203_006_01.h5",
+    ...           "granule_size": "55.1",
+    ...           "boxes": ["68.0 -55.0 71.0 -48.0"]}]
+    >>> catalog(grans)[["id", "rgt", "cycle", "region", "west", "north"]]
+                                            id  rgt  cycle  region  west  north
+    0  ATL06_20190221121851_08410203_006_01.h5  841      2       3 -55.0   71.0
+    """
+    ids = pd.Series([gran["producer_granule_id"] for gran in grans], dtype=str)
+    parts = parse_granule_ids(ids)
+
+    cat = pd.DataFrame({"id": ids})
+    for col in ["product", "datetime", "rgt", "cycle", "region", "release", "version"]:
+        cat[col] = parts[col]
+    cat["size_mb"] = np.array(
+        [gran.get("granule_size", np.nan) for gran in grans], dtype=float
+    )
+
+    links = [_granule_links(gran) for gran in grans]
+    cat["data_url"] = pd.Series([link[0] for link in links], dtype=object)
+    cat["s3_url"] = pd.Series([link[1] for link in links], dtype=object)
+
+    bounds = np.array([_granule_bounds(gran) for gran in grans], dtype=float).reshape(
+        -1, 4
+    )
+    for i, col in enumerate(["west", "south", "east", "north"]):
+        cat[col] = bounds[:, i]
+
+    return cat
+
+
+def _granule_footprint(gran, shift_lons=False):
+    """
+    Return the footprint of a CMR granule entry as a shapely geometry (in lon, lat),
+    or None if it has no footprint or crosses the antimeridian and `shift_lons` is False.
+    With `shift_lons`, negative longitudes are shifted by 360 degrees to match
+    extents that cross the antimeridian.
+    """
+
+    def lonlat(ring):
+        latlon = np.array(ring.split(), dtype=float).reshape(-1, 2)
+        return latlon[:, ::-1]
+
+    if "polygons" in gran:
+        polygons = [[lonlat(ring) for ring in polygon] for polygon in gran["polygons"]]
+    elif "boxes" in gran:
+        polygons = []
+        for b in gran["boxes"]:
+            s, w, n, e = (float(v) for v in b.split())
+            polygons.append([np.array([[w, s], [e, s], [e, n], [w, n], [w, s]])])
+    else:
+        return None
+
+    lons = np.concatenate([ring[:, 0] for polygon in polygons for ring in polygon])
+    crosses = lons.max() - lons.min() > 180
+    if crosses or shift_lons:
+        if not shift_lons:
+            return None
+        for polygon in polygons:
+            for ring in polygon:
+                ring[ring[:, 0] < 0, 0] += 360
+
+    return shapely.MultiPolygon(
+        [shapely.Polygon(polygon[0], polygon[1:]) for polygon in polygons]
+    )
+
+
+def footprint_filter(grans, extent) -> list:
+    """
+    Return the granules whose footprint intersects the spatial extent.
+
+    CMR matches granules using their bounding metadata, so the granules returned by a
+    polygon search may not actually overlap the polygon. Each granule's footprint polygon
+    is intersected with the extent using a spatial index.
+    Granules without a usable footprint are kept.
+
+    Parameters
+    ----------
+    grans : list of dictionaries
+        List of CMR granule json dictionaries, as in `Granules.avail`.
+    extent : geopandas.GeoDataFrame or shapely geometry
+        The spatial extent (in lon, lat), e.g. `Spatial.extent_as_gdf`.
+        Extents crossing the antimeridian have longitudes from 0 to 360.
+
+    Examples
+    --------
+    >>> grans = [{"producer_granule_id": "a", "boxes": ["68.0 -55.0 71.0 -48.0"]},
+    ...          {"producer_granule_id": "b", "boxes": ["68.0 -65.0 71.0 -60.0"]},
+    ...          {"producer_granule_id": "c"}]
+    >>> [g["producer_granule_id"] for g in footprint_filter(grans, shapely.box(-50, 69, -49, 70))]
+    ['a', 'c']
+    """
+    if len(grans) == 0:
+        return []
+    geoms = np.asarray(getattr(extent, "geometry", [extent]))
+    shift_lons = shapely.total_bounds(geoms)[2] > 180
+
+    footprints = np.array(
+        [_granule_footprint(gran, shift_lons=shift_lons) for gran in grans],
+        dtype=object,
+    )
+    # missing footprints are not indexed by the tree
+    keep = shapely.is_missing(footprints)
+    _, hits = shapely.STRtree(footprints).query(geoms, predicate="intersects")
+    keep[hits] = True
+
+    return [gran for gran, k in zip(grans, keep) if k]
+
+
+# version of the cached search results format
+_CMR_CACHE_VERSION = 2
+
+
+def _cmr_cache_file(CMRparams: CMRParams) -> Path:
+    """
+    Return the path of the cached search results for a set of CMR search parameters.
+
+    Parameters are sorted before being formatted with `APIformatting.to_string`,
+    so equivalent searches share a cache entry regardless of key order.
+    """
+    normalized = apifmt.to_string(
+        {
+            k: sorted(v) if isinstance(v, list) else v
+            for k, v in sorted(CMRparams.items())
+        }
+    )
+    # the format version is part of the key, so results cached by versions of icepyx
+    # that stored different entries are not reused
+    key = hashlib.sha256(f"{_CMR_CACHE_VERSION}:{normalized}".encode()).hexdigest()
+    return cache.cache_dir("cmr").joinpath(f"{key}.json.gz")
+
+
+def _shard_params(CMRparams: CMRParams, shards: int) -> list[CMRParams]:
+    """
+    Split a set of CMR search parameters into (at most) the requested number of searches
+    that together cover the original search.
+
+    The temporal range is split into equal-length intervals.
+    If there is no temporal range, the list of readable granule names
+    (from the cycles and tracks) is split instead.
+    Parameters that cannot be split are returned unchanged as a single search.
+
+    Examples
+    --------
+    >>> CMRparams = {'temporal': '2019-02-20T00:00:00Z,2019-02-28T00:00:00Z',
+    ...             'bounding_box': '-55.0,68.0,-48.0,71.0'}
+    >>> _shard_params(CMRparams, 2)
+    [{'temporal': '2019-02-20T00:00:00Z,2019-02-24T00:00:00Z', 'bounding_box': '-55.0,68.0,-48.0,71.0'},
+    {'temporal': '2019-02-24T00:00:00Z,2019-02-28T00:00:00Z', 'bounding_box': '-55.0,68.0,-48.0,71.0'}]
+    """
+    if shards <= 1:
+        return [CMRparams]
+
+    if "temporal" in CMRparams:
+        fmt = "%Y-%m-%dT%H:%M:%SZ"
+        start, end = (
+            datetime.datetime.strptime(t, fmt) for t in CMRparams["temporal"].split(",")
+        )
+        # whole seconds, so no shard is shorter than CMR's temporal resolution,
+        # with the remainder spread over the first shards
+        seconds = int((end - start).total_seconds())
+        if seconds < 2:
+            return [CMRparams]
+        step, extra = divmod(seconds, min(shards, seconds))
+        bounds = []
+        shard_start = start
+        while shard_start < end:
+            shard_end = min(
+                shard_start + datetime.timedelta(seconds=step + (len(bounds) < extra)),
+                end,
+            )
+            bounds.append((shard_start, shard_end))
+            shard_start = shard_end
+        # CMR temporal ranges are inclusive, so granules spanning a shard
+        # boundary are returned by both shards and removed when merging
+        return [
+            {**CMRparams, "temporal": f"{s.strftime(fmt)},{e.strftime(fmt)}"}
+            for s, e in bounds
+        ]
+
+    names = CMRparams.get("readable_granule_name[]")
+    if isinstance(names, list) and len(names) > 1:
+        size = -(-len(names) // shards)
+        return [
+            {**CMRparams, "readable_granule_name[]": names[i : i + size]}
+            for i in range(0, len(names), size)
+        ]
+
+    return [CMRparams]
+
+
 # DevNote: currently this fn is not tested
 # DevNote: could add flag to separate ascending and descending orbits based on ATL03 granule region
 def gran_IDs(grans, ids=False, cycles=False, tracks=False, dates=False, cloud=False):
     """
     Returns a list of granule information for each granule dictionary
     in the input list of granule dictionaries.
-    Granule info may be from a list of those available from NSIDC (for ordering/download)
-    or a list of granules present on the file system.
+    Granule info may be from a list of those available from NSIDC (for ordering/download),
+    a list of granules present on the file system, or a granule catalog (see `catalog`).
 
     Parameters
     ----------
-    grans : list of dictionaries
-        List of input granule json dictionaries. Must have key "producer_granule_id"
+    grans : list of dictionaries or pandas.DataFrame
+        List of input granule json dictionaries. Must have key "producer_granule_id".
+        Alternatively, a granule catalog.
     ids: bool, default True
         Return a list of the available granule IDs for the granule dictionary
     cycles : bool, default False
@@ -59,79 +411,52 @@ def gran_IDs(grans, ids=False, cycles=False, tracks=False, dates=False, cloud=Fa
         Return a a list of AWS s3 urls for the available granules in the granule dictionary.
     """
     assert len(grans) > 0, "Your data object has no granules associated with it"
-    # regular expression for extracting parameters from file names
-    rx = re.compile(
-        r"(ATL\d{2})(-\d{2})?_(\d{4})(\d{2})(\d{2})(\d{2})(\d{2})"
-        r"(\d{2})_(\d{4})(\d{2})(\d{2})_(\d{3})_(\d{2})(.*?).(.*?)$"
-    )
-    gran_ids = []
-    gran_cycles = []
-    gran_tracks = []
-    gran_dates = []
-    gran_s3urls = []
-    for gran in grans:
-        producer_granule_id = gran["producer_granule_id"]
-        gran_ids.append(producer_granule_id)
-
-        if cloud is True:
-            try:
-                for link in gran["links"]:
-                    href = link["href"]
-                    if href.startswith("s3") and href.endswith((".h5", "nc")):
-                        gran_s3urls.append(href)
-            except KeyError:
-                pass
-
-        if any(param is True for param in [cycles, tracks, dates]):
-            # PRD: ICESat-2 product
-            # HEM: Sea Ice Hemisphere flag
-            # YY,MM,DD,HH,MN,SS: Year, Month, Day, Hour, Minute, Second
-            # TRK: Reference Ground Track (RGT)
-            # CYCL: Orbital Cycle
-            # GRAN: Granule region (1-14)
-            # RL: Data Release
-            # VERS: Product Version
-            # AUX: Auxiliary flags
-            # SFX: Suffix (h5)
-            (
-                PRD,
-                HEM,
-                YY,
-                MM,
-                DD,
-                HH,
-                MN,
-                SS,
-                TRK,
-                CYCL,
-                GRAN,
-                RL,
-                VERS,
-                AUX,
-                SFX,
-            ) = rx.findall(producer_granule_id).pop()
-            gran_cycles.append(CYCL)
-            gran_tracks.append(TRK)
-            gran_dates.append(
-                str(datetime.datetime(year=int(YY), month=int(MM), day=int(DD)).date())
-            )
+
+    if isinstance(grans, pd.DataFrame):
+        gran_ids = grans["id"]
+    else:
+        gran_ids = pd.Series([gran["producer_granule_id"] for gran in grans], dtype=str)
+
+    if any(param is True for param in [cycles, tracks, dates]):
+        # PRD: ICESat-2 product
+        # HEM: Sea Ice Hemisphere flag
+        # YY,MM,DD,HH,MN,SS: Year, Month, Day, Hour, Minute, Second
+        # TRK: Reference Ground Track (RGT)
+        # CYCL: Orbital Cycle
+        # GRAN: Granule region (1-14)
+        # RL: Data Release
+        # VERS: Product Version
+        # AUX: Auxiliary flags
+        # SFX: Suffix (h5)
+        parts = parse_granule_ids(gran_ids, raw=True)
 
     # list of granule parameters
     gran_list = []
     # granule IDs
     if ids:
-        gran_list.append(gran_ids)
+        gran_list.append(gran_ids.tolist())
     # orbital cycles
     if cycles:
-        gran_list.append(gran_cycles)
+        gran_list.append(parts["cycle"].tolist())
     # reference ground tracks (RGTs)
     if tracks:
-        gran_list.append(gran_tracks)
+        gran_list.append(parts["rgt"].tolist())
     # granule date
     if dates:
-        gran_list.append(gran_dates)
+        ymd = parts["datetime"].str
+        gran_list.append((ymd[:4] + "-" + ymd[4:6] + "-" + ymd[6:8]).tolist())
     # AWS s3 url
     if cloud:
+        if isinstance(grans, pd.DataFrame):
+            gran_s3urls = grans["s3_url"].dropna().tolist()
+        else:
+            gran_s3urls = [
+                link["href"]
+                for gran in grans
+                for link in gran.get("links", [])
+                if link["href"].startswith("s3")
+                and link["href"].endswith((".h5", "nc"))
+            ]
         gran_list.append(gran_s3urls)
     # return the list of granule parameters
     return gran_list
@@ -166,6 +491,30 @@ class Granules(EarthdataAuthMixin):
         # self.files = files
         # session = session
 
+    # ----------------------------------------------------------------------
+    # Properties
+
+    @property
+    def catalog(self) -> pd.DataFrame:
+        """
+        A compact, columnar catalog of the available granules (see `granules.catalog`),
+        for vectorized summaries, filtering and link extraction.
+
+        Examples
+        --------
+        >>> reg_a = ipx.Query('ATL06',[-55, 68, -48, 71],['2019-02-20','2019-02-28']) # doctest: +SKIP
+        >>> reg_a.avail_granules() # doctest: +SKIP
+        >>> cat = reg_a.granules.catalog # doctest: +SKIP
+        >>> cat.loc[cat["rgt"] == 841, "data_url"].tolist() # doctest: +SKIP
+        ['https://data.nsidc.earthdatacloud.nasa.gov/nsidc-cumulus-prod-protected/ATLAS/ATL06/006/2019/02/21/ATL06_20190221121851_08410203_006_01.h5']
+        """
+        if not hasattr(self, "_catalog"):
+            assert hasattr(self, "avail"), (
+                "There are no available granules. Run `get_avail` first."
+            )
+            self._catalog = catalog(self.avail)
+        return self._catalog
+
     # ----------------------------------------------------------------------
     # Methods
 
@@ -173,11 +522,18 @@ class Granules(EarthdataAuthMixin):
         self,
         CMRparams: CMRParams,
         cloud: bool = False,
+        shards: int = 1,
+        max_workers: int = 4,
+        cache_ttl: Union[int, float, datetime.timedelta, None] = None,
+        revalidate: bool = False,
     ):
         """
         Get a list of available granules for the query object's parameters.
         Generates the `avail` attribute of the granules object.
 
+        The full CMR (JSON) granule entries are kept in `avail`.
+        Use `catalog` for a compact, columnar view of the granules.
+
         Parameters
         ----------
         CMRparams :
@@ -187,6 +543,23 @@ class Granules(EarthdataAuthMixin):
 
             .. deprecated:: 1.2
                 This parameter is ignored.
+        shards :
+            Split the search into this many searches, by temporal range or by
+            cycle/track granule names, which are paged through concurrently.
+            Results are merged and deduplicated by granule ID.
+            Useful for queries spanning many years or thousands of granules.
+        max_workers :
+            Maximum number of shards searched at the same time.
+        cache_ttl :
+            Reuse the results of an identical search (same CMRparams) made within this many
+            seconds (or timedelta), including by another process.
+            Results are stored as compressed JSON in the icepyx cache directory.
+            By default, results are not cached.
+        revalidate :
+            When cached results are older than cache_ttl, update them with only the granules
+            added or changed since the cached search (using CMR's `updated_since`)
+            instead of repeating the full search.
+            Granules deleted from CMR are not detected in this mode.
 
         Notes
         -----
@@ -203,20 +576,227 @@ class Granules(EarthdataAuthMixin):
 
         # if not hasattr(self, 'avail'):
         self.avail = []
+        for attr in ["_catalog", "_filtered"]:
+            if hasattr(self, attr):
+                delattr(self, attr)
+
+        if cache_ttl is not None:
+            self._get_avail_cached(
+                CMRparams, shards, max_workers, cache_ttl, revalidate
+            )
+            return
+
+        shard_params = _shard_params(CMRparams, shards)
+        if len(shard_params) == 1:
+            results = [self._search(shard_params[0])]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(shard_params))
+            ) as pool:
+                results = list(pool.map(self._search, shard_params))
+
+        seen = set()
+        for entries in results:
+            for entry in entries:
+                if entry["producer_granule_id"] not in seen:
+                    seen.add(entry["producer_granule_id"])
+                    self.avail.append(entry)
+
+        assert len(self.avail) > 0, (
+            "Your search returned no results; try different search parameters"
+        )
+
+    def _get_avail_cached(self, CMRparams, shards, max_workers, cache_ttl, revalidate):
+        """
+        Generate the `avail` attribute from cached search results when they are recent
+        enough, otherwise search CMR and update the cache.
+        """
+        if not isinstance(cache_ttl, datetime.timedelta):
+            cache_ttl = datetime.timedelta(seconds=cache_ttl)
+
+        fmt = "%Y-%m-%dT%H:%M:%SZ"
+        cache_file = _cmr_cache_file(CMRparams)
+        cached = cache.read_json(cache_file)
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+        if cached is not None:
+            searched = datetime.datetime.strptime(cached["searched"], fmt).replace(
+                tzinfo=datetime.timezone.utc
+            )
+            if now - searched < cache_ttl:
+                self.avail = cached["entries"]
+                return
+
+        if cached is not None and revalidate:
+            updated = {
+                entry["producer_granule_id"]: entry
+                for entry in self._search(
+                    {**CMRparams, "updated_since": cached["searched"]}
+                )
+            }
+            entries = [
+                updated.pop(entry["producer_granule_id"], entry)
+                for entry in cached["entries"]
+            ]
+            self.avail = entries + list(updated.values())
+        else:
+            self.get_avail(CMRparams, shards=shards, max_workers=max_workers)
+
+        cache.write_json(
+            cache_file, {"searched": now.strftime(fmt), "entries": self.avail}
+        )
+
+    def filter_footprints(self, extent) -> int:
+        """
+        Drop available granules whose footprint does not intersect the spatial extent,
+        so they are not ordered or downloaded. See `granules.footprint_filter`.
+
+        Parameters
+        ----------
+        extent : geopandas.GeoDataFrame or shapely geometry
+            The spatial extent, e.g. `Spatial.extent_as_gdf`.
+
+        Returns
+        -------
+        int
+            The number of granules dropped.
+        """
+        assert hasattr(self, "avail"), (
+            "There are no available granules. Run `get_avail` first."
+        )
+        n_avail = len(self.avail)
+        self.avail = footprint_filter(self.avail, extent)
+        self._filtered = True
+        if hasattr(self, "_catalog"):
+            del self._catalog
+        return n_avail - len(self.avail)
+
+    def exclude(self, granule_ids) -> int:
+        """
+        Drop the given granules from the available granules,
+        so they are not ordered or downloaded (e.g. because they are already on disk).
+
+        Parameters
+        ----------
+        granule_ids : list of str
+            Granule IDs (producer_granule_id) to drop, or the names of files of
+            those granules. Granules are matched by their ICESat-2 granule ID, so file
+            names with a prefix or suffix (e.g. subset outputs) match too.
+
+        Returns
+        -------
+        int
+            The number of granules dropped.
+        """
+        assert hasattr(self, "avail"), (
+            "There are no available granules. Run `get_avail` first."
+        )
+        drop = set(_canonical_ids(list(granule_ids)))
+        avail_ids = _canonical_ids([gran["producer_granule_id"] for gran in self.avail])
+        n_avail = len(self.avail)
+        self.avail = [
+            gran for gran, gid in zip(self.avail, avail_ids) if gid not in drop
+        ]
+        self._filtered = True
+        if hasattr(self, "_catalog"):
+            del self._catalog
+        return n_avail - len(self.avail)
+
+    def iter_avail(self, CMRparams: CMRParams) -> Iterator[dict]:
+        """
+        Iterate over the available granules for the query object's parameters,
+        yielding each granule's CMR entry as soon as its page of search results is received.
+
+        This allows downloading or reading granules to start while later pages of a large
+        search are still being fetched.
+        Once all granules have been yielded, the `avail` attribute is also set,
+        so the search is not repeated by `get_avail`.
+
+        Parameters
+        ----------
+        CMRparams :
+            Dictionary of properly formatted CMR search parameters.
+
+        See Also
+        --------
+        get_avail
+        query.Query.iter_granules
+        """
+
+        assert CMRparams is not None, "Missing required input parameter dictionaries"
+
+        entries = []
+        for page in self._search_pages(CMRparams):
+            entries.extend(page)
+            yield from page
+
+        assert len(entries) > 0, (
+            "Your search returned no results; try different search parameters"
+        )
+        for attr in ["_catalog", "_filtered"]:
+            if hasattr(self, attr):
+                delattr(self, attr)
+        self.avail = entries
+
+    @classmethod
+    def _search(cls, params: CMRParams) -> list[dict]:
+        """
+        Page through the CMR granule search results for one set of search parameters.
+        """
+        return [entry for page in cls._search_pages(params) for entry in page]
+
+    def archive_info(self, batch_size: int = 100) -> dict:
+        """
+        Get the size (in bytes) and checksum of the data files of the available granules
+        from their CMR (UMM) granule metadata, for verifying downloads.
+
+        Only the available granules are looked up (by concept ID), so the search
+        itself is not repeated, and the JSON granule entries in `avail` are unchanged.
 
-        headers = {"Accept": "application/json", "Client-Id": "icepyx"}
+        Parameters
+        ----------
+        batch_size :
+            Number of granules looked up per request.
+
+        Returns
+        -------
+        dict
+            The "size" and "checksum" ((algorithm, value) tuple, if available)
+            of each file, keyed by file name. See `download.download_files`.
+        """
+        assert hasattr(self, "avail"), (
+            "There are no available granules. Run `get_avail` first."
+        )
+        ids = [gran["id"] for gran in self.avail if "id" in gran]
+        info = {}
+        for i in range(0, len(ids), batch_size):
+            params = {"concept_id[]": ids[i : i + batch_size], "page_size": batch_size}
+            for page in self._search_pages(params, umm=True):
+                for item in page:
+                    info.update(_umm_files(item))
+        return info
+
+    @staticmethod
+    def _search_pages(params: CMRParams, umm: bool = False) -> Iterator[list[dict]]:
+        """
+        Yield the CMR granule entries for one set of search parameters, a page at a time.
+        With `umm`, the entries are UMM-JSON items rather than the (default) JSON entries.
+        """
+        accept = (
+            "application/vnd.nasa.cmr.umm_results+json" if umm else "application/json"
+        )
+        headers = {"Accept": accept, "Client-Id": "icepyx"}
         # note we should also check for errors whenever we ping NSIDC-API -
         # make a function to check for errors
 
-        params = CMRparams
-
+        n_entries = 0
         cmr_search_after = None
 
         while True:
             if cmr_search_after is not None:
                 headers["CMR-Search-After"] = cmr_search_after
 
-            response = requests.get(
+            response = http_client.get(
                 GRANULE_SEARCH_BASE_URL,
                 headers=headers,
                 params=apifmt.to_string(params),
@@ -240,18 +820,15 @@ class Granules(EarthdataAuthMixin):
                     raise e
 
             results = json.loads(response.content)
-            if not results["feed"]["entry"]:
-                assert len(self.avail) == int(response.headers["CMR-Hits"]), (
+            entries = results["items"] if umm else results["feed"]["entry"]
+            if not entries:
+                assert n_entries == int(response.headers["CMR-Hits"]), (
                     "Search failure - unexpected number of results"
                 )
                 break
 
-            # Collect results
-            self.avail.extend(results["feed"]["entry"])
-
-        assert len(self.avail) > 0, (
-            "Your search returned no results; try different search parameters"
-        )
+            n_entries += len(entries)
+            yield entries
 
     @deprecated("Use `Query.place_order` instead.")
     def place_order(
@@ -1,7 +1,7 @@
-from concurrent.futures import as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 import datetime as dt
-import json
 from pathlib import Path
+import sys
 import time
 from typing import Any, Dict, TypedDict, Union
 
@@ -10,11 +10,21 @@ import harmony
 import requests
 
 from icepyx.core.auth import EarthdataAuthMixin
+from icepyx.core.scheduler import scheduler
+from icepyx.core.state import StateStore
 
 # Sometimes harmony has problems (e.g., 500 bad gateway) and we need to retry.
-# 5 seconds seems like enough, but not always.
+# 5 seconds seems like enough, but not always, so the wait doubles with each retry.
 REQUEST_RETRY_INTERVAL_SECONDS: int = 5
 
+# Job status polling starts at the minimum interval and backs off exponentially
+# (up to the maximum) while a job makes no progress.
+POLL_INTERVAL_MIN_SECONDS: float = 2
+POLL_INTERVAL_MAX_SECONDS: float = 60
+POLL_BACKOFF_FACTOR: float = 1.5
+# How often aggregate progress is reported while tracking jobs.
+PROGRESS_INTERVAL_SECONDS: float = 10
+
 
 class HarmonyTemporal(TypedDict):
     # TODO: these are optional. Harmony can take a start without a stop or a
@@ -33,6 +43,8 @@ class HarmonyApi(EarthdataAuthMixin):
         The Harmony API client.
     job_ids : list[str]
         List of job IDs that have been placed with the Harmony API.
+    state : icepyx.core.state.StateStore
+        Durable record of the placed jobs and their downloaded result files.
 
     """
 
@@ -50,6 +62,57 @@ class HarmonyApi(EarthdataAuthMixin):
         # List of job IDs that have been placed with the HarmonyApi
         self.job_ids = []
 
+    @property
+    def state(self) -> StateStore:
+        """
+        The durable record of placed jobs and downloaded result files,
+        used to resume downloads after an interruption (see `resume_jobs`).
+        """
+        if not hasattr(self, "_state"):
+            self._state = StateStore()
+        return self._state
+
+    @state.setter
+    def state(self, store: StateStore):
+        self._state = store
+
+    def resume_jobs(self) -> list[str]:
+        """
+        Track the recorded jobs whose results have not all been downloaded,
+        e.g. after the process placing or downloading them was interrupted.
+
+        Only the jobs recorded in the scope of `state` (by default, placed from the
+        same working directory), and recent enough for their results to still be
+        available, are resumed. To resume the jobs of another scope (e.g. a named
+        worker), set `state` to a `state.StateStore` with that scope first.
+
+        Returns
+        -------
+        list[str]
+            The job IDs, which are added to `job_ids`.
+
+        Examples
+        --------
+        >>> api = HarmonyApi() # doctest: +SKIP
+        >>> api.state = StateStore(scope="worker-3") # doctest: +SKIP
+        >>> api.resume_jobs() # doctest: +SKIP
+        ['931355e8-0005-4dff-9c76-7903a5be283d']
+        >>> api.download_granules("./data") # doctest: +SKIP
+        """
+        for job_id in self.state.unfinished_jobs():
+            if job_id not in self.job_ids:
+                self.job_ids.append(job_id)
+        return self.job_ids
+
+    @property
+    def job_statuses(self) -> dict[str, dict[str, Any]]:
+        """
+        The most recent status of each job tracked by `wait_for_job`, keyed by job ID.
+        """
+        if not hasattr(self, "_job_statuses"):
+            self._job_statuses = {}
+        return self._job_statuses
+
     def get_capabilities(self, concept_id: str) -> dict[str, Any]:
         """
         Retrieve the capabilities of a dataset given its concept ID.
@@ -77,6 +140,7 @@ class HarmonyApi(EarthdataAuthMixin):
         shape: Union[str, None] = None,
         granule_name: list[str] = [],
         skip_preview: bool = False,
+        variables: Union[list[str], None] = None,
     ) -> Any:
         """
         Submit an order to Harmony and wait for it to complete.
@@ -95,6 +159,8 @@ class HarmonyApi(EarthdataAuthMixin):
             Specific granule names to include in the order.
         skip_preview : bool, optional
             Whether to bypass preview mode if the order exceeds 300 granules.
+        variables : list[str] or None, optional
+            The variables to subset the granules to. By default, all variables.
 
         Returns
         -------
@@ -115,6 +181,8 @@ class HarmonyApi(EarthdataAuthMixin):
             params["skip_preview"] = skip_preview
         if granule_name:
             params["granule_name"] = granule_name
+        if variables:
+            params["variables"] = variables
 
         request = harmony.Request(**params)
 
@@ -154,7 +222,7 @@ class HarmonyApi(EarthdataAuthMixin):
                     f"Encountered HTTPError {e} while requesting job status"
                     f" for {job_id}. Retrying...{retry_num}/{retries}"
                 )
-                time.sleep(REQUEST_RETRY_INTERVAL_SECONDS)
+                time.sleep(REQUEST_RETRY_INTERVAL_SECONDS * 2 ** (retry_num - 1))
 
         raise RuntimeError(f"Failed to get harmony order status for {job_id}")
 
@@ -226,6 +294,7 @@ class HarmonyApi(EarthdataAuthMixin):
         shape: Union[str, None] = None,
         granule_name: list[str] = [],
         skip_preview: bool = False,
+        variables: Union[list[str], None] = None,
     ) -> Any:
         """
         Submit an order to Harmony and wait for it to complete.
@@ -244,6 +313,8 @@ class HarmonyApi(EarthdataAuthMixin):
             Specific granule names to include in the order.
         skip_preview : bool, optional
             Whether to bypass preview mode if the order exceeds 300 granules.
+        variables : list[str] or None, optional
+            The variables to subset the granules to. By default, all variables.
 
         Returns
         -------
@@ -257,16 +328,12 @@ class HarmonyApi(EarthdataAuthMixin):
             shape=shape,
             granule_name=granule_name,
             skip_preview=skip_preview,
+            variables=variables,
         )
 
         # Append this job to the list of job ids.
         self.job_ids.append(job_id)
-
-        order_fn = ".order_restart"
-        with open(order_fn, "w") as fid:
-            # Note: icepyx v1 used "orderIds". Harmony uses the term "job" to describe
-            # an order, so that gets used here.
-            json.dump({"jobIds": self.job_ids}, fid)
+        self.state.add_job(job_id, concept_id=concept_id)
 
         print("Harmony job ID: ", job_id)
         status = self.check_order_status(job_id)
@@ -275,32 +342,236 @@ class HarmonyApi(EarthdataAuthMixin):
         # https://github.com/nasa/harmony/blob/8b2eb47feab5283d237f3679ac8e09f50e85038f/db/db.sql#L8
         return job_id
 
+    def wait_for_job(
+        self, job_id: str, min_interval: Union[float, None] = None
+    ) -> dict[str, Any]:
+        """
+        Wait until a Harmony job is no longer running, and return its final status.
+
+        The job status is polled with an adaptive interval, which grows exponentially
+        (from `min_interval` up to `POLL_INTERVAL_MAX_SECONDS`) while the
+        job's progress is unchanged and drops back to the minimum when it advances.
+
+        Parameters
+        ----------
+        job_id : str
+            The ID of the Harmony job.
+        min_interval : float, optional
+            The shortest time between status requests, in seconds.
+            By default, `POLL_INTERVAL_MIN_SECONDS`.
+
+        Returns
+        -------
+        dict
+            The job status.
+        """
+        if min_interval is None:
+            min_interval = POLL_INTERVAL_MIN_SECONDS
+        interval = min_interval
+        last_progress = None
+        while True:
+            status = self.check_order_status(job_id)
+            self.job_statuses[job_id] = status
+            if not (
+                status["status"].startswith("running") or status["status"] == "accepted"
+            ):
+                return status
+
+            if status.get("progress") != last_progress:
+                interval = min_interval
+                last_progress = status.get("progress")
+            else:
+                interval = min(
+                    interval * POLL_BACKOFF_FACTOR, POLL_INTERVAL_MAX_SECONDS
+                )
+            time.sleep(interval)
+
+    def _track_job(
+        self,
+        job_id: str,
+        download_dir: Path,
+        overwrite: bool,
+        priority: str = "interactive",
+    ):
+        """
+        Wait for a job to finish, then download its results.
+        """
+        if self.state.job_status(job_id) in ("successful", "complete_with_errors"):
+            # the job finished before an interruption, so needn't be polled again
+            status = {"status": self.state.job_status(job_id)}
+        else:
+            status = self.wait_for_job(job_id)
+            self.state.set_job_status(job_id, status["status"])
+        if status["status"] not in ("successful", "complete_with_errors"):
+            print(
+                f"Harmony job {job_id} is {status['status']}: "
+                f"{status.get('message', '')}"
+            )
+            return []
+        return self._download_job_results(
+            job_id=job_id,
+            download_dir=download_dir,
+            overwrite=overwrite,
+            priority=priority,
+        )
+
+    def _report_progress(self, n_files: int):
+        statuses = [self.job_statuses.get(job_id, {}) for job_id in self.job_ids]
+        n_done = sum(
+            not (
+                s.get("status", "running").startswith("running")
+                or s.get("status") == "accepted"
+            )
+            for s in statuses
+        )
+        progress = sum(s.get("progress", 0) for s in statuses) / len(statuses)
+        print(
+            f"Harmony jobs: {n_done}/{len(statuses)} finished, "
+            f"{progress:.0f}% processed, {n_files} files downloaded"
+        )
+
     def _download_job_results(
         self,
         job_id: str,
         download_dir: Path,
         overwrite: bool,
+        priority: str = "interactive",
     ) -> list[Path]:
         print(f"Downloading results for harmony job {job_id}")
 
-        futures = self.harmony_client.download_all(
+        # the result links and downloaded files are recorded, so after an interruption
+        # neither the links are listed nor the files downloaded again
+        # (files are recorded under the name harmony-py saves them as, which is
+        # prefixed with the item ID for staged results)
+        if not self.state.is_listed(job_id):
+            self.state.add_files(
+                job_id,
+                {
+                    self.harmony_client.get_download_filename_from_url(url): url
+                    for url in self.harmony_client.result_urls(job_id)
+                },
+            )
+        done = {} if overwrite else self.state.downloaded(job_id)
+
+        paths = [Path(path) for path in done.values()]
+        sched = scheduler()
+
+        def download(url):
+            # harmony-py transfers the file in its own threads, so the slot is held
+            # until the transfer is done
+            with sched.slot(url, priority=priority):
+                return self.harmony_client.download(
+                    url, str(download_dir), overwrite=overwrite
+                ).result()
+
+        errors = []
+        with ThreadPoolExecutor(max_workers=sched.max_concurrency) as executor:
+            futures = {
+                executor.submit(download, url): url
+                for name, url in self.state.files(job_id).items()
+                if name not in done
+            }
+            for future in as_completed(futures):
+                # record every file that did download, even if others failed
+                try:
+                    path = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                self.state.mark_downloaded(job_id, path, url=futures[future])
+                paths.append(Path(path))
+        if errors:
+            raise errors[0]
+
+        self.state.set_job_status(job_id, "downloaded")
+        return paths
+
+    def _stream_job_results(
+        self,
+        job_id: str,
+        download_dir: Path,
+        overwrite: bool,
+        priority: str = "interactive",
+    ) -> list[Path]:
+        if self.state.is_listed(job_id):
+            # the job completed before an interruption, so its remaining results are
+            # downloaded from the recorded links
+            return self._download_job_results(
+                job_id=job_id,
+                download_dir=download_dir,
+                overwrite=overwrite,
+                priority=priority,
+            )
+
+        print(f"Downloading results for harmony job {job_id} as they become available")
+
+        # the iterator polls the job and starts downloading each result file
+        # as soon as its link appears, while the job is still running
+        # (files already in download_dir are kept, unless overwrite is True)
+        futures = []
+        for result in self.harmony_client.iterator(
             job_id, str(download_dir), overwrite=overwrite
-        )
+        ):
+            if result is None:
+                break
+            futures.append(result["path"])
+            sys.stdout.write(".")
+            sys.stdout.flush()
+        print()
 
         paths = []
+        errors = []
         for future in as_completed(futures):
-            paths.append(Path(future.result()))
-
-        return paths
+            # record every file that did download, even if others failed
+            try:
+                path = future.result()
+            except Exception as e:
+                errors.append(e)
+                continue
+            # recorded under the name harmony-py saved it as, which is also the name
+            # its link is recorded under (see `_download_job_results`)
+            self.state.mark_downloaded(job_id, path)
+            paths.append(Path(path))
+
+        # the iterator also stops when a job is paused (e.g. for preview) or canceled,
+        # so the job is only done once harmony reports it complete
+        status = self.check_order_status(job_id)
+        self.job_statuses[job_id] = status
+        self.state.set_job_status(job_id, status["status"])
+        if status["status"] not in ("successful", "complete_with_errors"):
+            print(
+                f"Harmony job {job_id} is {status['status']}: "
+                f"{status.get('message', '')}"
+            )
+            if errors:
+                raise errors[0]
+            return paths
+
+        # record the result links, and retry any files that failed to download;
+        # the streamed files are returned from the record, so each path is returned once
+        return self._download_job_results(
+            job_id=job_id,
+            download_dir=download_dir,
+            overwrite=False,
+            priority=priority,
+        )
 
     def download_granules(
-        self, download_dir: Path, overwrite: bool = False
+        self,
+        download_dir: Path,
+        overwrite: bool = False,
+        stream: bool = False,
+        max_workers: int = 4,
+        priority: str = "interactive",
     ) -> list[Path]:
         """
         Download all granules associated with current order.
 
         This method retrieves and downloads granules for all job IDs stored in
         `self.job_ids`, saving them to the specified directory.
+        The jobs are tracked concurrently, and each job's results are downloaded
+        as soon as it completes. Aggregate progress across the jobs is reported
+        periodically.
 
         Parameters
         ----------
@@ -308,17 +579,47 @@ class HarmonyApi(EarthdataAuthMixin):
             The directory where granules should be saved.
         overwrite : bool, optional
             Whether to overwrite existing files (default is False).
+        stream : bool, optional
+            Whether to download each output file as soon as harmony makes it available,
+            while the job is still running, rather than downloading all the results of a
+            completed job (default is False).
+        max_workers : int, optional
+            Maximum number of jobs tracked and downloaded at the same time
+            (default is 4).
+        priority : {"interactive", "bulk"}, optional
+            Priority class of the result downloads (default is "interactive").
+            Files downloaded from completed jobs are scheduled by the shared download
+            scheduler (see `scheduler.DownloadScheduler`); files streamed while a job
+            is running are downloaded by harmony-py directly.
 
         Returns
         -------
         list of Path
             A list of file paths to the downloaded granules.
         """
+        download_job_results = self._stream_job_results if stream else self._track_job
+
         all_paths = []
-        for job_id in self.job_ids:
-            paths = self._download_job_results(
-                job_id=job_id, download_dir=download_dir, overwrite=overwrite
-            )
-            all_paths.extend(paths)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {
+                executor.submit(
+                    download_job_results,
+                    job_id=job_id,
+                    download_dir=download_dir,
+                    overwrite=overwrite,
+                    priority=priority,
+                )
+                for job_id in self.job_ids
+            }
+            while pending:
+                done, pending = wait(
+                    pending,
+                    timeout=PROGRESS_INTERVAL_SECONDS,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    all_paths.extend(future.result())
+                if len(self.job_ids) > 1:
+                    self._report_progress(len(all_paths))
 
         return all_paths
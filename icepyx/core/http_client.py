@@ -0,0 +1,129 @@
+"""
+Shared HTTP client for icepyx network requests, with connection pooling, retries with
+backoff, and per-host concurrency limits.
+"""
+
+import threading
+from typing import Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_config = {
+    "pool_size": 20,
+    "max_retries": 3,
+    "backoff_factor": 0.5,
+    "max_per_host": 8,
+    "timeout": None,
+}
+_lock = threading.Lock()
+_session = None
+_host_limits = {}
+
+
+def configure(
+    pool_size: Union[int, None] = None,
+    max_retries: Union[int, None] = None,
+    backoff_factor: Union[float, None] = None,
+    max_per_host: Union[int, None] = None,
+    timeout: Union[float, tuple, None] = None,
+):
+    """
+    Configure the shared HTTP session used by icepyx.
+    Settings that are not given are left unchanged.
+    The session is recreated the next time a request is made.
+
+    Parameters
+    ----------
+    pool_size : int, default 20
+        Maximum number of kept-alive connections per host.
+    max_retries : int, default 3
+        Number of times to retry a request that fails to connect, or returns a
+        rate limiting (429) or transient server error (5xx) status.
+    backoff_factor : float, default 0.5
+        Retries wait ``backoff_factor * 2 ** (retry number - 1)`` seconds,
+        or as long as the server's Retry-After header asks.
+    max_per_host : int, default 8
+        Maximum number of requests made to the same host at the same time
+        (e.g. from different threads).
+    timeout : float or (connect, read) tuple, default None
+        Default timeout (in seconds) for requests that don't set their own.
+
+    Examples
+    --------
+    >>> configure(max_retries=2, max_per_host=4) # doctest: +SKIP
+    """
+    global _session
+    settings = {
+        "pool_size": pool_size,
+        "max_retries": max_retries,
+        "backoff_factor": backoff_factor,
+        "max_per_host": max_per_host,
+        "timeout": timeout,
+    }
+    with _lock:
+        _config.update({k: v for k, v in settings.items() if v is not None})
+        _session = None
+        _host_limits.clear()
+
+
+def session() -> requests.Session:
+    """
+    Return the shared HTTP session, which keeps connections alive between requests
+    and retries failed requests with exponential backoff.
+    Responses are requested gzip compressed.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            retry = Retry(
+                total=_config["max_retries"],
+                backoff_factor=_config["backoff_factor"],
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=["GET", "HEAD"],
+                respect_retry_after_header=True,
+                # return the last response, so callers can report the error
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=_config["pool_size"],
+                pool_maxsize=_config["pool_size"],
+                max_retries=retry,
+            )
+            s = requests.Session()
+            s.headers["Accept-Encoding"] = "gzip, deflate"
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _session = s
+        return _session
+
+
+def _host_limit(url) -> threading.BoundedSemaphore:
+    host = urlsplit(url).netloc
+    with _lock:
+        if host not in _host_limits:
+            _host_limits[host] = threading.BoundedSemaphore(_config["max_per_host"])
+        return _host_limits[host]
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Make a request with the shared session, waiting if the maximum number of
+    concurrent requests to the host has been reached.
+    Keyword arguments are passed to `requests.Session.request`.
+    """
+    kwargs.setdefault("timeout", _config["timeout"])
+    with _host_limit(url):
+        return session().request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """
+    Make a GET request with the shared session (see `request`).
+    """
+    return request("GET", url, **kwargs)
@@ -1,13 +1,16 @@
 import json
 import logging
+import os
+import time
 import warnings
 
 from deprecated import deprecated
 import earthaccess
 import h5py
 import numpy as np
-import requests
 
+import icepyx.core.cache as cache
+import icepyx.core.http_client as http_client
 from icepyx.core.urls import COLLECTION_SEARCH_BASE_URL
 
 # ICESat-2 specific reference functions
@@ -73,19 +76,90 @@ def _validate_OA_product(product):
     return product
 
 
+# seconds to keep collection metadata on disk (shared between processes);
+# by default it is only kept in memory for the current process
+COLLECTION_CACHE_TTL_ENV = "ICEPYX_COLLECTION_CACHE_TTL"
+
+_collection_memo = {}
+
+
+def clear_collection_cache():
+    """
+    Forget the collection metadata (product versions and concept IDs)
+    held in memory for this process, so it is fetched again when next needed.
+    Collection metadata persisted on disk expires after its time to live.
+    """
+    _collection_memo.clear()
+
+
+def _collection_metadata(key, fetch):
+    """
+    Return the collection metadata for key, calling fetch only if it is not already
+    held in memory or, if ``ICEPYX_COLLECTION_CACHE_TTL`` is set, stored on disk
+    within that many seconds.
+    """
+    if key in _collection_memo:
+        return _collection_memo[key]
+
+    ttl = os.environ.get(COLLECTION_CACHE_TTL_ENV)
+    cache_file = None
+    if ttl is not None:
+        cache_file = cache.cache_dir("collections").joinpath(
+            "_".join(str(k) for k in key) + ".json"
+        )
+        cached = cache.read_json(cache_file)
+        if cached is not None and time.time() - cached["fetched"] < float(ttl):
+            _collection_memo[key] = cached["value"]
+            return cached["value"]
+
+    value = fetch()
+    _collection_memo[key] = value
+    if cache_file is not None:
+        cache.write_json(cache_file, {"fetched": time.time(), "value": value})
+    return value
+
+
 # DevNote: test for this function is commented out; dates in some of the values were causing the test to fail...
 def about_product(prod):
     """
     Ping Earthdata to get metadata about the product of interest (the collection).
+    The metadata is fetched once per process (see `clear_collection_cache`).
 
     See Also
     --------
     query.Query.product_all_info
     """
 
-    response = requests.get(COLLECTION_SEARCH_BASE_URL, params={"short_name": prod})
-    results = json.loads(response.content)
-    return results
+    def fetch():
+        response = http_client.get(
+            COLLECTION_SEARCH_BASE_URL, params={"short_name": prod}
+        )
+        return json.loads(response.content)
+
+    return _collection_metadata(("about", prod), fetch)
+
+
+def concept_id(product, version=None):
+    """
+    Get the concept ID of the cloud-hosted collection for the product and version
+    (any version if None), or None if there is no such collection.
+    The concept ID is fetched once per process (see `clear_collection_cache`).
+
+    Examples
+    --------
+    >>> concept_id('ATL06', '006') # doctest: +SKIP
+    'C2564427300-NSIDC_ECS'
+    """
+
+    def fetch():
+        collections = earthaccess.search_datasets(
+            short_name=product, version=version, cloud_hosted=True
+        )
+        if collections:
+            return collections[0].concept_id()
+        return None
+
+    return _collection_metadata(("concept_id", product, version), fetch)
 
 
 # DevGoal: use a mock of this output to test later functions, such as displaying options and widgets, etc.
@@ -205,6 +279,31 @@ def _default_varlists(product):
         return common_list
 
 
+def _required_varlist(product):
+    """
+    Return the list of variables icepyx needs to merge the data of the product's files
+    (e.g. when reading them with `Read`).
+    """
+    # Skip products which do not contain required variables
+    if product in ["ATL14", "ATL15", "ATL23"]:
+        return []
+
+    var_list = [
+        "sc_orient",
+        "atlas_sdp_gps_epoch",
+        "cycle_number",
+        "rgt",
+        "data_start_utc",
+        "data_end_utc",
+    ]
+
+    # Adjust the nec_varlist for individual products
+    if product == "ATL11":
+        var_list.remove("sc_orient")
+
+    return var_list
+
+
 # Currently this function is used one-off, but if it needs to be done for a series of values,
 # a faster version using pandas map (instead of apply) is available in SlideRule:
 # https://github.com/SlideRuleEarth/sliderule/issues/388
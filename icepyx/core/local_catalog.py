@@ -0,0 +1,211 @@
+"""
+Index of the ICESat-2 granules in a local data directory, so queries can be answered
+from files already on disk.
+"""
+
+from pathlib import Path
+from typing import Union
+
+import geopandas as gpd
+import h5py
+import numpy as np
+import pandas as pd
+import shapely
+
+from icepyx.core.cache import read_json, write_json
+from icepyx.core.granules import parse_granule_ids
+
+INDEX_NAME = ".icepyx_index.json.gz"
+
+# root attributes of ICESat-2 files describing their extent
+_EXTENT_ATTRS = {
+    "west": "geospatial_lon_min",
+    "south": "geospatial_lat_min",
+    "east": "geospatial_lon_max",
+    "north": "geospatial_lat_max",
+    "start": "time_coverage_start",
+    "end": "time_coverage_end",
+}
+
+
+def _read_extent(path: Path) -> dict:
+    """
+    Read the spatial and temporal extent attributes of a file,
+    any of which may be None (e.g. if the file is not an ICESat-2 granule).
+    """
+    extent = dict.fromkeys(_EXTENT_ATTRS)
+    try:
+        with h5py.File(path, "r") as f:
+            for key, attr in _EXTENT_ATTRS.items():
+                if attr in f.attrs:
+                    val = np.squeeze(f.attrs[attr])
+                    if isinstance(val.item(), bytes):
+                        extent[key] = val.item().decode()
+                    else:
+                        extent[key] = val.item()
+    except OSError:
+        pass
+    return extent
+
+
+class LocalCatalog:
+    """
+    Catalog of the ICESat-2 granules in a local data directory.
+
+    The directory is scanned once, recording each file's product, release, version,
+    RGT, cycle, region, time range and footprint, from its file name and root
+    "geospatial_*" and "time_coverage_*" attributes.
+    The index is saved in the directory (as ".icepyx_index.json.gz"),
+    so later scans only read new or changed files.
+
+    Parameters
+    ----------
+    path : str or Path
+        The data directory, which is searched recursively.
+    pattern : str, default "*.h5"
+        Glob pattern of the data files.
+
+    See Also
+    --------
+    query.Query.local_granules
+
+    Examples
+    --------
+    >>> local = LocalCatalog("./data") # doctest: +SKIP
+    >>> reg_a = ipx.Query('ATL06',[-55, 68, -48, 71],['2019-02-20','2019-02-28']) # doctest: +SKIP
+    >>> reg_a.local_granules(local) # doctest: +SKIP
+    >>> reg_a.avail_granules(local_catalog=local) # doctest: +SKIP
+    """
+
+    def __init__(self, path: Union[str, Path], pattern: str = "*.h5"):
+        self.path = Path(path)
+        self.pattern = pattern
+        self._records = read_json(self.path / INDEX_NAME) or {}
+        self.update()
+
+    def __len__(self):
+        return len(self._records)
+
+    def __repr__(self):
+        return f"LocalCatalog({str(self.path)!r}, {len(self)} files)"
+
+    def update(self) -> int:
+        """
+        Index new or changed files, and drop deleted files from the index.
+
+        Returns
+        -------
+        int
+            The number of files (re-)indexed.
+        """
+        records = {}
+        new = []
+        for file in self.path.rglob(self.pattern):
+            key = file.relative_to(self.path).as_posix()
+            stat = file.stat()
+            record = self._records.get(key)
+            if (
+                record is None
+                or record["size"] != stat.st_size
+                or record["mtime"] != stat.st_mtime
+            ):
+                record = {"id": file.name, "size": stat.st_size, "mtime": stat.st_mtime}
+                new.append(key)
+            records[key] = record
+
+        if new:
+            parts = parse_granule_ids([records[key]["id"] for key in new], raw=True)
+            parts = parts[["product", "release", "version", "rgt", "cycle", "region"]]
+            for key, (_, row) in zip(new, parts.iterrows()):
+                records[key].update(row.where(row.notna(), None).to_dict())
+                records[key].update(_read_extent(self.path / key))
+
+        if new or len(records) != len(self._records):
+            self._records = records
+            write_json(self.path / INDEX_NAME, records)
+            if hasattr(self, "_df"):
+                del self._df
+        return len(new)
+
+    @property
+    def df(self) -> gpd.GeoDataFrame:
+        """
+        The indexed files, one row per file, with their footprint (bounding box)
+        as the geometry. Files without extent attributes have no geometry.
+        """
+        if not hasattr(self, "_df"):
+            df = pd.DataFrame.from_records(
+                list(self._records.values()),
+                index=pd.Index(list(self._records), name="path"),
+                columns=["id", "size", "mtime", "product", "release", "version"]
+                + ["rgt", "cycle", "region"]
+                + list(_EXTENT_ATTRS),
+            )
+            for col in ["release", "version", "rgt", "cycle", "region"]:
+                df[col] = pd.to_numeric(df[col]).astype("Int16")
+            # files without a time_coverage_start are dated by their file name
+            named = parse_granule_ids(df["id"])["datetime"].set_axis(df.index)
+            df["start"] = _to_datetime(df["start"]).fillna(named)
+            df["end"] = _to_datetime(df["end"]).fillna(df["start"])
+            bounds = df[["west", "south", "east", "north"]].astype(float)
+            geometry = shapely.box(*bounds.T.to_numpy())
+            self._df = gpd.GeoDataFrame(df, geometry=geometry, crs="epsg:4326")
+        return self._df
+
+    def search(
+        self,
+        product: Union[str, None] = None,
+        version: Union[str, int, None] = None,
+        extent=None,
+        start=None,
+        end=None,
+        cycles: Union[list, None] = None,
+        tracks: Union[list, None] = None,
+    ) -> gpd.GeoDataFrame:
+        """
+        Return the indexed files matching all the given criteria.
+
+        Parameters
+        ----------
+        product : str, default None
+            ICESat-2 data product ID (e.g. ATL06).
+        version : str or int, default None
+            Product version (release), e.g. "006".
+        extent : geopandas.GeoDataFrame or shapely geometry, default None
+            Spatial extent (in lon, lat) the footprint must intersect.
+        start, end : datetime-like, default None
+            Time range the file must overlap.
+        cycles, tracks : list of str or int, default None
+            Orbital cycles and Reference Ground Tracks.
+
+        Returns
+        -------
+        geopandas.GeoDataFrame
+            The matching rows of `df`.
+        """
+        df = self.df
+        keep = np.ones(len(df), dtype=bool)
+        if product is not None:
+            keep &= df["product"].eq(product).to_numpy()
+        if version is not None:
+            keep &= df["release"].eq(int(version)).fillna(False).to_numpy(dtype=bool)
+        if cycles is not None:
+            keep &= df["cycle"].isin([int(c) for c in cycles]).to_numpy(dtype=bool)
+        if tracks is not None:
+            keep &= df["rgt"].isin([int(t) for t in tracks]).to_numpy(dtype=bool)
+        if start is not None:
+            keep &= (df["end"] >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            keep &= (df["start"] <= pd.Timestamp(end)).to_numpy()
+        if extent is not None:
+            geoms = np.asarray(getattr(extent, "geometry", [extent]))
+            _, hits = df.sindex.query(geoms, predicate="intersects")
+            in_extent = np.zeros(len(df), dtype=bool)
+            in_extent[hits] = True
+            keep &= in_extent
+        return df[keep]
+
+
+def _to_datetime(values: pd.Series) -> pd.Series:
+    # ICESat-2 times are UTC, and compared with naive UTC datetimes
+    return pd.to_datetime(values, utc=True, format="mixed").dt.tz_localize(None)
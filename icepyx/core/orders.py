@@ -1,9 +1,36 @@
 from pathlib import Path
+import time
 from typing import Any, Dict, List, Union
+from urllib.parse import urlsplit
 
-import earthaccess
-
+from icepyx.core.download import download_files
 from icepyx.core.granules import Granules
+from icepyx.core.local_catalog import LocalCatalog
+from icepyx.core.store import CLAIM_POLL_SECONDS, GranuleStore
+
+
+def _merge_statuses(statuses: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine the statuses of the harmony jobs making up one (sharded) order.
+    """
+    states = [s["status"] for s in statuses]
+    if any(st.startswith("running") or st == "accepted" for st in states):
+        state = "running"
+    elif any(st in ("paused", "previewing") for st in states):
+        state = "paused"
+    elif all(st == "successful" for st in states):
+        state = "successful"
+    elif all(st in ("failed", "canceled") for st in states):
+        state = "failed"
+    else:
+        state = "complete_with_errors"
+
+    return {
+        "status": state,
+        "progress": sum(s.get("progress", 0) for s in statuses) / len(statuses),
+        "errors": [err for s in statuses for err in s.get("errors", [])],
+        "jobs": statuses,
+    }
 
 
 class DataOrder:
@@ -12,8 +39,8 @@ class DataOrder:
 
     Attributes
     ----------
-    job_id : str
-        The ID of the Harmony job.
+    job_id : str or list of str
+        The ID of the Harmony job, or the IDs of the jobs an order was split into.
     type : str
         The type of order (e.g., "subset").
     granules : list
@@ -27,29 +54,36 @@ class DataOrder:
 
     def __init__(
         self,
-        job_id: str,
+        job_id: Union[str, List[str]],
         type: str,
         granules: Union[List[Any], Granules],
         harmony_client: Any,
+        file_info: Union[Dict[str, Any], None] = None,
     ):
         """
         Initialize a DataOrder object.
 
         Parameters
         ----------
-        job_id : str
-            The ID of the Harmony job.
+        job_id : str or list of str
+            The ID of the Harmony job. An order split into several jobs (shards)
+            is tracked as one order by giving all their IDs.
         type : str
             The type of order (e.g., "subset").
         granules : list
             A list of granules included in the order.
         harmony_client : object
             The Harmony API client.
+        file_info : dict, optional
+            The expected size and checksum of each whole granule file, keyed by file name,
+            used to verify downloads (see `granules.Granules.archive_info`).
         """
         self._job_id = job_id
+        self._job_ids = list(job_id) if isinstance(job_id, (list, tuple)) else [job_id]
         self.harmony_api = harmony_client
         self.granules = granules
         self.type = type
+        self.file_info = file_info
 
     def __str__(self) -> str:
         return f"DataOrder(job_id={self._job_id}, type={self.type}, granules={self.granules})"
@@ -90,11 +124,15 @@ class DataOrder:
 
         Returns
         -------
-        str
-            The Harmony job ID.
+        str or list of str
+            The Harmony job ID, or IDs if the order was split into several jobs.
         """
         return self._job_id
 
+    def _for_each_job(self, action):
+        responses = [action(job_id) for job_id in self._job_ids]
+        return responses[0] if len(responses) == 1 else responses
+
     def resume(self) -> Union[Dict[str, Any], None]:
         """
         Resume the order if it has been paused or is on a "preview" state.
@@ -105,7 +143,7 @@ class DataOrder:
             The response from the Harmony API if the order is resumed, otherwise None.
         """
         if self.type == "subset":
-            return self.harmony_api.resume_order(self._job_id)
+            return self._for_each_job(self.harmony_api.resume_order)
         return None
 
     def skip_preview(self) -> Union[Dict[str, Any], None]:
@@ -118,7 +156,7 @@ class DataOrder:
             The response from the Harmony API if the order is resumed, otherwise None.
         """
         if self.type == "subset":
-            return self.harmony_api.skip_preview(self._job_id)
+            return self._for_each_job(self.harmony_api.skip_preview)
         return None
 
     def pause(self) -> Union[Dict[str, Any], None]:
@@ -131,7 +169,7 @@ class DataOrder:
             The response from the Harmony API if the order is paused, otherwise None.
         """
         if self.type == "subset":
-            return self.harmony_api.pause_order(self._job_id)
+            return self._for_each_job(self.harmony_api.pause_order)
         return None
 
     def status(self) -> Dict[str, Any]:
@@ -144,14 +182,49 @@ class DataOrder:
             A dictionary containing the order status and related metadata.
         """
         if self.type == "subset":
-            status = self.harmony_api.check_order_status(self._job_id)
-            # so users don't accidentally order again
-            status.pop("request")
-            status["order_url"] = self.HARMONY_BASE_URL + str(self._job_id)
-            return status
+            statuses = []
+            for job_id in self._job_ids:
+                status = self.harmony_api.check_order_status(job_id)
+                # so users don't accidentally order again
+                status.pop("request")
+                status["order_url"] = self.HARMONY_BASE_URL + str(job_id)
+                statuses.append(status)
+            if len(statuses) == 1:
+                return statuses[0]
+            return _merge_statuses(statuses)
         return {"status": "complete"}
 
-    def download_granules(self, path, overwrite=False) -> Union[list, None]:
+    def wait(self, min_interval: Union[float, None] = None) -> Dict[str, Any]:
+        """
+        Wait until the order is no longer running, and return its status.
+        The status is polled less often the longer the order goes without progressing.
+
+        Parameters
+        ----------
+        min_interval : float, optional
+            The shortest time between status requests, in seconds
+            (see `harmony.HarmonyApi.wait_for_job`).
+
+        Returns
+        -------
+        dict
+            A dictionary containing the order status and related metadata.
+        """
+        if self.type == "subset":
+            for job_id in self._job_ids:
+                self.harmony_api.wait_for_job(job_id, min_interval=min_interval)
+        return self.status()
+
+    def download_granules(
+        self,
+        path,
+        overwrite=False,
+        max_workers=4,
+        stream=False,
+        store=None,
+        priority="interactive",
+        local_catalog=None,
+    ) -> Union[list, None]:
         """
         Download the granules for the order.
 
@@ -161,24 +234,132 @@ class DataOrder:
             The directory where granules should be saved.
         overwrite : bool, optional
             Whether to overwrite existing files (default is False).
+        max_workers : int, optional
+            Maximum number of whole granules downloaded at the same time (default is 4).
+        stream : bool, optional
+            Whether to download subset granules as soon as each is ready,
+            while the order is still being processed (default is False).
+        store : GranuleStore, optional
+            A local granule store to take granules from and add downloads to.
+        priority : {"interactive", "bulk"}, optional
+            Priority class of the downloads (default is "interactive").
+        local_catalog : LocalCatalog, optional
+            A catalog of local files to update with the downloaded granules.
+
         Returns
         -------
         list or None
             A list of downloaded granules
 
         """
-        return self.download(path, overwrite=overwrite)
+        return self.download(
+            path,
+            overwrite=overwrite,
+            max_workers=max_workers,
+            stream=stream,
+            store=store,
+            priority=priority,
+            local_catalog=local_catalog,
+        )
 
-    def download(self, path, overwrite=False) -> Union[list, None]:
+    def _download_to_store(
+        self,
+        path: Path,
+        store: GranuleStore,
+        overwrite=False,
+        max_workers=4,
+        priority="interactive",
+    ) -> list:
+        """
+        Download the whole granules missing from the store into it,
+        then link all the granules into path.
+        """
+        names = [Path(urlsplit(url).path).name for url in self.granules]
+        urls = dict(zip(names, self.granules))
+        missing = [name for name in names if overwrite or name not in store]
+        while missing:
+            # each granule is downloaded into the store's incoming directory by the
+            # one process that claims it, then moved into the store once complete;
+            # a partial download is kept, so it is resumed by the next claim
+            claimed = []
+            for name in missing:
+                if not store.claim(name):
+                    continue
+                if name in store and not overwrite:
+                    # stored by another process since it was found missing
+                    store.release(name)
+                else:
+                    claimed.append(name)
+            try:
+                if claimed:
+                    download_files(
+                        [urls[name] for name in claimed],
+                        store.incoming,
+                        max_workers=max_workers,
+                        overwrite=overwrite,
+                        file_info=self.file_info,
+                        priority=priority,
+                    )
+            finally:
+                # keep the granules that did download, even if others failed
+                for name in claimed:
+                    file = store.incoming / name
+                    if file.exists():
+                        store.add_granule(file)
+                    store.release(name)
+            # wait for the granules claimed by other processes to be stored
+            # (or for their claims to be released, to download them here)
+            missing = [
+                name for name in missing if name not in claimed and name not in store
+            ]
+            if missing:
+                time.sleep(CLAIM_POLL_SECONDS)
+                missing = [name for name in missing if name not in store]
+        return store.link(names, path)
+
+    def download(
+        self,
+        path,
+        overwrite=False,
+        max_workers=4,
+        stream=False,
+        store: Union[GranuleStore, None] = None,
+        priority: str = "interactive",
+        local_catalog: Union[LocalCatalog, None] = None,
+    ) -> Union[list, None]:
         """
         Download the granules for the order, blocking until they are ready if necessary.
 
+        Whole granules are downloaded in parallel. Partially downloaded granules
+        (e.g. from an interrupted download) are resumed rather than restarted,
+        and complete granules are verified against their CMR size and checksum.
+
         Parameters
         ----------
         path : str or Path
             The directory where granules should be saved.
         overwrite : bool, optional
             Whether to overwrite existing files (default is False).
+        max_workers : int, optional
+            Maximum number of whole granules downloaded, or of subset order jobs
+            tracked and downloaded, at the same time (default is 4).
+        stream : bool, optional
+            Whether to download subset granules as soon as each is ready,
+            while the order is still being processed (default is False).
+        store : GranuleStore, optional
+            A local granule store shared between orders (see `store.GranuleStore`).
+            Whole granules already in the store are linked into `path` rather than
+            downloaded again, and new downloads are added to the store.
+            Subset granules are added to the store by content, so identical
+            outputs are only stored once.
+        priority : {"interactive", "bulk"}, optional
+            Priority class of the downloads (default is "interactive").
+            Bulk downloads give way to interactive ones, and get a smaller share of
+            a capped bandwidth (see `scheduler.DownloadScheduler`).
+        local_catalog : LocalCatalog, optional
+            A catalog of local files to update once the granules are downloaded,
+            so the new files are found by later searches (see `LocalCatalog.update`).
+            `path` must be within the catalog's directory.
 
         Returns
         -------
@@ -186,13 +367,47 @@ class DataOrder:
             A list of downloaded granules
         """
         path = Path(path)
+        if local_catalog is not None and not path.resolve().is_relative_to(
+            local_catalog.path.resolve()
+        ):
+            raise ValueError(
+                f"The download directory {path} is not within {local_catalog}, "
+                "so the downloaded granules would not be added to the catalog."
+            )
         path.mkdir(parents=True, exist_ok=True)
+        files = None
         if self.type == "subset":
-            return self.harmony_api.download_granules(
-                download_dir=str(path), overwrite=overwrite
+            files = self.harmony_api.download_granules(
+                download_dir=str(path),
+                overwrite=overwrite,
+                stream=stream,
+                max_workers=max_workers,
+                priority=priority,
             )
+            if store is not None:
+                for file in files:
+                    store.add_subset(file)
         else:
             if self.granules is None:
                 raise ValueError("No granules to download.")
             if not isinstance(self.granules, Granules):
-                return earthaccess.download(self.granules, local_path=path)
+                if store is None:
+                    files = download_files(
+                        self.granules,
+                        path,
+                        max_workers=max_workers,
+                        overwrite=overwrite,
+                        file_info=self.file_info,
+                        priority=priority,
+                    )
+                else:
+                    files = self._download_to_store(
+                        path,
+                        store,
+                        overwrite=overwrite,
+                        max_workers=max_workers,
+                        priority=priority,
+                    )
+        if local_catalog is not None:
+            local_catalog.update()
+        return files
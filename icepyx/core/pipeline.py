@@ -0,0 +1,177 @@
+"""
+Pipelined downloading and processing of whole granules, so downloads overlap with
+reading (and reducing) the files that have already arrived.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import functools
+from pathlib import Path
+import threading
+from typing import Any, Callable, Union
+from urllib.parse import urlsplit
+
+from icepyx.core.download import _download_file, _earthdata_session
+from icepyx.core.exceptions import PipelineError
+from icepyx.core.read import Read
+
+
+def read_granule(path: Union[str, Path], var_list: list[str]):
+    """
+    Read variables from a granule into memory, with `Read`.
+
+    Parameters
+    ----------
+    path : str or Path
+        The granule file.
+    var_list : list of str
+        The variables to read (see `Variables.append`).
+
+    Returns
+    -------
+    xarray.Dataset
+    """
+    reader = Read(str(path))
+    reader.variables.append(var_list=var_list)
+    # the data are loaded into memory, so the file can be deleted afterwards
+    return reader.load().load()
+
+
+def run_pipeline(
+    urls: list[str],
+    path: Union[str, Path],
+    reduce: Union[Callable[[Path], Any], None] = None,
+    var_list: Union[list[str], None] = None,
+    download_workers: int = 4,
+    reduce_workers: int = 2,
+    depth: Union[int, None] = None,
+    delete: bool = False,
+    overwrite: bool = False,
+    file_info: Union[dict, None] = None,
+    session=None,
+    priority: str = "interactive",
+) -> list:
+    """
+    Download files and process (read and/or reduce) each one as soon as it arrives.
+
+    Downloading and processing run in separate worker pools, so the network and CPU
+    are used at the same time. At most `depth` files are downloaded but not yet
+    processed at any time, so with `delete=True` disk use is bounded by the depth of
+    the pipeline rather than the size of the whole order.
+
+    Parameters
+    ----------
+    urls : list of str
+        The (https) URLs of the files.
+    path : str or Path
+        The directory where files are downloaded.
+    reduce : callable, default None
+        Function called with the path of each downloaded file, whose return value is
+        collected. It must not keep the file open if `delete` is True.
+        By default, the `var_list` variables are read with `read_granule`.
+    var_list : list of str, default None
+        Variables to read, if no `reduce` function is given.
+    download_workers : int, default 4
+        Maximum number of files downloaded at the same time.
+    reduce_workers : int, default 2
+        Maximum number of files processed at the same time.
+    depth : int, default None
+        Maximum number of files downloaded ahead of processing.
+        By default, ``download_workers + reduce_workers``.
+    delete : bool, default False
+        Delete each file downloaded by this run once it has been processed
+        successfully. Files that were already in `path`, and files that could not
+        be processed, are kept.
+    overwrite : bool, default False
+        Download files that already exist in `path` again.
+    file_info : dict, default None
+        Expected "size" and "checksum" of the files, keyed by file name
+        (see `download.download_files`).
+    session : requests.Session, default None
+        The session to download with. By default, a session authenticated with
+        NASA Earthdata Login.
+    priority : {"interactive", "bulk"}, default "interactive"
+        Priority class of the downloads (see `download.download_files`).
+
+    Returns
+    -------
+    list
+        The result of `reduce` for each file, in the order of `urls`.
+
+    Raises
+    ------
+    PipelineError
+        If any file could not be downloaded or processed (after all the others
+        have finished).
+
+    Examples
+    --------
+    >>> results = run_pipeline(urls, "./data", var_list=["h_li"], delete=True) # doctest: +SKIP
+    >>> ds = xr.concat(results, dim="gran_idx") # doctest: +SKIP
+    """
+    if reduce is None:
+        assert var_list, "Give either a reduce function or a list of variables to read"
+        reduce = functools.partial(read_granule, var_list=var_list)
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    file_info = file_info or {}
+    if session is None:
+        session = _earthdata_session()
+    if depth is None:
+        depth = download_workers + reduce_workers
+    # a slot is held by each file from the start of its download until it is processed
+    slots = threading.BoundedSemaphore(depth)
+
+    dests = [path / Path(urlsplit(url).path).name for url in urls]
+    # the files downloaded (rather than found in path) by this run
+    downloaded = set()
+
+    def fetch(i):
+        slots.acquire()
+        try:
+            if overwrite or not dests[i].exists():
+                downloaded.add(i)
+            _download_file(
+                session,
+                urls[i],
+                dests[i],
+                overwrite=overwrite,
+                priority=priority,
+                **file_info.get(dests[i].name, {}),
+            )
+        except BaseException:
+            slots.release()
+            raise
+
+    def process(i):
+        try:
+            result = reduce(dests[i])
+            if delete and i in downloaded:
+                dests[i].unlink(missing_ok=True)
+            return result
+        finally:
+            slots.release()
+
+    results = [None] * len(urls)
+    failed = {}
+    with (
+        ThreadPoolExecutor(max_workers=download_workers) as downloads,
+        ThreadPoolExecutor(max_workers=reduce_workers) as reducers,
+    ):
+        pending = {downloads.submit(fetch, i): (fetch, i) for i in range(len(urls))}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, i = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed[urls[i]] = e
+                    continue
+                if stage is fetch:
+                    pending[reducers.submit(process, i)] = (process, i)
+                else:
+                    results[i] = result
+
+    if failed:
+        raise PipelineError(failed)
+    return results
@@ -3,12 +3,10 @@ import json
 import logging
 from pathlib import Path
 from pprint import pprint
-import sys
-import time
 from typing import Any, Dict, Union
+import warnings
 
 from deprecated import deprecated
-import earthaccess
 import geopandas as gpd
 import harmony
 import matplotlib.pyplot as plt
@@ -18,12 +16,15 @@ from icepyx.core.auth import EarthdataAuthMixin
 from icepyx.core.granules import Granules, gran_IDs
 from icepyx.core.harmony import HarmonyApi, HarmonyTemporal
 import icepyx.core.is2ref as is2ref
+from icepyx.core.local_catalog import LocalCatalog
 from icepyx.core.orders import DataOrder
+from icepyx.core.pipeline import run_pipeline
 import icepyx.core.spatial as spat
+from icepyx.core.store import GranuleStore
 import icepyx.core.temporal as tp
 from icepyx.core.types import CMRParams
 import icepyx.core.validate_inputs as val
-from icepyx.core.variables import Variables
+from icepyx.core.variables import Variables, list_of_dict_vals
 from icepyx.core.visualization import Visualize
 
 
@@ -406,6 +407,8 @@ class Query(GenQuery, EarthdataAuthMixin):
 
     _temporal: Union[tp.Temporal, None]
     _CMRparams: apifmt.CMRParameters
+    # the shortest time between order status requests while waiting for an order
+    # (requesting the status too often can result in a 500 error)
     REQUEST_RETRY_INTERVAL_SECONDS = 3
 
     # ----------------------------------------------------------------------
@@ -562,13 +565,7 @@ class Query(GenQuery, EarthdataAuthMixin):
             version = self._version
         else:
             version = is2ref.latest_version(short_name)
-        collections = earthaccess.search_datasets(
-            short_name=short_name, version=version, cloud_hosted=True
-        )
-        if collections:
-            return collections[0].concept_id()
-        else:
-            return None
+        return is2ref.concept_id(short_name, version)
 
     @property
     def product(self):
@@ -769,16 +766,21 @@ class Query(GenQuery, EarthdataAuthMixin):
         """
         Get the concept ID for the specified product and version. Note that we are forcing CMR to use the cloud copy.
         """
-        collections = earthaccess.search_datasets(
-            short_name=product, version=version, cloud_hosted=True
-        )
-        if collections:
-            return collections[0].concept_id()
-        else:
-            return None
+        return is2ref.concept_id(product, version)
 
     # DevGoal: check to make sure the see also bits of the docstrings work properly in RTD
-    def avail_granules(self, ids=False, cycles=False, tracks=False, cloud=False):
+    def avail_granules(
+        self,
+        ids=False,
+        cycles=False,
+        tracks=False,
+        cloud=False,
+        shards=1,
+        cache_ttl=None,
+        revalidate=False,
+        footprint_filter=False,
+        local_catalog=None,
+    ):
         """
         Obtain information about the available granules for the query
         object's parameters. By default, a complete list of available granules is
@@ -801,6 +803,34 @@ class Query(GenQuery, EarthdataAuthMixin):
             Note: except in rare cases while data is in the process of being appended to,
             data available in the cloud and for download via on-premesis will be identical.
 
+        shards : int, default 1
+            Split the granule search into this many concurrent searches
+            (by temporal range, or by cycles/tracks).
+            Speeds up searches returning many thousands of granules.
+            See Granules.get_avail.
+
+        cache_ttl : int, float, or datetime.timedelta, default None
+            Reuse on-disk results of an identical granule search made within this many seconds.
+            By default, results are not cached. See Granules.get_avail.
+
+        revalidate : bool, default False
+            When cached results are older than cache_ttl, only search for granules
+            updated since the cached search. See Granules.get_avail.
+
+        footprint_filter : bool, default False
+            Drop granules whose footprint polygon does not intersect the spatial extent.
+            CMR matches granules on their bounding metadata, so polygon searches
+            (especially of narrow regions) may return granules that do not overlap the region.
+            Dropped granules are excluded from subsequent orders and downloads.
+            See Granules.filter_footprints.
+
+        local_catalog : LocalCatalog, default None
+            Drop granules that are already in this catalog of local files,
+            so only the missing granules are ordered and downloaded.
+            See `local_granules` to get the matching local files.
+            The catalog is updated once the missing granules are downloaded
+            (see `download_granules`).
+
         Examples
         --------
         >>> reg_a = ipx.Query('ATL06',[-55, 68, -48, 71],['2019-02-20','2019-02-28'])
@@ -824,7 +854,19 @@ class Query(GenQuery, EarthdataAuthMixin):
         try:
             self.granules.avail
         except AttributeError:
-            self.granules.get_avail(self.CMRparams)
+            self.granules.get_avail(
+                self.CMRparams,
+                shards=shards,
+                cache_ttl=cache_ttl,
+                revalidate=revalidate,
+            )
+
+        if footprint_filter:
+            self.granules.filter_footprints(self._spatial.extent_as_gdf)
+        if local_catalog is not None:
+            n_local = self.granules.exclude(local_catalog.df["id"])
+            print(f"{n_local} of the available granules are already in {local_catalog}")
+            self._local_catalog = local_catalog
 
         if ids or cycles or tracks or cloud:
             # list of outputs in order of ids, cycles, tracks, cloud
@@ -838,7 +880,156 @@ class Query(GenQuery, EarthdataAuthMixin):
         else:
             return self.granules.avail
 
-    def _order_subset_granules(self, skip_preview: bool = False) -> str:
+    def local_granules(self, catalog: LocalCatalog) -> gpd.GeoDataFrame:
+        """
+        Find the local files matching the query object's parameters
+        (product, version, spatial extent, time range, cycles and tracks),
+        without searching CMR.
+
+        Parameters
+        ----------
+        catalog : LocalCatalog
+            The catalog of a local data directory.
+
+        Returns
+        -------
+        geopandas.GeoDataFrame
+            The matching files (see `LocalCatalog.df`).
+
+        See Also
+        --------
+        avail_granules
+
+        Examples
+        --------
+        >>> reg_a = ipx.Query('ATL06',[-55, 68, -48, 71],['2019-02-20','2019-02-28']) # doctest: +SKIP
+        >>> reg_a.local_granules(ipx.LocalCatalog("./data"))["id"].tolist() # doctest: +SKIP
+        ['ATL06_20190221121851_08410203_006_01.h5']
+        """
+        return catalog.search(
+            product=self._prod,
+            version=self._version,
+            extent=self._spatial.extent_as_gdf,
+            start=self._temporal.start if self._temporal else None,
+            end=self._temporal.end if self._temporal else None,
+            cycles=self._cycles,
+            tracks=self._tracks,
+        )
+
+    def iter_granules(self):
+        """
+        Iterate over the available granules for the query object's parameters,
+        yielding each granule's CMR metadata as soon as its page of search results arrives.
+        Use this instead of `avail_granules` to start working with the first granules
+        of a large search (e.g. downloading them) while the rest are still being found.
+        Once iteration completes, the granules are also available via `avail_granules`.
+
+        Examples
+        --------
+        >>> reg_a = ipx.Query('ATL06',[-55, 68, -48, 71],['2019-02-20','2019-02-28']) # doctest: +SKIP
+        >>> for gran in reg_a.iter_granules():  # doctest: +SKIP
+        ...     print(gran["producer_granule_id"])
+        ATL06_20190221121851_08410203_006_01.h5
+        ATL06_20190222010344_08490205_006_01.h5
+        ATL06_20190225121032_09020203_006_01.h5
+        ATL06_20190226005526_09100205_006_01.h5
+
+        See Also
+        --------
+        granules.Granules.iter_avail
+        """
+        return self.granules.iter_avail(self.CMRparams)
+
+    def restrict_tracks(self, rgt_index):
+        """
+        Limit the granule search to the Reference Ground Tracks (RGTs), and granule regions,
+        that intersect the spatial extent, as determined offline from an index of RGT
+        geometry. This shrinks CMR searches and orders for small regions, and shows which
+        tracks cover the region without any network access.
+        Any tracks and cycles given when creating the query object are respected.
+
+        Parameters
+        ----------
+        rgt_index : icepyx.core.rgt.RGTIndex
+            Spatial index of the RGT (and granule region) ground tracks.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The RGTs (and granule regions) that intersect the spatial extent.
+
+        Examples
+        --------
+        >>> from icepyx.core.rgt import RGTIndex
+        >>> rgt_index = RGTIndex.from_file("IS2_RGTs_cycle12.zip") # doctest: +SKIP
+        >>> reg_a = ipx.Query('ATL06',[-55, 68, -48, 71],['2019-02-20','2019-02-28']) # doctest: +SKIP
+        >>> reg_a.restrict_tracks(rgt_index) # doctest: +SKIP
+        >>> reg_a.CMRparams["readable_granule_name[]"][:2] # doctest: +SKIP
+        ['ATL06_??????????????_0026????_*', 'ATL06_??????????????_0027????_*']
+        """
+        candidates = rgt_index.candidates(self._spatial.extent_as_gdf)
+        if self._tracks:
+            tracks = [int(t) for t in self._tracks]
+            candidates = candidates[candidates["rgt"].isin(tracks)]
+        assert len(candidates) > 0, (
+            "No Reference Ground Tracks intersect your spatial extent"
+        )
+
+        readable_granule_name = []
+        for rgt, group in candidates.groupby("rgt"):
+            regions = None
+            if rgt_index.has_regions:
+                regions = [f"{r:02d}" for r in group["region"]]
+            readable_granule_name.extend(
+                apifmt._fmt_readable_granules(
+                    self._prod,
+                    cycles=self._cycles,
+                    tracks=[f"{rgt:04d}"],
+                    regions=regions,
+                )
+            )
+        self._readable_granule_name = readable_granule_name
+
+        # rebuild the CMR parameters with the new granule names
+        if hasattr(self, "_CMRparams"):
+            del self._CMRparams
+
+        return candidates
+
+    def _harmony_variables(self, concept_id: str) -> Union[list[str], None]:
+        """
+        The wanted variable paths (see `variables`), as named by harmony, to subset
+        the order to, or None to order all the variables.
+        The variables `Read` needs to merge the data are always included, so the
+        subset files can be read with icepyx.
+        """
+        if not hasattr(self, "_variables") or not self._variables.wanted:
+            return None
+        wanted = list_of_dict_vals(self._variables.wanted)
+
+        capabilities = self.harmony_api.get_capabilities(concept_id=concept_id)
+        if not capabilities.get("variableSubset"):
+            warnings.warn(
+                f"Harmony does not support variable subsetting for {self._prod}, "
+                "so all variables will be ordered."
+            )
+            return None
+
+        # harmony variable names may or may not have a leading slash
+        names = {v["name"].strip("/"): v["name"] for v in capabilities["variables"]}
+        unknown = [path for path in wanted if path.strip("/") not in names]
+        if unknown:
+            raise ValueError(
+                f"These wanted variables are not available for subsetting: {unknown}"
+            )
+        required = set(is2ref._required_varlist(self._prod))
+        paths = [path.strip("/") for path in wanted]
+        paths += [path for path in names if path.rsplit("/", 1)[-1] in required]
+        return [names[path] for path in dict.fromkeys(paths)]
+
+    def _order_subset_granules(
+        self, skip_preview: bool = False, shard_size: Union[int, None] = None
+    ) -> Union[str, list[str]]:
         concept_id = self._get_concept_id(
             product=self._prod,
             version=self._version,
@@ -850,6 +1041,9 @@ class Query(GenQuery, EarthdataAuthMixin):
             )
 
         readable_granule_name = self.CMRparams.get("readable_granule_name[]", [])
+        if hasattr(self.granules, "_filtered"):
+            # only order the granules that remain after filtering (e.g. by footprint)
+            readable_granule_name = gran_IDs(self.granules.avail, ids=True)[0]
         harmony_temporal = None
         harmony_spatial = None
         if self._temporal:
@@ -887,14 +1081,40 @@ class Query(GenQuery, EarthdataAuthMixin):
             if harmony_temporal is None:
                 raise ValueError("No temporal or spatial parameters provided.")
 
-        job_id = self.harmony_api.place_order(
-            concept_id=concept_id,
-            temporal=harmony_temporal,
-            spatial=harmony_spatial,
-            granule_name=list(readable_granule_name),
-            skip_preview=skip_preview,
-        )
-        return job_id
+        variables = self._harmony_variables(concept_id)
+
+        if shard_size is None:
+            job_id = self.harmony_api.place_order(
+                concept_id=concept_id,
+                temporal=harmony_temporal,
+                spatial=harmony_spatial,
+                granule_name=list(readable_granule_name),
+                skip_preview=skip_preview,
+                variables=variables,
+            )
+            return job_id
+
+        # split the (available) granules into several smaller jobs, which harmony
+        # processes in parallel
+        if not hasattr(self.granules, "_filtered"):
+            if not hasattr(self.granules, "avail"):
+                self.granules.get_avail(self.CMRparams)
+            readable_granule_name = gran_IDs(self.granules.avail, ids=True)[0]
+        if len(readable_granule_name) == 0:
+            raise ValueError("There are no granules to order.")
+        job_ids = []
+        for i in range(0, len(readable_granule_name), shard_size):
+            job_ids.append(
+                self.harmony_api.place_order(
+                    concept_id=concept_id,
+                    temporal=harmony_temporal,
+                    spatial=harmony_spatial,
+                    granule_name=list(readable_granule_name[i : i + shard_size]),
+                    skip_preview=True,
+                    variables=variables,
+                )
+            )
+        return job_ids
 
     def _get_granule_links(self, cloud_hosted=False) -> list[str]:
         """
@@ -957,7 +1177,10 @@ class Query(GenQuery, EarthdataAuthMixin):
                 return self.last_order.resume()
 
     def order_granules(
-        self, subset: bool = True, skip_preview: bool = False
+        self,
+        subset: bool = True,
+        skip_preview: bool = False,
+        shard_size: Union[int, None] = None,
     ) -> DataOrder:
         """
         Place an order for the available granules for the query object.
@@ -970,8 +1193,15 @@ class Query(GenQuery, EarthdataAuthMixin):
             by default when subset=True, but additional subsetting options are available.
             Spatial subsetting returns all data that are within the area of interest (but not complete
             granules. This eliminates false-positive granules returned by the metadata-level search)
+            If variables have been added to `variables.wanted`, the granules are also subset
+            to only those variables.
         skip_preview : bool, default False
             If True, bypass the preview state when we order subsetting queries that exceed 300 granules.
+        shard_size : int, default None
+            For subset orders, split the order into several harmony jobs of at most
+            `shard_size` granules each, which are processed in parallel (and skip the
+            preview state). The jobs are tracked, and their results downloaded,
+            as a single order. By default, all the granules are ordered in one job.
 
         See Also
         --------
@@ -991,20 +1221,99 @@ class Query(GenQuery, EarthdataAuthMixin):
         # only instantiate the client when we are about to order data
         self.harmony_api = HarmonyApi()
         if subset:
-            job_id = self._order_subset_granules(skip_preview=skip_preview)
+            if shard_size is not None:
+                assert shard_size > 0, "shard_size must be a positive integer"
+            job_id = self._order_subset_granules(
+                skip_preview=skip_preview, shard_size=shard_size
+            )
             self.last_order = DataOrder(
                 job_id, "subset", self.granules, self.harmony_api
             )
             return self.last_order
         else:
             files = self._order_whole_granules()
-            self.last_order = DataOrder("nosubset", "whole", files, self.harmony_api)
+            # the sizes and checksums of the ordered granules' files, to verify downloads
+            self.last_order = DataOrder(
+                "nosubset",
+                "whole",
+                files,
+                self.harmony_api,
+                file_info=self.granules.archive_info(),
+            )
             return self.last_order
 
+    def download_and_read(
+        self,
+        path: Path,
+        reduce=None,
+        var_list: Union[list[str], None] = None,
+        download_workers: int = 4,
+        reduce_workers: int = 2,
+        depth: Union[int, None] = None,
+        delete: bool = False,
+        priority: str = "interactive",
+    ) -> list:
+        """
+        Download the whole granules and read (or reduce) each one as soon as it arrives,
+        rather than reading only once all the granules have been downloaded.
+        See `pipeline.run_pipeline`.
+
+        Parameters
+        ----------
+        path : str or Path
+            The directory where granules are downloaded.
+        reduce : callable, default None
+            Function called with the path of each downloaded granule, whose return
+            values are returned. By default, the `var_list` variables are read.
+        var_list : list of str, default None
+            Variables to read, if no `reduce` function is given.
+        download_workers : int, default 4
+            Maximum number of granules downloaded at the same time.
+        reduce_workers : int, default 2
+            Maximum number of granules read (or reduced) at the same time.
+        depth : int, default None
+            Maximum number of granules downloaded ahead of reading.
+            By default, ``download_workers + reduce_workers``.
+        delete : bool, default False
+            Delete each granule once it has been read, so that disk use is bounded by
+            `depth` granules.
+        priority : {"interactive", "bulk"}, default "interactive"
+            Priority class of the downloads (see `download_granules`).
+
+        Returns
+        -------
+        list
+            The data read from (or the result of `reduce` for) each granule.
+
+        Examples
+        --------
+        >>> reg_a = ipx.Query('ATL06',[-55, 68, -48, 71],['2019-02-20','2019-02-28']) # doctest: +SKIP
+        >>> dss = reg_a.download_and_read("./data", var_list=["h_li"], delete=True) # doctest: +SKIP
+        """
+        if not hasattr(self, "last_order") or self.last_order.type != "whole":
+            self.order_granules(subset=False)
+        return run_pipeline(
+            self.last_order.granules,
+            path,
+            reduce=reduce,
+            var_list=var_list,
+            download_workers=download_workers,
+            reduce_workers=reduce_workers,
+            depth=depth,
+            delete=delete,
+            file_info=self.last_order.file_info,
+            priority=priority,
+        )
+
     def download_granules(
         self,
         path: Path,
         overwrite: bool = False,
+        max_workers: int = 4,
+        stream: bool = False,
+        store: Union[GranuleStore, None] = None,
+        priority: str = "interactive",
+        local_catalog: Union[LocalCatalog, None] = None,
     ) -> Union[list[str], None]:
         """
         Download the granules for the order, blocking until they are ready if necessary.
@@ -1015,6 +1324,31 @@ class Query(GenQuery, EarthdataAuthMixin):
             The directory where granules should be saved.
         overwrite : bool, optional
             Whether to overwrite existing files (default is False).
+        max_workers : int, optional
+            Maximum number of whole granules downloaded, or of subset order jobs
+            tracked and downloaded, at the same time (default is 4).
+            Interrupted whole granule downloads are resumed when this is run again.
+        stream : bool, optional
+            For subset orders, download each subset granule as soon as harmony has
+            processed it, rather than waiting for the whole order to complete
+            (default is False). Downloading then overlaps with processing,
+            so large orders finish sooner.
+            Granules that were processed successfully are returned even if
+            the order completes with errors. This is also the case for orders split
+            into several jobs (see `order_granules`), whose jobs' results are each
+            downloaded as soon as the job completes.
+        store : GranuleStore, optional
+            A local granule store, shared between queries (and users), to take granules
+            from rather than downloading them again, and to add downloaded granules to.
+            The granules are linked into `path` from the store.
+        priority : {"interactive", "bulk"}, optional
+            Priority class of the downloads (default is "interactive").
+            Use "bulk" for large background downloads, which then give way to
+            interactive downloads (see `scheduler.DownloadScheduler`).
+        local_catalog : LocalCatalog, optional
+            A catalog of local files to update with the downloaded granules.
+            `path` must be within the catalog's directory. By default, the catalog
+            given to `avail_granules`, if any and if `path` is within it.
 
         Returns
         -------
@@ -1025,6 +1359,33 @@ class Query(GenQuery, EarthdataAuthMixin):
         # are no job IDs registered by the harmony API
         if hasattr(self, "last_order") is None:
             raise ValueError("No order has been placed yet.")
+
+        if local_catalog is None:
+            local_catalog = getattr(self, "_local_catalog", None)
+            # only update the catalog by default if the granules are downloaded to it
+            if local_catalog is not None and not Path(path).resolve().is_relative_to(
+                local_catalog.path.resolve()
+            ):
+                local_catalog = None
+
+        sharded = isinstance(self.last_order.job_id(), list)
+        if (stream or sharded) and self.last_order.type == "subset":
+            # the jobs are tracked (and their results downloaded) as they complete
+            files = self.last_order.download(
+                path,
+                overwrite=overwrite,
+                max_workers=max_workers,
+                stream=stream,
+                store=store,
+                priority=priority,
+                local_catalog=local_catalog,
+            )
+            status = self.last_order.status()
+            if status["status"] in ("complete_with_errors", "failed"):
+                print("Harmony provided these error messages:")
+                pprint(status["errors"])
+            return files
+
         status = self.last_order.status()
         if status["status"] == "running" or status["status"] == "accepted":
             print(
@@ -1033,18 +1394,20 @@ class Query(GenQuery, EarthdataAuthMixin):
                     f"{status['status']}. Please continue waiting... this may take a few moments."
                 )
             )
-            while (
-                status["status"].startswith("running") or status["status"] == "accepted"
-            ):
-                sys.stdout.write(".")
-                sys.stdout.flush()
-                # Requesting the status too often can result in a 500 error.
-                time.sleep(self.REQUEST_RETRY_INTERVAL_SECONDS)
-                status = self.last_order.status()
+            status = self.last_order.wait(
+                min_interval=self.REQUEST_RETRY_INTERVAL_SECONDS
+            )
 
         if status["status"] == "complete_with_errors" or status["status"] == "failed":
             print("Harmony provided these error messages:")
             pprint(status["errors"])
             return None
         else:
-            return self.last_order.download(path, overwrite=overwrite)
+            return self.last_order.download(
+                path,
+                overwrite=overwrite,
+                max_workers=max_workers,
+                store=store,
+                priority=priority,
+                local_catalog=local_catalog,
+            )
@@ -1,5 +1,6 @@
 import glob
 import os
+import posixpath
 import sys
 import warnings
 
@@ -159,6 +160,82 @@ def _confirm_proceed():
         sys.exit(0)
 
 
+def _dataset_sizes(h5f, var_paths):
+    """
+    Get the in-memory (uncompressed) and stored (on-disk) size in bytes of each variable,
+    using only the dataset metadata (shape, dtype, and allocated storage) of an open file.
+
+    Parameters
+    ----------
+    h5f : h5py.File
+        Open ICESat-2 data file.
+    var_paths : list[str]
+        Full paths to data variables within the file.
+        Paths not present in the file are skipped.
+
+    Returns
+    -------
+    dict of variable path: (in-memory bytes, stored bytes)
+    """
+    sizes = {}
+    for vpath in var_paths:
+        try:
+            dset = h5f[vpath]
+        except KeyError:
+            continue
+        nbytes = int(np.prod(dset.shape, dtype=np.int64)) * dset.dtype.itemsize
+        sizes[vpath] = (nbytes, dset.id.get_storage_size())
+    return sizes
+
+
+def _coordinate_sizes(h5f, var_paths):
+    """
+    Get the in-memory and stored size in bytes of the coordinates loaded along with
+    the variables in each data (beam) group: the group's delta_time, the variables named
+    in the "coordinates" attributes and the dimension scales of the variables,
+    and the int64 photon_idx index icepyx adds along delta_time.
+
+    Parameters
+    ----------
+    h5f : h5py.File
+        Open ICESat-2 data file.
+    var_paths : list[str]
+        Full paths to data variables within the file.
+
+    Returns
+    -------
+    dict of coordinate path: (in-memory bytes, stored bytes)
+        The photon_idx index of a group is keyed as "<group>/photon_idx".
+    """
+    coords = {}
+    for vpath in var_paths:
+        grp_path = posixpath.dirname(vpath)
+        if grp_path.split("/")[0] in ("", "orbit_info", "ancillary_data"):
+            continue
+        try:
+            dset = h5f[vpath]
+        except KeyError:
+            continue
+        grp_coords = coords.setdefault(grp_path, set())
+        if "delta_time" in h5f[grp_path]:
+            grp_coords.add(f"{grp_path}/delta_time")
+        names = dset.attrs.get("coordinates", b"")
+        if isinstance(names, bytes):
+            names = names.decode()
+        for name in str(names).split():
+            grp_coords.add(posixpath.normpath(posixpath.join(grp_path, name)))
+        for dim in dset.dims:
+            grp_coords.update(scale.name.lstrip("/") for scale in dim.values())
+
+    sizes = {}
+    for grp_path, grp_coords in coords.items():
+        sizes.update(_dataset_sizes(h5f, sorted(grp_coords.difference(var_paths))))
+        if f"{grp_path}/delta_time" in h5f:
+            n = h5f[f"{grp_path}/delta_time"].shape[0]
+            sizes[f"{grp_path}/photon_idx"] = (n * np.dtype("int64").itemsize, 0)
+    return sizes
+
+
 # To do: test this class and functions therein
 class Read(EarthdataAuthMixin):
     """
@@ -522,7 +599,87 @@ class Read(EarthdataAuthMixin):
 
         return is2ds
 
-    def load(self):
+    def _append_required_vars(self):
+        """
+        Append the minimum variables needed for icepyx to merge the datasets to the wanted list.
+        """
+        var_list = is2ref._required_varlist(self.product)
+        if var_list:
+            self.variables.append(defaults=False, var_list=var_list)
+
+    def _open_h5(self, file):
+        """
+        Open a local or s3 file with h5py for reading metadata.
+        """
+        import h5py
+
+        if file.startswith("s3"):
+            s3 = earthaccess.get_s3fs_session(daac="NSIDC")
+            return h5py.File(s3.open(file, "rb"), "r")
+        return h5py.File(file, "r")
+
+    def estimate_size(self):
+        """
+        Estimate the memory needed to load the wanted variables from all files,
+        without reading any data.
+
+        Sizes are computed from the HDF5 dataset shapes and data types.
+        The bytes stored on disk are also reported, which differ from the in-memory size by
+        each dataset's compression ratio.
+        The variables icepyx always reads in order to merge the data are included, as are
+        the coordinates (e.g. delta_time, latitude and longitude) and index loaded with
+        each group of variables.
+
+        Returns
+        -------
+        dict
+            Total in-memory and on-disk bytes, and the in-memory bytes of each wanted
+            variable and coordinate path summed over all files.
+
+        Examples
+        --------
+        >>> reader = ipx.Read('/path/to/data/') # doctest: +SKIP
+        >>> reader.variables.append(var_list=['h_li', 'latitude', 'longitude']) # doctest: +SKIP
+        >>> reader.estimate_size() # doctest: +SKIP
+        {'Total size in memory (bytes)': 25167312,
+        'Total size on disk (bytes)': 13582405,
+        'Size in memory per variable (bytes)': {'ancillary_data/atlas_sdp_gps_epoch': 8,
+        .
+        .
+        .
+        'gt3r/land_ice_segments/longitude': 1390240}}
+        """
+        if not self.variables.wanted:
+            raise AttributeError(
+                "No variables listed in self.variables.wanted. Please use the Variables class "
+                "via self.variables to search for desired variables to read and self.variables.append(...) "
+                "to add variables to the wanted variables list."
+            )
+        # the required variables are counted without adding them to the wanted list
+        required = self.variables._index.select(is2ref._required_varlist(self.product))
+        var_paths = list(
+            dict.fromkeys(
+                list_of_dict_vals(self.variables.wanted) + list_of_dict_vals(required)
+            )
+        )
+
+        var_sizes = dict.fromkeys(var_paths, 0)
+        total_stored = 0
+        for file in self.filelist:
+            with self._open_h5(file) as h5f:
+                sizes = _dataset_sizes(h5f, var_paths)
+                sizes.update(_coordinate_sizes(h5f, var_paths))
+                for vpath, (nbytes, stored) in sizes.items():
+                    var_sizes[vpath] = var_sizes.get(vpath, 0) + nbytes
+                    total_stored += stored
+
+        return {
+            "Total size in memory (bytes)": sum(var_sizes.values()),
+            "Total size on disk (bytes)": total_stored,
+            "Size in memory per variable (bytes)": var_sizes,
+        }
+
+    def load(self, memory_budget=None, lazy_over_budget=False):
         """
         Create a single Xarray Dataset containing the data from one or more
         files and/or ground tracks.
@@ -530,6 +687,17 @@ class Read(EarthdataAuthMixin):
 
         All items in the wanted variables list will be loaded from the files into memory.
         If you do not provide a wanted variables list, a default one will be created for you.
+
+        Parameters
+        ----------
+        memory_budget : int, default None
+            Maximum number of bytes the loaded variables may occupy in memory, as computed by
+            `estimate_size`. By default, no limit is applied.
+        lazy_over_budget : bool, default False
+            What to do when the estimated size exceeds memory_budget.
+            If False, a MemoryError is raised before any data is read.
+            If True, the data variables are opened lazily as dask arrays instead,
+            so they are only read when computed.
         """
 
         # todo:
@@ -562,22 +730,26 @@ class Read(EarthdataAuthMixin):
             _confirm_proceed()
 
         # Append the minimum variables needed for icepyx to merge the datasets
-        # Skip products which do not contain required variables
-        if self.product not in ["ATL14", "ATL15", "ATL23"]:
-            var_list = [
-                "sc_orient",
-                "atlas_sdp_gps_epoch",
-                "cycle_number",
-                "rgt",
-                "data_start_utc",
-                "data_end_utc",
-            ]
-
-            # Adjust the nec_varlist for individual products
-            if self.product == "ATL11":
-                var_list.remove("sc_orient")
-
-            self.variables.append(defaults=False, var_list=var_list)
+        self._append_required_vars()
+
+        chunks = None
+        if memory_budget is not None:
+            size = self.estimate_size()["Total size in memory (bytes)"]
+            if size > memory_budget:
+                if not lazy_over_budget:
+                    raise MemoryError(
+                        f"Loading the wanted variables needs an estimated {size} bytes, "
+                        f"which exceeds the memory budget of {memory_budget} bytes. "
+                        "Remove variables from the wanted list, read fewer files, or use "
+                        "`lazy_over_budget=True` to open the data lazily."
+                    )
+                warnings.warn(
+                    f"Loading the wanted variables needs an estimated {size} bytes, "
+                    f"which exceeds the memory budget of {memory_budget} bytes. "
+                    "Data variables will be opened lazily as dask arrays.",
+                    stacklevel=2,
+                )
+                chunks = {}
 
         try:
             groups_list = list_of_dict_vals(self.variables.wanted)
@@ -594,7 +766,7 @@ class Read(EarthdataAuthMixin):
                 file = s3.open(file, "rb")
 
             all_dss.append(
-                self._build_single_file_dataset(file, groups_list)
+                self._build_single_file_dataset(file, groups_list, chunks=chunks)
             )  # wanted_groups, vgrp.keys()))
 
             # Closing the file prevents further operations on the dataset
@@ -634,7 +806,7 @@ class Read(EarthdataAuthMixin):
         )
         return is2ds
 
-    def _read_single_grp(self, file, grp_path):
+    def _read_single_grp(self, file, grp_path, chunks=None):
         """
         For a given file and variable group path, construct an xarray Dataset.
 
@@ -647,6 +819,8 @@ class Read(EarthdataAuthMixin):
         grp_path : str
             Full string to a variable group.
             E.g. 'gt1l/land_ice_segments'
+        chunks : dict, default None
+            Passed to xarray.open_dataset. If given, variables are opened lazily as dask arrays.
 
         Returns
         -------
@@ -659,9 +833,10 @@ class Read(EarthdataAuthMixin):
             group=grp_path,
             engine="h5netcdf",
             backend_kwargs={"phony_dims": "access"},
+            chunks=chunks,
         )
 
-    def _build_single_file_dataset(self, file, groups_list):
+    def _build_single_file_dataset(self, file, groups_list, chunks=None):
         """
         Create a single xarray dataset with all of the wanted variables/groups
         from the wanted var list for a single data file/url.
@@ -678,6 +853,10 @@ class Read(EarthdataAuthMixin):
             e.g. ['orbit_info/sc_orient', 'gt1l/land_ice_segments/h_li',
             'gt1l/land_ice_segments/latitude', 'gt1l/land_ice_segments/longitude']
 
+        chunks : dict, default None
+            Passed to xarray.open_dataset for each group. If given, variables are opened
+            lazily as dask arrays.
+
         Returns
         -------
         Xarray Dataset
@@ -707,11 +886,15 @@ class Read(EarthdataAuthMixin):
             wanted_grouponly_set = set(wanted_groups_tiered[0])
             wanted_groups_list = sorted(wanted_grouponly_set)
             if len(wanted_groups_list) == 1:
-                is2ds = self._read_single_grp(file, grp_path=wanted_groups_list[0])
+                is2ds = self._read_single_grp(
+                    file, grp_path=wanted_groups_list[0], chunks=chunks
+                )
             else:
                 is2ds = self._build_dataset_template(file)
                 while wanted_groups_list:
-                    ds = self._read_single_grp(file, grp_path=wanted_groups_list[0])
+                    ds = self._read_single_grp(
+                        file, grp_path=wanted_groups_list[0], chunks=chunks
+                    )
                     wanted_groups_list = wanted_groups_list[1:]
                     is2ds = is2ds.merge(
                         ds, join="outer", combine_attrs="drop_conflicts"
@@ -742,7 +925,7 @@ class Read(EarthdataAuthMixin):
                 # print(wanted_groups_list)
                 grp_path = wanted_groups_list[0]
                 wanted_groups_list = wanted_groups_list[1:]
-                ds = self._read_single_grp(file, grp_path)
+                ds = self._read_single_grp(file, grp_path, chunks=chunks)
                 is2ds, ds = Read._add_vars_to_ds(
                     is2ds, ds, grp_path, wanted_groups_tiered, wanted_dict
                 )
@@ -770,7 +953,7 @@ class Read(EarthdataAuthMixin):
             while wanted_groups_list:
                 grp_path = wanted_groups_list[0]
                 wanted_groups_list = wanted_groups_list[1:]
-                ds = self._read_single_grp(file, grp_path)
+                ds = self._read_single_grp(file, grp_path, chunks=chunks)
                 is2ds, ds = Read._add_vars_to_ds(
                     is2ds, ds, grp_path, wanted_groups_tiered, wanted_dict
                 )
@@ -781,7 +964,9 @@ class Read(EarthdataAuthMixin):
                 if any(grp_path in grp_path2 for grp_path2 in wanted_groups_list):
                     for grp_path2 in wanted_groups_list:
                         if grp_path in grp_path2:
-                            sub_ds = self._read_single_grp(file, grp_path2)
+                            sub_ds = self._read_single_grp(
+                                file, grp_path2, chunks=chunks
+                            )
                             ds = Read._combine_nested_vars(
                                 ds, sub_ds, grp_path2, wanted_dict
                             )
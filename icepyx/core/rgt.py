@@ -0,0 +1,168 @@
+"""
+Offline index of ICESat-2 Reference Ground Track (RGT) geometry, used to find which RGTs
+(and granule regions) can intersect a spatial extent without searching CMR.
+"""
+
+from typing import Union
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+# the outer beam pairs are about 3.3 km either side of the RGT; the rest of the
+# buffer allows for off-pointing and orbit drift
+SWATH_BUFFER_METERS = 7000.0
+
+_METERS_PER_DEGREE = 111_320.0
+
+
+def _buffer_meters(geoms: np.ndarray, meters: float) -> np.ndarray:
+    """
+    Buffer geometries in lon, lat by at least the given distance.
+
+    A degree of longitude shrinks with latitude, so each geometry is buffered by the
+    number of degrees of longitude the distance spans at its highest latitude
+    (which over-buffers in latitude, keeping the buffer conservative).
+    """
+    bounds = shapely.bounds(geoms)
+    max_lat = np.maximum(np.abs(bounds[:, 1]), np.abs(bounds[:, 3]))
+    # ICESat-2 tracks reach 88 degrees; the cap avoids unbounded buffers at the poles
+    scale = np.cos(np.radians(np.minimum(max_lat, 88.0)))
+    return shapely.buffer(geoms, meters / (_METERS_PER_DEGREE * scale))
+
+
+class RGTIndex:
+    """
+    Spatially indexed ICESat-2 Reference Ground Track geometry.
+
+    Each row of the index is the ground track geometry of one RGT, or of one granule
+    region of an RGT. The reference geometry can be built from any vector file readable
+    by geopandas, such as the RGT shapefiles or KMZ files published for ICESat-2
+    mission planning, optionally split into granule regions.
+    The RGT is the centreline of the six beams, so the tracks are buffered by
+    `swath_buffer` to cover the whole swath.
+
+    Parameters
+    ----------
+    gdf : geopandas.GeoDataFrame
+        Ground track geometry (in lon, lat), with an integer "rgt" column
+        and optionally an integer "region" column.
+    swath_buffer : float, default 7000
+        Distance (in meters) the ground tracks are buffered by, to cover the beams
+        on either side of the RGT and allow for off-pointing and orbit drift.
+
+    See Also
+    --------
+    from_file
+    query.Query.restrict_tracks
+
+    Examples
+    --------
+    >>> from shapely.geometry import LineString
+    >>> gdf = gpd.GeoDataFrame(
+    ...     {"rgt": [849, 902], "region": [3, 3]},
+    ...     geometry=[LineString([(-56, 60), (-50, 80)]), LineString([(-20, 60), (-14, 80)])],
+    ...     crs="epsg:4326",
+    ... )
+    >>> RGTIndex(gdf).candidates(shapely.box(-55, 68, -48, 71))
+       rgt  region
+    0  849       3
+    """
+
+    def __init__(
+        self, gdf: gpd.GeoDataFrame, swath_buffer: float = SWATH_BUFFER_METERS
+    ):
+        assert "rgt" in gdf.columns, "The RGT geometry must have an 'rgt' column"
+        self._gdf = gdf.reset_index(drop=True)
+        if self._gdf.crs is not None:
+            self._gdf = self._gdf.to_crs("epsg:4326")
+        if swath_buffer:
+            self._gdf = self._gdf.set_geometry(
+                _buffer_meters(self._gdf.geometry.to_numpy(), swath_buffer),
+                crs=self._gdf.crs,
+            )
+        # build the spatial index up front, so queries don't pay for it
+        self._gdf.sindex
+
+    @classmethod
+    def from_file(
+        cls,
+        filepath: str,
+        rgt_column: str = "RGT",
+        region_column: Union[str, None] = None,
+        swath_buffer: float = SWATH_BUFFER_METERS,
+        **kwargs,
+    ):
+        """
+        Build the index from a vector file of RGT ground tracks.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to a vector file (e.g. shapefile, zipped shapefile, GeoPackage or KML)
+            readable by `geopandas.read_file`.
+        rgt_column : str, default "RGT"
+            Name of the column containing the RGT number.
+        region_column : str, default None
+            Name of the column containing the granule region number, if the ground tracks
+            are split into granule regions.
+        swath_buffer : float, default 7000
+            Distance (in meters) the ground tracks are buffered by (see `RGTIndex`).
+        **kwargs
+            Passed to `geopandas.read_file`.
+        """
+        gdf = gpd.read_file(filepath, **kwargs)
+        # multiple features (e.g. points or segments) per track are combined
+        by = [rgt_column] if region_column is None else [rgt_column, region_column]
+        gdf = gdf.dissolve(by=by, as_index=False)
+        gdf = gdf.rename(columns={rgt_column: "rgt", region_column: "region"})
+        gdf["rgt"] = pd.to_numeric(gdf["rgt"]).astype(int)
+        if "region" in gdf.columns:
+            gdf["region"] = pd.to_numeric(gdf["region"]).astype(int)
+        return cls(
+            gdf[[c for c in ["rgt", "region", "geometry"] if c in gdf.columns]],
+            swath_buffer=swath_buffer,
+        )
+
+    @property
+    def has_regions(self) -> bool:
+        """
+        Whether the ground tracks are split into granule regions.
+        """
+        return "region" in self._gdf.columns
+
+    def candidates(self, extent) -> pd.DataFrame:
+        """
+        Return the RGTs (and granule regions) whose (buffered) ground track intersects
+        the extent.
+
+        Parameters
+        ----------
+        extent : geopandas.GeoDataFrame or shapely geometry
+            The spatial extent (in lon, lat), e.g. `Spatial.extent_as_gdf`.
+            Extents crossing the antimeridian may have longitudes from 0 to 360.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The sorted, unique "rgt" (and "region") values of the intersecting tracks.
+        """
+        geoms = np.asarray(getattr(extent, "geometry", [extent]))
+        if shapely.total_bounds(geoms)[2] > 180:
+            # the ground tracks are in -180 to 180 longitudes
+            geoms = np.concatenate(
+                [
+                    geoms,
+                    shapely.transform(geoms, lambda xy: xy - np.array([360, 0])),
+                ]
+            )
+
+        _, hits = self._gdf.sindex.query(geoms, predicate="intersects")
+        cols = ["rgt", "region"] if self.has_regions else ["rgt"]
+        return (
+            self._gdf.iloc[np.unique(hits)][cols]
+            .drop_duplicates()
+            .sort_values(cols)
+            .reset_index(drop=True)
+        )
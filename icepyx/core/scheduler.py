@@ -0,0 +1,259 @@
+"""
+Scheduling of file downloads, with a bandwidth cap, per-host connection limits,
+priority classes and concurrency that adapts to the observed throughput and errors.
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+import threading
+import time
+from typing import Union
+from urllib.parse import urlsplit
+
+import requests
+
+PRIORITIES = ("interactive", "bulk")
+
+# throughput is measured over windows of this many seconds
+THROUGHPUT_WINDOW_SECONDS = 2.0
+
+
+class TokenBucket:
+    """
+    Token bucket limiting the rate (e.g. bytes per second) of a shared resource.
+    Consumers are put to sleep until the tokens they use have accumulated.
+
+    Parameters
+    ----------
+    rate : float
+        Tokens added per second.
+    burst : float, default None
+        Maximum number of tokens that can accumulate. By default, one second's worth.
+    """
+
+    def __init__(self, rate: float, burst: Union[float, None] = None):
+        assert rate > 0, "The rate must be positive"
+        self.rate = rate
+        self.capacity = burst if burst is not None else rate
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, n: float):
+        """
+        Take n tokens, sleeping until the bucket has had time to refill.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+            # tokens may go negative; later consumers then wait for the debt to clear
+            self._tokens -= n
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0
+        if delay:
+            time.sleep(delay)
+
+
+def _is_congestion(error: BaseException) -> bool:
+    """
+    Whether an error suggests the network or server is overloaded
+    (as opposed to e.g. a missing file).
+    """
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(
+        error,
+        (
+            requests.ConnectionError,
+            requests.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+        ),
+    )
+
+
+class DownloadScheduler:
+    """
+    Admission control for file downloads shared by all the threads of a process.
+    Its limits apply per process: separate processes (e.g. parallel workers)
+    each have their own scheduler, so their limits add up.
+
+    Each transfer must hold a slot (see `slot`). Slots are limited in total and per
+    host, and are given to waiting "interactive" transfers before "bulk" ones
+    (first come, first served within a class). The total number of slots adapts
+    to the network: it grows additively while throughput keeps up, and halves when
+    transfers fail with congestion errors (429, 5xx, connection errors).
+    With a bandwidth cap, bulk transfers only get `bulk_share` of the bandwidth
+    while interactive transfers are running.
+
+    Parameters
+    ----------
+    max_bandwidth : float, default None
+        Maximum total download rate, in bytes per second. By default, unlimited.
+    max_per_host : int, default None
+        Maximum number of concurrent transfers from the same host.
+        By default, only the adaptive total limit applies.
+    min_concurrency, max_concurrency : int, default 1, 16
+        Bounds of the adaptive number of concurrent transfers.
+    initial_concurrency : int, default 4
+        Number of concurrent transfers to start from.
+    bulk_share : float, default 0.25
+        Share of a capped bandwidth left to bulk transfers while interactive
+        transfers are running.
+    """
+
+    def __init__(
+        self,
+        max_bandwidth: Union[float, None] = None,
+        max_per_host: Union[int, None] = None,
+        min_concurrency: int = 1,
+        max_concurrency: int = 16,
+        initial_concurrency: int = 4,
+        bulk_share: float = 0.25,
+    ):
+        assert 0 < bulk_share <= 1, "bulk_share must be between 0 and 1"
+        self.bucket = self._bulk_bucket = None
+        if max_bandwidth:
+            self.bucket = TokenBucket(max_bandwidth)
+            self._bulk_bucket = TokenBucket(max_bandwidth * bulk_share)
+        self.max_per_host = max_per_host
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.bulk_share = bulk_share
+        self.limit = float(
+            min(max(initial_concurrency, min_concurrency), max_concurrency)
+        )
+
+        self._cond = threading.Condition()
+        self._waiting = {priority: [] for priority in PRIORITIES}
+        self._active_hosts = Counter()
+        self._active_priorities = Counter()
+        self._window_start = time.monotonic()
+        self._window_bytes = 0
+        self.throughput = 0.0
+        self._best_throughput = 0.0
+
+    @property
+    def active(self) -> int:
+        """
+        The number of transfers currently holding a slot.
+        """
+        return sum(self._active_hosts.values())
+
+    def _next(self, priority):
+        # the first waiting transfer of the class whose host has a free connection
+        per_host = self.max_per_host or int(self.limit)
+        for host, ticket in self._waiting[priority]:
+            if self._active_hosts[host] < per_host:
+                return ticket
+        return None
+
+    def _can_start(self, ticket, priority) -> bool:
+        if self.active >= int(self.limit):
+            return False
+        if priority == "bulk" and self._next("interactive") is not None:
+            return False
+        return self._next(priority) is ticket
+
+    @contextmanager
+    def slot(self, url: str, priority: str = "interactive"):
+        """
+        Wait for, and hold, a slot for a transfer from url.
+
+        Parameters
+        ----------
+        url : str
+            The URL to download.
+        priority : {"interactive", "bulk"}, default "interactive"
+            The priority class of the transfer.
+        """
+        assert priority in PRIORITIES, f"priority must be one of {PRIORITIES}"
+        host = urlsplit(url).netloc
+        ticket = object()
+        with self._cond:
+            self._waiting[priority].append((host, ticket))
+            self._cond.wait_for(lambda: self._can_start(ticket, priority))
+            self._waiting[priority].remove((host, ticket))
+            self._active_hosts[host] += 1
+            self._active_priorities[priority] += 1
+
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            with self._cond:
+                self._active_hosts[host] -= 1
+                self._active_priorities[priority] -= 1
+                self._adapt(error)
+                self._cond.notify_all()
+
+    def throttle(self, nbytes: int, priority: str = "interactive"):
+        """
+        Account for nbytes transferred, sleeping if needed to keep within the
+        bandwidth cap.
+        """
+        with self._cond:
+            self._window_bytes += nbytes
+            interactive_active = self._active_priorities["interactive"] > 0
+        if self.bucket is not None:
+            if priority == "bulk" and interactive_active:
+                self._bulk_bucket.consume(nbytes)
+            self.bucket.consume(nbytes)
+
+    def _adapt(self, error):
+        """
+        Adjust the concurrency limit after a transfer finishes (with self._cond held).
+        """
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed >= THROUGHPUT_WINDOW_SECONDS:
+            self.throughput = self._window_bytes / elapsed
+            self._window_start = now
+            self._window_bytes = 0
+
+        if error is not None:
+            if _is_congestion(error):
+                self.limit = max(self.min_concurrency, self.limit / 2)
+                self._best_throughput = self.throughput
+            return
+        # additive increase (by about one slot per round of transfers), as long as
+        # more concurrent transfers are still increasing the throughput
+        if self.throughput >= 0.9 * self._best_throughput:
+            self._best_throughput = max(self._best_throughput, self.throughput)
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+
+
+_lock = threading.Lock()
+_scheduler = None
+
+
+def configure(**settings):
+    """
+    Replace the download scheduler used by icepyx with one with these settings
+    (see `DownloadScheduler` for the settings and their defaults).
+    Transfers that have already started are not affected.
+    The settings apply to this process only.
+
+    Examples
+    --------
+    >>> configure(max_bandwidth=50 * 2**20, max_per_host=2) # doctest: +SKIP
+    """
+    global _scheduler
+    with _lock:
+        _scheduler = DownloadScheduler(**settings)
+
+
+def scheduler() -> DownloadScheduler:
+    """
+    Return the download scheduler shared by all downloads in this process.
+    """
+    global _scheduler
+    with _lock:
+        if _scheduler is None:
+            _scheduler = DownloadScheduler()
+        return _scheduler
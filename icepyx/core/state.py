@@ -0,0 +1,220 @@
+"""
+Durable record of harmony orders and their downloads, so an interrupted process can
+resume where it left off.
+"""
+
+from contextlib import closing, contextmanager
+import os
+from pathlib import Path
+import sqlite3
+import time
+from typing import Union
+
+from icepyx.core.cache import cache_dir
+
+STATE_DIR_ENV = "ICEPYX_STATE_DIR"
+
+# harmony keeps job results for 30 days, so older jobs cannot be resumed
+JOB_EXPIRY_SECONDS = 30 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    scope TEXT,
+    concept_id TEXT,
+    status TEXT NOT NULL DEFAULT 'submitted',
+    listed INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    job_id TEXT NOT NULL REFERENCES jobs (job_id),
+    name TEXT NOT NULL,
+    url TEXT,
+    path TEXT,
+    downloaded INTEGER NOT NULL DEFAULT 0,
+    updated REAL NOT NULL,
+    PRIMARY KEY (job_id, name)
+);
+"""
+
+
+def state_dir() -> Path:
+    """
+    Return the (created if needed) directory of the icepyx state store.
+
+    The location can be set with the ``ICEPYX_STATE_DIR`` environment variable.
+    Otherwise the "state" subdirectory of the icepyx cache directory is used
+    (see `cache.cache_dir`).
+    """
+    root = os.environ.get(STATE_DIR_ENV)
+    if root is None:
+        return cache_dir("state")
+    path = Path(root).expanduser()
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class StateStore:
+    """
+    SQLite record of harmony jobs, their result files, and which of the files have
+    been downloaded.
+
+    Every change is committed immediately, so the record survives a crash.
+    The store can be shared by several threads and processes.
+    Jobs are recorded under a scope, and only the unfinished jobs of the store's
+    own scope are resumed, so separate projects or workers sharing the database
+    don't pick up each other's jobs.
+
+    Parameters
+    ----------
+    path : str or Path, default None
+        The SQLite database file. By default, "state.sqlite" in `state_dir()`.
+    scope : str, default None
+        The key jobs are recorded and resumed under, e.g. a project or worker name.
+        By default, the current working directory.
+
+    Examples
+    --------
+    >>> store = StateStore(tmp_path / "state.sqlite") # doctest: +SKIP
+    >>> store.add_job("931355e8-0005-4dff-9c76-7903a5be283d") # doctest: +SKIP
+    >>> store.unfinished_jobs() # doctest: +SKIP
+    ['931355e8-0005-4dff-9c76-7903a5be283d']
+    """
+
+    def __init__(
+        self, path: Union[str, Path, None] = None, scope: Union[str, None] = None
+    ):
+        self.path = Path(path) if path is not None else state_dir() / "state.sqlite"
+        self.scope = scope if scope is not None else str(Path.cwd().resolve())
+        with self._connect() as con:
+            # write-ahead logging lets readers and a writer use the store at once
+            con.execute("PRAGMA journal_mode=WAL")
+            con.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # the connection commits on success (or rolls back on error), then is closed
+        with closing(sqlite3.connect(self.path, timeout=30)) as con, con:
+            yield con
+
+    def add_job(self, job_id: str, concept_id: Union[str, None] = None):
+        """
+        Record a newly submitted job, in the store's scope.
+        """
+        with self._connect() as con:
+            con.execute(
+                "INSERT OR IGNORE INTO jobs (job_id, scope, concept_id, created) "
+                "VALUES (?, ?, ?, ?)",
+                (job_id, self.scope, concept_id, time.time()),
+            )
+
+    def set_job_status(self, job_id: str, status: str):
+        """
+        Record the status of a job (e.g. "successful" or "downloaded").
+        """
+        with self._connect() as con:
+            con.execute("UPDATE jobs SET status = ? WHERE job_id = ?", (status, job_id))
+
+    def job_status(self, job_id: str) -> Union[str, None]:
+        """
+        The recorded status of a job, or None if the job is not recorded.
+        """
+        with self._connect() as con:
+            row = con.execute(
+                "SELECT status FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def unfinished_jobs(self, max_age: float = JOB_EXPIRY_SECONDS) -> list[str]:
+        """
+        The jobs recorded in the store's scope whose results have not all been
+        downloaded, oldest first.
+
+        Parameters
+        ----------
+        max_age : float, default 30 days
+            Only jobs submitted within this many seconds are returned, as the results
+            of older jobs are no longer available from harmony.
+        """
+        with self._connect() as con:
+            rows = con.execute(
+                "SELECT job_id FROM jobs WHERE status NOT IN "
+                "('downloaded', 'failed', 'canceled') AND scope = ? AND created >= ? "
+                "ORDER BY created",
+                (self.scope, time.time() - max_age),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def add_files(self, job_id: str, files: dict[str, str]):
+        """
+        Record the complete list of a job's result files.
+
+        Parameters
+        ----------
+        job_id : str
+            The job.
+        files : dict
+            The URL of each result file, keyed by the name the file is saved as
+            (which `mark_downloaded` records files under).
+        """
+        now = time.time()
+        with self._connect() as con:
+            # files recorded as downloaded before their links were listed get their URL
+            con.executemany(
+                "INSERT INTO files (job_id, name, url, updated) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (job_id, name) DO UPDATE SET url = excluded.url",
+                [(job_id, name, url, now) for name, url in files.items()],
+            )
+            con.execute("UPDATE jobs SET listed = 1 WHERE job_id = ?", (job_id,))
+
+    def is_listed(self, job_id: str) -> bool:
+        """
+        Whether the complete list of a job's result files has been recorded.
+        """
+        with self._connect() as con:
+            row = con.execute(
+                "SELECT listed FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return bool(row and row[0])
+
+    def files(self, job_id: str) -> dict[str, str]:
+        """
+        The recorded result file URLs of a job, keyed by file name.
+        Each URL is only returned once.
+        """
+        with self._connect() as con:
+            rows = con.execute(
+                "SELECT name, url FROM files WHERE job_id = ? AND url IS NOT NULL "
+                "ORDER BY name",
+                (job_id,),
+            ).fetchall()
+        files = {}
+        for name, url in rows:
+            if url not in files.values():
+                files[name] = url
+        return files
+
+    def mark_downloaded(self, job_id: str, path: Union[str, Path], url=None):
+        """
+        Record that a result file of a job has been downloaded to path.
+        The file is recorded under the name of path.
+        """
+        with self._connect() as con:
+            con.execute(
+                "INSERT INTO files (job_id, name, url, path, downloaded, updated) "
+                "VALUES (?, ?, ?, ?, 1, ?) ON CONFLICT (job_id, name) DO UPDATE SET "
+                "path = excluded.path, downloaded = 1, updated = excluded.updated",
+                (job_id, Path(path).name, url, str(path), time.time()),
+            )
+
+    def downloaded(self, job_id: str) -> dict[str, str]:
+        """
+        The local paths of a job's downloaded result files that still exist,
+        keyed by file name.
+        """
+        with self._connect() as con:
+            rows = con.execute(
+                "SELECT name, path FROM files WHERE job_id = ? AND downloaded = 1",
+                (job_id,),
+            ).fetchall()
+        return {name: path for name, path in rows if Path(path).exists()}
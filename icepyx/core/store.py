@@ -0,0 +1,235 @@
+"""
+Local store of downloaded granules, shared by queries, orders and users, so the same
+granule is only downloaded (and stored) once.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+import shutil
+import socket
+from typing import Union
+
+import pandas as pd
+
+from icepyx.core.cache import cache_dir
+from icepyx.core.granules import parse_granule_ids
+
+STORE_DIR_ENV = "ICEPYX_GRANULE_STORE"
+
+CHUNK_SIZE = 2**20
+
+# how often to check on granules being downloaded into the store by other processes
+CLAIM_POLL_SECONDS = 5
+
+
+def _link(src: Path, dest: Path):
+    """
+    Atomically make dest a hard link to src, or a copy if they are on different
+    file systems.
+    """
+    if dest.exists() and os.path.samefile(src, dest):
+        return
+    tmp = dest.with_name(f".{dest.name}.link")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dest)
+
+
+def _process_running(pid: int) -> bool:
+    if os.name == "nt":
+        # os.kill would terminate the process
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fid:
+        for chunk in iter(lambda: fid.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class GranuleStore:
+    """
+    Content-addressed store of downloaded granules.
+
+    Whole granules are stored by granule ID (producer_granule_id), under their product
+    and release, and are only ever downloaded once. Subset granules (whose content
+    depends on the order) are stored by the SHA-256 checksum of their content,
+    so identical outputs of different orders share the same storage.
+    Files are handed out as hard links into the requested download directory
+    (or copies, if the directory is on another file system).
+
+    Parameters
+    ----------
+    root : str or Path, default None
+        The store directory. It can be shared between users with access to it.
+        By default, the ``ICEPYX_GRANULE_STORE`` environment variable, or the "granules"
+        subdirectory of the icepyx cache directory (see `cache.cache_dir`).
+
+    See Also
+    --------
+    query.Query.download_granules
+
+    Examples
+    --------
+    >>> store = ipx.GranuleStore("/shared/icesat2") # doctest: +SKIP
+    >>> reg_a.order_granules(subset=False) # doctest: +SKIP
+    >>> reg_a.download_granules("./data", store=store) # doctest: +SKIP
+    """
+
+    def __init__(self, root: Union[str, Path, None] = None):
+        if root is None:
+            root = os.environ.get(STORE_DIR_ENV)
+        self.root = cache_dir("granules") if root is None else Path(root).expanduser()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def __repr__(self):
+        return f"GranuleStore({str(self.root)!r})"
+
+    def __contains__(self, granule_id: str) -> bool:
+        return self.granule_path(granule_id).exists()
+
+    def granule_path(self, granule_id: str) -> Path:
+        """
+        The path of a whole granule in the store.
+        """
+        parts = parse_granule_ids([granule_id], raw=True).iloc[0]
+        if pd.isna(parts["product"]):
+            return self.root / "other" / granule_id
+        return self.root / parts["product"] / parts["release"] / granule_id
+
+    @property
+    def incoming(self) -> Path:
+        """
+        The directory, on the store's file system, that whole granules are downloaded
+        into before they are added to the store (see `add_granule`).
+        A granule is only downloaded into it by the process that has claimed it
+        (see `claim`), and an interrupted download's partial file is kept there,
+        so the download is resumed by the next process to claim the granule.
+        """
+        incoming = self.root / ".incoming"
+        incoming.mkdir(exist_ok=True)
+        return incoming
+
+    def _claim_file(self, granule_id: str) -> Path:
+        return self.incoming / f"{granule_id}.claim"
+
+    def claim(self, granule_id: str) -> bool:
+        """
+        Claim a whole granule for downloading into `incoming`, so no other process
+        downloads it at the same time. Release the claim with `release`.
+
+        Claims of processes that are no longer running (on the same host) are broken.
+
+        Returns
+        -------
+        bool
+            Whether the granule was claimed, i.e. False if another process has claimed it.
+        """
+        claim_file = self._claim_file(granule_id)
+        owner = f"{socket.gethostname()} {os.getpid()}"
+        while True:
+            try:
+                fd = os.open(claim_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    host, pid = claim_file.read_text().split()
+                except (FileNotFoundError, ValueError):
+                    # released, or not yet written by its owner
+                    if claim_file.exists():
+                        return False
+                    continue
+                if host != socket.gethostname() or _process_running(int(pid)):
+                    return False
+                claim_file.unlink(missing_ok=True)
+                continue
+            with os.fdopen(fd, "w") as fid:
+                fid.write(owner)
+            return True
+
+    def release(self, granule_id: str):
+        """
+        Release a claim on a granule (see `claim`).
+        """
+        self._claim_file(granule_id).unlink(missing_ok=True)
+
+    def add_granule(self, path: Union[str, Path]) -> Path:
+        """
+        Atomically move a complete, downloaded whole granule into the store.
+
+        Parameters
+        ----------
+        path : str or Path
+            The downloaded granule, which must be on the store's file system
+            (e.g. in `incoming`).
+
+        Returns
+        -------
+        Path
+            The path of the granule in the store.
+        """
+        path = Path(path)
+        stored = self.granule_path(path.name)
+        stored.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(path, stored)
+        return stored
+
+    def link(self, granule_ids: list[str], path: Union[str, Path]) -> list[str]:
+        """
+        Link whole granules from the store into a directory.
+
+        Parameters
+        ----------
+        granule_ids : list of str
+            The granule IDs, which must be in the store.
+        path : str or Path
+            The directory to link the granules into.
+
+        Returns
+        -------
+        list of str
+            The paths of the linked granules.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for granule_id in granule_ids:
+            _link(self.granule_path(granule_id), path / granule_id)
+        return [str(path / granule_id) for granule_id in granule_ids]
+
+    def add_subset(self, path: Union[str, Path]) -> Path:
+        """
+        Store a downloaded subset granule by its content.
+        If identical content is already stored, the file is replaced with a link to it,
+        so the two copies share storage.
+
+        Parameters
+        ----------
+        path : str or Path
+            The downloaded file.
+
+        Returns
+        -------
+        Path
+            The path of the file in the store.
+        """
+        path = Path(path)
+        digest = _sha256(path)
+        stored = self.root / "sha256" / digest[:2] / (digest + path.suffix)
+        if stored.exists():
+            _link(stored, path)
+        else:
+            stored.parent.mkdir(parents=True, exist_ok=True)
+            _link(path, stored)
+        return stored
@@ -3,3 +3,4 @@ from typing import Final
 CMR_BASE_URL: Final = "https://cmr.earthdata.nasa.gov"
 GRANULE_SEARCH_BASE_URL: Final = f"{CMR_BASE_URL}/search/granules"
 COLLECTION_SEARCH_BASE_URL: Final = f"{CMR_BASE_URL}/search/collections.json"
+IS2_VARIABLES_URL: Final = "https://raw.githubusercontent.com/icesat2py/is2_test_data/refs/heads/main/is2_test_data/data/is2variables.json"
@@ -1,15 +1,112 @@
+import fnmatch
+import functools
 import json
 import os
+import re
+import warnings
 
 import numpy as np
 import requests
 
 from icepyx.core.auth import EarthdataAuthMixin
+import icepyx.core.cache as cache
+import icepyx.core.http_client as http_client
 import icepyx.core.is2ref as is2ref
+from icepyx.core.urls import IS2_VARIABLES_URL
 import icepyx.core.validate_inputs as val
 
 # DEVGOAL: use h5py to simplify some of these tasks, if possible!
 
+# Bump when the layout of the on-disk is2variables cache entry changes
+_IS2VARIABLES_CACHE_VERSION = 1
+
+# In-process copy of the is2variables listing, shared by all Variables instances
+_is2variables_memo = {}
+
+# Variable paths scanned from local files, keyed by (resolved path, mtime, size)
+_scanned_avail = {}
+
+
+def _load_is2variables():
+    """
+    Return the product:variable-paths dictionary of all ICESat-2 product variables.
+
+    The listing is downloaded once per process and shared by all Variables instances.
+    A versioned copy is kept in the icepyx cache directory and revalidated using its ETag,
+    so an unchanged listing is not downloaded again and a populated cache keeps working
+    offline.
+    """
+    if "variables" in _is2variables_memo:
+        return _is2variables_memo["variables"]
+
+    cache_file = cache.cache_dir("variables").joinpath(
+        f"is2variables.v{_IS2VARIABLES_CACHE_VERSION}.json"
+    )
+    cached = cache.read_json(cache_file)
+
+    headers = {"Accept": "application/json"}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+
+    try:
+        response = http_client.get(IS2_VARIABLES_URL, headers=headers)
+        if response.status_code != 304 or cached is None:
+            response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
+    except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+        # the server being unreachable or failing (after retries) is no reason not to
+        # use the cached copy, but a client error (e.g. a moved URL) is reported
+        if cached is None or not _is_server_failure(e):
+            raise e
+        warnings.warn(
+            "Unable to check for an updated list of available variables; "
+            f"using the cached copy in {cache_file}.",
+            stacklevel=3,
+        )
+        vars_dict = cached["variables"]
+    else:
+        if response.status_code == 304:
+            vars_dict = cached["variables"]
+        else:
+            vars_dict = json.loads(response.content)
+            cache.write_json(
+                cache_file,
+                {"etag": response.headers.get("ETag"), "variables": vars_dict},
+            )
+
+    _is2variables_memo["variables"] = vars_dict
+    return vars_dict
+
+
+def _is_server_failure(error: requests.RequestException) -> bool:
+    """
+    Whether a request failed because the server could not be reached or had an
+    error (5xx), rather than because of the request itself.
+    """
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code >= 500
+    return True
+
+
+def _scan_variable_paths(path):
+    """
+    Return the paths of all datasets in an HDF5 file.
+
+    Uses h5py's low-level object iteration, which reads each object's type from the
+    object header instead of building a Group or Dataset object for every node.
+    """
+    import h5py
+
+    paths = []
+
+    def visitor_func(name, info):
+        if info.type == h5py.h5o.TYPE_DATASET:
+            paths.append(name.decode())
+
+    with h5py.File(path, "r") as h5f:
+        h5py.h5o.visit(h5f.id, visitor_func, info=True)
+
+    return paths
+
 
 def list_of_dict_vals(input_dict):
     """
@@ -20,6 +117,98 @@ def list_of_dict_vals(input_dict):
     return wanted_list
 
 
+@functools.lru_cache(maxsize=128)
+def _compile_patterns(patterns):
+    """
+    Compile a tuple of variable path patterns into a list of regular expressions.
+
+    Glob strings (e.g. "gt?l/land_ice_segments/*") are translated and combined into a
+    single regular expression; compiled regular expressions are used as given.
+    """
+    globs = [fnmatch.translate(p) for p in patterns if isinstance(p, str)]
+    regexes = [p for p in patterns if not isinstance(p, str)]
+    if globs:
+        regexes.append(re.compile("|".join(globs)))
+    return regexes
+
+
+class _PathIndex:
+    """
+    Inverted index of a list of variable paths.
+
+    Maps each variable name and each path component (group names and the variable name)
+    to the positions of the paths containing it, so selections by variable, beam, and
+    keyword are computed as set intersections rather than by splitting and comparing
+    every path.
+
+    Parameters
+    ----------
+    paths : list[str]
+        Full variable paths, e.g. the output of Variables.avail().
+    """
+
+    def __init__(self, paths):
+        self.paths = list(paths)
+        self._by_name = {}
+        self._by_component = {}
+        self.keywords = set()
+
+        for i, vn in enumerate(self.paths):
+            components = vn.split("/")
+            self._by_name.setdefault(components[-1], []).append(i)
+            for c in components:
+                self._by_component.setdefault(c, set()).add(i)
+            self.keywords.update(components[:-1])
+
+        self.vgrp = {
+            vkey: [self.paths[i] for i in ids] for vkey, ids in self._by_name.items()
+        }
+
+    def _with_any(self, components):
+        """
+        Return the positions of the paths that contain any of the given components.
+        """
+        return set().union(*(self._by_component.get(c, ()) for c in components))
+
+    def _matching(self, patterns):
+        """
+        Return the positions of the paths that fully match any of the given patterns.
+        """
+        regexes = _compile_patterns(tuple(patterns))
+        return {
+            i
+            for i, vn in enumerate(self.paths)
+            if any(rx.fullmatch(vn) for rx in regexes)
+        }
+
+    def select(self, var_list, beam_list=None, keyword_list=None, patterns=None):
+        """
+        Return a dictionary of variable names (keys) and paths (values) for the variables in
+        var_list whose paths contain at least one of the beams in beam_list and at least one
+        of the keywords in keyword_list, and match at least one of the patterns.
+        A list given as None places no constraint.
+        """
+        match = None
+        for kws in (beam_list, keyword_list):
+            if kws is not None:
+                ids = self._with_any(kws)
+                match = ids if match is None else match & ids
+        if patterns is not None:
+            ids = self._matching(patterns)
+            match = ids if match is None else match & ids
+
+        selected = {}
+        for vkey in var_list:
+            vpaths = [
+                self.paths[i]
+                for i in self._by_name.get(vkey, ())
+                if match is None or i in match
+            ]
+            if vpaths:
+                selected[vkey] = vpaths
+        return selected
+
+
 # REFACTOR: class needs better docstrings
 # DevNote: currently this class is not tested
 class Variables(EarthdataAuthMixin):
@@ -106,6 +295,15 @@ class Variables(EarthdataAuthMixin):
     def version(self):
         return self._version
 
+    @property
+    def _index(self):
+        """
+        The path index of the available variables, built once per Variables object.
+        """
+        if getattr(self, "_path_index", None) is None:
+            self._path_index = _PathIndex(self.avail())
+        return self._path_index
+
     def avail(self, options=False, internal=False):
         """
         Get the list of available variables and variable paths from the input data product
@@ -126,16 +324,10 @@ class Variables(EarthdataAuthMixin):
 
         if not hasattr(self, "_avail") or self._avail is None:
             if not hasattr(self, "path") or self.path.startswith("s3"):
-                try:
-                    url = "https://raw.githubusercontent.com/icesat2py/is2_test_data/refs/heads/main/is2_test_data/data/is2variables.json"
-                    response = requests.get(url, headers={"Accept": "application/json"})
-                    response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
-                    vars_dict = json.loads(response.content)
-                except requests.HTTPError as e:
-                    raise e
+                vars_dict = _load_is2variables()
 
                 try:
-                    self._avail = vars_dict[self.product]
+                    self._avail = list(vars_dict[self.product])
 
                 except KeyError:
                     print(
@@ -143,21 +335,15 @@ class Variables(EarthdataAuthMixin):
                     )
 
             else:
-                # If a path was given, use that file to read the variables
-                import h5py
-
-                self._avail = []
-
-                def visitor_func(name, node):
-                    if isinstance(node, h5py.Group):
-                        # node is a Group
-                        pass
-                    else:
-                        # node is a Dataset
-                        self._avail.append(name)
-
-                with h5py.File(self.path, "r") as h5f:
-                    h5f.visititems(visitor_func)
+                # If a path was given, use that file to read the variables.
+                # Files of the same product and version can still hold different
+                # variables (e.g. variable subsets), so each file is scanned once
+                # per process, and again if it changes.
+                stat = os.stat(self.path)
+                key = (os.path.realpath(self.path), stat.st_mtime_ns, stat.st_size)
+                if key not in _scanned_avail:
+                    _scanned_avail[key] = _scan_variable_paths(self.path)
+                self._avail = list(_scanned_avail[key])
 
         if options is True:
             vgrp, paths = self.parse_var_list(self._avail)
@@ -366,62 +552,15 @@ class Variables(EarthdataAuthMixin):
 
         return sum_varlist
 
-    @staticmethod
-    def _get_combined_list(beam_list, keyword_list):
-        """
-        Get the combined list of beams and/or keywords to add or iterate through.
-        """
-        combined_list = []
-        if beam_list is None:
-            combined_list = keyword_list
-        elif keyword_list is None:
-            combined_list = beam_list
-        else:
-            combined_list = keyword_list + beam_list
-
-        return combined_list
-
-    @staticmethod
-    def _iter_vars(sum_varlist, req_vars, vgrp):
-        """
-        Iterate through the wanted variables supplied in sum_varlist and add them and their paths
-        to the list of requested variables.
-        """
-        for vn in sum_varlist:
-            req_vars[vn] = vgrp[vn]
-        return req_vars
-
-    def _iter_paths(self, sum_varlist, req_vars, vgrp, beam_list, keyword_list):
-        """
-        Iterate through the list of paths for each variable in sum_varlist. Add the paths that have matches
-        to combined_list the dictionary of requested variables.
-        """
-        combined_list = self._get_combined_list(beam_list, keyword_list)
-
-        for vkey in sum_varlist:
-            for vpath in vgrp[vkey]:
-                vpath_kws = vpath.split("/")
-
-                try:
-                    for bkw in beam_list:
-                        if bkw in vpath_kws:
-                            for kw in keyword_list:
-                                if kw in vpath_kws:
-                                    if vkey not in req_vars:
-                                        req_vars[vkey] = []
-                                    if vpath not in req_vars[vkey]:
-                                        req_vars[vkey].append(vpath)
-                except TypeError:
-                    for kw in combined_list:
-                        if kw in vpath_kws:
-                            if vkey not in req_vars:
-                                req_vars[vkey] = []
-                            if vpath not in req_vars[vkey]:
-                                req_vars[vkey].append(vpath)
-        return req_vars
-
     # DevGoal: we can ultimately add an "interactive" trigger that will open the not-yet-made widget. Otherwise, it will use the var_list passed by the user/defaults
-    def append(self, defaults=False, var_list=None, beam_list=None, keyword_list=None):
+    def append(
+        self,
+        defaults=False,
+        var_list=None,
+        beam_list=None,
+        keyword_list=None,
+        patterns=None,
+    ):
         """
         Add to the list of desired variables using user specified beams and variable list.
         A pregenerated default variable list can be used by setting defaults to True.
@@ -449,6 +588,12 @@ class Variables(EarthdataAuthMixin):
             the product that include that keyword in their path. A list of available keywords can be obtained by
             entering `keyword_list=['']` into the function.
 
+        patterns : list[str or re.Pattern], default None
+            A list of patterns matched against the full variable paths. Strings are shell-style
+            wildcards (e.g. 'gt?l/land_ice_segments/*', where `*` also matches across groups);
+            compiled regular expressions must match the entire path.
+            When given with any of the other lists, only paths matching a pattern are added.
+
         Notes
         -----
         See also the `IS2_data_access2-subsetting
@@ -474,6 +619,10 @@ class Variables(EarthdataAuthMixin):
         To add all variables and paths in ancillary_data
 
         >>> reg_a.variables.append(keyword_list=['ancillary_data']) # doctest: +SKIP
+
+        To add the land ice segment variables of all left beams, and all tide variables
+
+        >>> reg_a.variables.append(patterns=['gt?l/land_ice_segments/*', '*/geophysical/tide_*']) # doctest: +SKIP
         """
 
         assert not (
@@ -481,14 +630,15 @@ class Variables(EarthdataAuthMixin):
             and var_list is None
             and beam_list is None
             and keyword_list is None
+            and patterns is None
         ), (
             "You must enter parameters to add to a variable subset list. If you do not want to subset by variable, ensure your is2.subsetparams dictionary does not contain the key 'Coverage'."
         )
 
-        final_vars = {}
-
-        vgrp, allpaths = self.avail(options=True, internal=True)
-        self._check_valid_lists(vgrp, allpaths, var_list, beam_list, keyword_list)
+        index = self._index
+        self._check_valid_lists(
+            index.vgrp, sorted(index.keywords), var_list, beam_list, keyword_list
+        )
 
         # Instantiate self.wanted to an empty dictionary if it doesn't exist
         if not hasattr(self, "wanted") or self.wanted is None:
@@ -497,27 +647,20 @@ class Variables(EarthdataAuthMixin):
             # DEVGOAL: add a secondary var list to include uncertainty/error information for lower level data if specific data variables have been specified...
 
         # generate a list of variable names to include, depending on user input
-        sum_varlist = self._get_sum_varlist(var_list, vgrp.keys(), defaults)
+        sum_varlist = self._get_sum_varlist(var_list, index.vgrp.keys(), defaults)
 
-        # Case only variables (but not keywords or beams) are specified
-        if beam_list is None and keyword_list is None:
-            final_vars.update(self._iter_vars(sum_varlist, final_vars, vgrp))
-
-        # Case a beam and/or keyword list is specified (with or without variables)
-        else:
-            final_vars.update(
-                self._iter_paths(sum_varlist, final_vars, vgrp, beam_list, keyword_list)
+        # select the paths of those variables within any requested beams and keywords
+        final_vars = index.select(sum_varlist, beam_list, keyword_list, patterns)
+        if patterns is not None and not final_vars:
+            raise ValueError(
+                "No variable paths match the patterns: " + ", ".join(map(str, patterns))
             )
 
         # update the data object variables
-        for vkey in final_vars:
-            # add all matching keys and paths for new variables
-            if vkey not in self.wanted:
-                self.wanted[vkey] = final_vars[vkey]
-            else:
-                for vpath in final_vars[vkey]:
-                    if vpath not in self.wanted[vkey]:
-                        self.wanted[vkey].append(vpath)
+        for vkey, vpaths in final_vars.items():
+            # add all matching keys and paths for new variables;
+            # dict keys keep the wanted paths ordered and unique
+            self.wanted[vkey] = list(dict.fromkeys(self.wanted.get(vkey, []) + vpaths))
 
     # DevGoal: we can ultimately add an "interactive" trigger that will open the not-yet-made widget. Otherwise, it will use the var_list passed by the user/defaults
     def remove(self, all=False, var_list=None, beam_list=None, keyword_list=None):
@@ -612,30 +755,25 @@ class Variables(EarthdataAuthMixin):
             # DevGoal: Do we want to enable the user to remove mandatory variables (how it's written now)?
             # Case a beam and/or keyword list is specified (with or without variables)
             else:
-                combined_list = self._get_combined_list(beam_list, keyword_list)
                 if var_list is None:
                     var_list = self.wanted.keys()
 
                 # nec_varlist = ['sc_orient','atlas_sdp_gps_epoch','data_start_utc','data_end_utc',
                 #             'granule_start_utc','granule_end_utc','start_delta_time','end_delta_time']
 
-                for vkey in tuple(var_list):  # self.wanted.keys()):
-                    for vpath in tuple(self.wanted[vkey]):
-                        vpath_kws = vpath.split("/")
-
-                        try:
-                            for bkw in beam_list:
-                                if bkw in vpath_kws:
-                                    for kw in keyword_list:
-                                        if kw in vpath_kws:
-                                            self.wanted[vkey].remove(vpath)
-                        except TypeError:
-                            for kw in combined_list:
-                                if kw in vpath_kws and vkey in var_list:
-                                    self.wanted[vkey].remove(vpath)
-
-                    try:
-                        if self.wanted[vkey] == []:
-                            del self.wanted[vkey]
-                    except KeyError:
-                        pass
+                # index the wanted paths of these variables and drop the matching ones
+                var_list = tuple(var_list)
+                index = _PathIndex(
+                    list_of_dict_vals({vkey: self.wanted[vkey] for vkey in var_list})
+                )
+                drop = set(
+                    list_of_dict_vals(index.select(var_list, beam_list, keyword_list))
+                )
+
+                for vkey in var_list:
+                    self.wanted[vkey] = [
+                        vpath for vpath in self.wanted[vkey] if vpath not in drop
+                    ]
+
+                    if self.wanted[vkey] == []:
+                        del self.wanted[vkey]
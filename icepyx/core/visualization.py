@@ -18,6 +18,7 @@ from tqdm import tqdm
 
 import icepyx as ipx
 import icepyx.core.granules as granules
+import icepyx.core.http_client as http_client
 import icepyx.core.is2ref as is2ref
 
 hv.extension("bokeh")
@@ -41,26 +42,22 @@ def files_in_latest_n_cycles(files, cycles, n=1) -> list:
     viz_file_list : list
         A list of file names from latest n ICESat-2 cycles
     """
+    file_cycles = granules.parse_granule_ids(files)["cycle"]
     if n == 1:
-        latest_cycle = max(cycles)
-        viz_file_list = [
-            f for f in files if int(f.rsplit("_")[-3][4:6]) == latest_cycle
-        ]
-        return viz_file_list
-
+        viz_cycle_list = [max(cycles)]
     elif n > 1:
         if len(cycles) >= n:
             viz_cycle_list = [max(cycles) - i for i in np.arange(n)]
         else:
             viz_cycle_list = cycles
-        viz_file_list = [
-            f for f in files if int(f.rsplit("_")[-3][4:6]) in viz_cycle_list
-        ]
-        return viz_file_list
-
     else:
         raise Exception("Wrong n value")
 
+    viz_file_list = [
+        f for f, keep in zip(files, file_cycles.isin(viz_cycle_list)) if keep
+    ]
+    return viz_file_list
+
 
 def gran_paras(filename) -> list:
     """
@@ -77,14 +74,12 @@ def gran_paras(filename) -> list:
         A list of parameters including RGT, cycle, and datetime of ICESat-2 data granule
     """
 
-    trk, cycl, date_str = granules.gran_IDs(
-        [{"producer_granule_id": filename}],
-        ids=False,
-        cycles=True,
-        tracks=True,
-        dates=True,
-    )[:]
-    gran_paras_list = [int(cycl[0]), int(trk[0]), date_str[0]]
+    paras = granules.parse_granule_ids([filename]).iloc[0]
+    gran_paras_list = [
+        int(paras["rgt"]),
+        int(paras["cycle"]),
+        str(paras["datetime"].date()),
+    ]
 
     return gran_paras_list
 
@@ -312,7 +307,7 @@ class Visualize:
         --------
         request_OA_data
         """
-        response = requests.get(base_url, params=payload)
+        response = http_client.get(base_url, params=payload)
         if not response.ok:
             raise RuntimeError(
                 f"Status {response.status_code} requesting url {response.request.url}"
@@ -2,8 +2,8 @@ import os.path
 
 import numpy as np
 import pandas as pd
-import requests
 
+import icepyx.core.http_client as http_client
 from icepyx.core.spatial import geodataframe
 from icepyx.quest.dataset_scripts.dataset import DataSet
 
@@ -284,7 +284,7 @@ class Argo(DataSet):
             payload["presRange"] = self.presRange
 
         # submit request
-        resp = requests.get(
+        resp = http_client.get(
             baseURL, headers={"x-argokey": self._apikey}, params=payload
         )
 
@@ -351,7 +351,7 @@ class Argo(DataSet):
             payload["presRange"] = self.presRange
 
         # submit request
-        resp = requests.get(
+        resp = http_client.get(
             baseURL, headers={"x-argokey": self._apikey}, params=payload
         )
 
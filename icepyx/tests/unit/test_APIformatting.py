@@ -82,6 +82,11 @@ def test_readable_granules():
     obs = apifmt._fmt_readable_granules("ATL07", cycles=["02"])
     exp = ["ATL07-??_??????????????_????02??_*"]
     assert obs == exp
+    obs = apifmt._fmt_readable_granules(
+        "ATL06", cycles=["02"], tracks=["1387"], regions=["03", "04"]
+    )
+    exp = ["ATL06_??????????????_13870203_*", "ATL06_??????????????_13870204_*"]
+    assert obs == exp
     obs = apifmt._fmt_readable_granules(
         "ATL06", files=["ATL06_20190329071316_13870211_003_*"]
     )
@@ -0,0 +1,83 @@
+import json
+import re
+
+import geopandas as gpd
+import pytest
+import responses
+from shapely.geometry import box
+
+import icepyx as ipx
+import icepyx.core.is2ref as is2ref
+
+
+def _entry(gid, w, s, e, n):
+    return {
+        "producer_granule_id": gid,
+        "boxes": [f"{s} {w} {n} {e}"],
+        "links": [
+            {
+                "rel": "http://esipfed.org/ns/fedsearch/1.1/data#",
+                "type": "application/x-hdf5",
+                "href": f"https://data.nsidc.org/{gid}",
+            }
+        ],
+    }
+
+
+@pytest.fixture
+def batch(monkeypatch):
+    monkeypatch.setattr(is2ref, "latest_version", lambda product: "006")
+    monkeypatch.setattr(
+        ipx.Query, "_get_concept_id", lambda self, product, version: "C0000-NSIDC"
+    )
+    aois = gpd.GeoDataFrame(
+        {"name": ["west", "east", "empty"]},
+        geometry=[box(-55, 68, -54, 69), box(-49, 68, -48, 69), box(-52, 70, -51, 71)],
+        crs="epsg:4326",
+    )
+    return ipx.BatchQuery("ATL06", aois, ["2019-02-20", "2019-02-28"], id_column="name")
+
+
+@responses.activate
+def test_batch_query_assignments(batch, tmp_path, monkeypatch):
+    entries = [
+        _entry("ATL06_both.h5", -55, 68, -48, 68.5),
+        _entry("ATL06_west.h5", -54.5, 68.5, -54.2, 69),
+        _entry("ATL06_none.h5", -53, 68, -52, 69),
+    ]
+
+    def cmr_pages(request):
+        page = [] if "CMR-Search-After" in request.headers else entries
+        headers = {"CMR-Hits": str(len(entries)), "CMR-Search-After": "x"}
+        return (200, headers, json.dumps({"feed": {"entry": page}}))
+
+    responses.add_callback(
+        responses.GET,
+        re.compile(re.escape("https://cmr.earthdata.nasa.gov/search/granules") + r".*"),
+        callback=cmr_pages,
+    )
+
+    # a single search over the combined extent
+    assert batch.query.spatial_extent == ("bounding_box", [-55.0, 68.0, -48.0, 71.0])
+    batch.avail_granules()
+    assert len(responses.calls) == 2
+    assert batch.manifest == {
+        "west": ["ATL06_both.h5", "ATL06_west.h5"],
+        "east": ["ATL06_both.h5"],
+        "empty": [],
+    }
+
+    downloaded = []
+    monkeypatch.setattr(
+        "icepyx.core.batch.download_files",
+        lambda links, path, max_workers, priority: downloaded.extend(links),
+    )
+    manifest = batch.download_granules(tmp_path)
+    # each granule is downloaded once
+    assert downloaded == [
+        "https://data.nsidc.org/ATL06_both.h5",
+        "https://data.nsidc.org/ATL06_west.h5",
+    ]
+    assert manifest["east"] == [str(tmp_path / "ATL06_both.h5")]
+    with open(tmp_path / "manifest.json") as fid:
+        assert json.load(fid) == manifest
@@ -0,0 +1,60 @@
+import hashlib
+
+import pytest
+import requests
+import responses
+
+from icepyx.core.download import download_files
+from icepyx.core.exceptions import DownloadError
+
+URL = "https://data.nsidc.org/ATL06_20190221121851_08410203_006_01.h5"
+CONTENT = bytes(range(256)) * 40
+
+
+def _ranged(request):
+    # serve byte ranges, like the NSIDC data servers
+    start = 0
+    if "Range" in request.headers:
+        start = int(request.headers["Range"].split("=")[1].rstrip("-"))
+        headers = {"Content-Range": f"bytes {start}-{len(CONTENT) - 1}/{len(CONTENT)}"}
+        return (206, headers, CONTENT[start:])
+    return (200, {"Content-Length": str(len(CONTENT))}, CONTENT)
+
+
+@responses.activate
+def test_download_resumes_partial_file(tmp_path):
+    responses.add_callback(responses.GET, URL, callback=_ranged)
+    part = tmp_path / "ATL06_20190221121851_08410203_006_01.h5.part"
+    part.write_bytes(CONTENT[:1000])
+
+    file_info = {
+        "ATL06_20190221121851_08410203_006_01.h5": {
+            "size": len(CONTENT),
+            "checksum": ("MD5", hashlib.md5(CONTENT).hexdigest()),
+        }
+    }
+    files = download_files(
+        [URL], tmp_path, file_info=file_info, session=requests.Session()
+    )
+
+    assert responses.calls[0].request.headers["Range"] == "bytes=1000-"
+    assert files == [str(tmp_path / "ATL06_20190221121851_08410203_006_01.h5")]
+    with open(files[0], "rb") as fid:
+        assert fid.read() == CONTENT
+    assert not part.exists()
+
+    # complete files are not downloaded again
+    download_files([URL], tmp_path, session=requests.Session())
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_download_checksum_mismatch(tmp_path):
+    responses.add_callback(responses.GET, URL, callback=_ranged)
+    file_info = {
+        "ATL06_20190221121851_08410203_006_01.h5": {"checksum": ("MD5", "0" * 32)}
+    }
+    with pytest.raises(DownloadError, match="MD5 checksum does not match"):
+        download_files([URL], tmp_path, file_info=file_info, session=requests.Session())
+    # neither a partial nor a corrupt file is kept
+    assert list(tmp_path.iterdir()) == []
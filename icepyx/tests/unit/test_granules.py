@@ -1,3 +1,4 @@
+import json
 import re
 
 import pytest
@@ -595,6 +596,41 @@ def test_granules_info():
 
     assert obs == exp
 
+    cat = granules.catalog(grans)
+    assert granules.info(cat) == exp
+    assert cat["rgt"].tolist() == [841, 849]
+    assert cat["cycle"].tolist() == [2, 2]
+    assert cat["version"].tolist() == [1, 1]
+    assert cat["data_url"].str.endswith("_003_01.h5").all()
+    assert cat.loc[0, ["west", "south", "east", "north"]].tolist() == pytest.approx(
+        [-57.75066986682175, 60.188087866839815, -47.47451382423887, 79.88471463831527]
+    )
+
+
+def test_gran_IDs():
+    grans = [
+        {
+            "producer_granule_id": "ATL06_20190221121851_08410203_006_01.h5",
+            "links": [{"href": "s3://bucket/ATL06_20190221121851_08410203_006_01.h5"}],
+        },
+        {"producer_granule_id": "ATL07-02_20190624063616_13290301_006_01.h5"},
+    ]
+    exp = [
+        [
+            "ATL06_20190221121851_08410203_006_01.h5",
+            "ATL07-02_20190624063616_13290301_006_01.h5",
+        ],
+        ["02", "03"],
+        ["0841", "1329"],
+        ["2019-02-21", "2019-06-24"],
+        ["s3://bucket/ATL06_20190221121851_08410203_006_01.h5"],
+    ]
+    for g in [grans, granules.catalog(grans)]:
+        obs = granules.gran_IDs(
+            g, ids=True, cycles=True, tracks=True, dates=True, cloud=True
+        )
+        assert obs == exp
+
 
 def test_no_granules_in_search_results():
     ermsg = "Your search returned no results; try different search parameters"
@@ -639,3 +675,232 @@ def test_avail_granule_CMR_error():
         CMRparams = {"temporal": "badinput"}
         # reqparams = {"version": "003", "short_name": "ATL08", "page_size": 1} deprecated
         Granules().get_avail(CMRparams=CMRparams)
+
+
+def test_shard_params_spreads_remainder():
+    CMRparams = {"temporal": "2019-02-20T00:00:00Z,2019-02-20T00:00:10Z"}
+    obs = granules._shard_params(CMRparams, 3)
+    assert [p["temporal"] for p in obs] == [
+        "2019-02-20T00:00:00Z,2019-02-20T00:00:04Z",
+        "2019-02-20T00:00:04Z,2019-02-20T00:00:07Z",
+        "2019-02-20T00:00:07Z,2019-02-20T00:00:10Z",
+    ]
+    # never more shards than seconds
+    assert len(granules._shard_params(CMRparams, 20)) == 10
+
+
+def test_shard_params_granule_names():
+    CMRparams = {
+        "bounding_box": "-55.0,68.0,-48.0,71.0",
+        "readable_granule_name[]": ["a", "b", "c"],
+    }
+    obs = granules._shard_params(CMRparams, 2)
+    assert [p["readable_granule_name[]"] for p in obs] == [["a", "b"], ["c"]]
+    assert all(p["bounding_box"] == CMRparams["bounding_box"] for p in obs)
+
+
+@pytest.fixture
+def cmr_search():
+    """
+    Serve mock CMR granule search results, paged with the CMR-Search-After header.
+
+    Returns a function that takes a function of the request's query parameters
+    returning the pages of results (lists of entries, or of producer_granule_id
+    strings), and returns the list of requests made.
+    """
+    requests_made = []
+
+    def serve(pages_for, results="feed"):
+        def callback(request):
+            requests_made.append(request)
+            pages = pages_for(request.params)
+            page = int(request.headers.get("CMR-Search-After", 0))
+            entries = [
+                {"producer_granule_id": e} if isinstance(e, str) else e
+                for e in (pages[page] if page < len(pages) else [])
+            ]
+            body = (
+                {"feed": {"entry": entries}}
+                if results == "feed"
+                else {results: entries}
+            )
+            headers = {
+                "CMR-Hits": str(sum(len(p) for p in pages)),
+                "CMR-Search-After": str(page + 1),
+            }
+            return (200, headers, json.dumps(body))
+
+        responses.add_callback(
+            responses.GET,
+            re.compile(
+                re.escape("https://cmr.earthdata.nasa.gov/search/granules") + r".*"
+            ),
+            callback=callback,
+        )
+        return requests_made
+
+    return serve
+
+
+@responses.activate
+def test_get_avail_sharded_dedupes(cmr_search):
+    # the granule spanning the shard boundary is returned by both shards
+    grans = {
+        "2019-02-20T00:00:00Z,2019-02-24T00:00:00Z": ["ATL06_a.h5", "ATL06_b.h5"],
+        "2019-02-24T00:00:00Z,2019-02-28T00:00:00Z": ["ATL06_b.h5", "ATL06_c.h5"],
+    }
+    cmr_search(lambda params: [grans[params["temporal"]]])
+
+    grans_obj = Granules()
+    grans_obj.get_avail(
+        {"temporal": "2019-02-20T00:00:00Z,2019-02-28T00:00:00Z"}, shards=2
+    )
+    assert [g["producer_granule_id"] for g in grans_obj.avail] == [
+        "ATL06_a.h5",
+        "ATL06_b.h5",
+        "ATL06_c.h5",
+    ]
+
+
+@responses.activate
+def test_get_avail_keeps_full_entries(cmr_search):
+    entry = {
+        "producer_granule_id": "ATL06_20190221121851_08410203_006_01.h5",
+        "granule_size": "55.1",
+        "title": "SC:ATL06.006:266186567",
+        "dataset_id": "ATLAS/ICESat-2 L3A Land Ice Height V006",
+        "orbit_calculated_spatial_domains": [{"orbit_number": "2749"}],
+        "links": [
+            {
+                "rel": "http://esipfed.org/ns/fedsearch/1.1/documentation#",
+                "href": "https://nsidc.org/data/data-access-tool/ATL06/versions/6",
+            },
+        ],
+    }
+    cmr_search(lambda params: [[entry]])
+
+    grans_obj = Granules()
+    grans_obj.get_avail({"short_name": "ATL06"})
+    assert grans_obj.avail == [entry]
+    assert grans_obj.catalog["size_mb"].tolist() == [55.1]
+
+
+@responses.activate
+def test_get_avail_cached(tmp_path, monkeypatch, cmr_search):
+    monkeypatch.setenv("ICEPYX_CACHE_DIR", str(tmp_path))
+
+    def pages_for(params):
+        if "updated_since" in params:
+            return [["ATL06_b.h5", "ATL06_c.h5"]]
+        return [["ATL06_a.h5", "ATL06_b.h5"]]
+
+    searches = cmr_search(pages_for)
+
+    CMRparams = {
+        "short_name": "ATL06",
+        "temporal": "2019-02-20T00:00:00Z,2019-02-28T00:00:00Z",
+    }
+    Granules().get_avail(CMRparams, cache_ttl=3600)
+    n_searches = len(searches)
+
+    # an identical search (in any key order) is served from the cache
+    grans_obj = Granules()
+    grans_obj.get_avail(dict(reversed(CMRparams.items())), cache_ttl=3600)
+    assert len(searches) == n_searches
+    assert [g["producer_granule_id"] for g in grans_obj.avail] == [
+        "ATL06_a.h5",
+        "ATL06_b.h5",
+    ]
+
+    # expired results are revalidated with only the updated granules
+    grans_obj.get_avail(CMRparams, cache_ttl=0, revalidate=True)
+    assert all("updated_since" in r.params for r in searches[n_searches:])
+    assert [g["producer_granule_id"] for g in grans_obj.avail] == [
+        "ATL06_a.h5",
+        "ATL06_b.h5",
+        "ATL06_c.h5",
+    ]
+
+
+@responses.activate
+def test_iter_avail_yields_pages(cmr_search):
+    cmr_search(lambda params: [["ATL06_a.h5", "ATL06_b.h5"], ["ATL06_c.h5"]])
+
+    grans_obj = Granules()
+    grans = grans_obj.iter_avail({"short_name": "ATL06"})
+    # the first granule is available after a single request
+    assert next(grans)["producer_granule_id"] == "ATL06_a.h5"
+    assert len(responses.calls) == 1
+    assert not hasattr(grans_obj, "avail")
+
+    assert [g["producer_granule_id"] for g in grans] == ["ATL06_b.h5", "ATL06_c.h5"]
+    assert len(grans_obj.avail) == 3
+
+
+def test_filter_footprints():
+    from icepyx.core.spatial import geodataframe
+
+    grans = [
+        # diagonal track that crosses the bounding box of the polygon, but not the polygon
+        {
+            "producer_granule_id": "miss",
+            "polygons": [["68.0 -54.0 71.0 -48.5 71.0 -48.4 68.0 -53.9 68.0 -54.0"]],
+        },
+        {
+            "producer_granule_id": "hit",
+            "polygons": [["68.0 -55.0 71.0 -54.0 71.0 -53.9 68.0 -54.9 68.0 -55.0"]],
+        },
+        {"producer_granule_id": "no_footprint"},
+    ]
+    # triangle covering the western half of the bounding box
+    extent = geodataframe("polygon", [-55, 68, -55, 71, -50, 71, -55, 68])
+
+    grans_obj = Granules()
+    grans_obj.avail = grans
+    assert grans_obj.filter_footprints(extent) == 1
+    assert [g["producer_granule_id"] for g in grans_obj.avail] == [
+        "hit",
+        "no_footprint",
+    ]
+
+
+@responses.activate
+def test_archive_info(cmr_search):
+    name = "ATL06_20190221121851_08410203_006_01.h5"
+    items = [
+        {
+            "umm": {
+                "DataGranule": {
+                    "ArchiveAndDistributionInformation": [
+                        {
+                            "Name": name,
+                            "SizeInBytes": 57827301,
+                            "Checksum": {"Value": "abc123", "Algorithm": "MD5"},
+                        }
+                    ]
+                }
+            }
+        }
+    ]
+    searches = cmr_search(lambda params: [items], results="items")
+
+    grans_obj = Granules()
+    avail = [{"id": "G1", "producer_granule_id": name, "title": "SC:ATL06.006"}]
+    grans_obj.avail = [dict(gran) for gran in avail]
+    obs = grans_obj.archive_info()
+    assert obs == {name: {"size": 57827301, "checksum": ("MD5", "abc123")}}
+    # only the available granules are looked up, and their entries are unchanged
+    assert all(r.params["concept_id[]"] == "G1" for r in searches)
+    assert all(
+        r.headers["Accept"] == "application/vnd.nasa.cmr.umm_results+json"
+        for r in searches
+    )
+    assert grans_obj.avail == avail
+
+
+def test_cmr_cache_file_versioned(monkeypatch, tmp_path):
+    monkeypatch.setenv("ICEPYX_CACHE_DIR", str(tmp_path))
+    CMRparams = {"short_name": "ATL06"}
+    obs = granules._cmr_cache_file(CMRparams)
+    monkeypatch.setattr(granules, "_CMR_CACHE_VERSION", 1)
+    assert granules._cmr_cache_file(CMRparams) != obs
@@ -0,0 +1,260 @@
+from concurrent.futures import Future
+from pathlib import Path
+
+from harmony import Client
+import pytest
+
+import icepyx.core.harmony as harmony
+from icepyx.core.harmony import HarmonyApi
+from icepyx.core.scheduler import DownloadScheduler
+import icepyx.core.state as state
+from icepyx.core.state import StateStore
+
+
+def _done(result):
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ICEPYX_STATE_DIR", str(tmp_path / "state"))
+
+
+# harmony-py's naming of downloaded files (which needs no client state)
+_download_filename = Client.__new__(Client).get_download_filename_from_url
+
+
+def _api():
+    api = HarmonyApi()
+    api.harmony_client.get_download_filename_from_url.side_effect = _download_filename
+    return api
+
+
+def _fake_download(url, directory, overwrite=False):
+    path = Path(directory) / _download_filename(url)
+    path.write_text("data")
+    return _done(str(path))
+
+
+def test_download_granules_stream(tmp_path):
+    api = _api()
+    api.job_ids = ["job1"]
+    api.harmony_client.iterator.return_value = iter(
+        [
+            {"path": _fake_download("https://harmony/a.h5", tmp_path)},
+            {"path": _fake_download("https://harmony/b.h5", tmp_path)},
+            None,
+        ]
+    )
+    api.harmony_client.status.return_value = {"status": "successful"}
+    api.harmony_client.result_urls.return_value = iter(
+        ["https://harmony/a.h5", "https://harmony/b.h5"]
+    )
+
+    paths = api.download_granules(download_dir=tmp_path, stream=True)
+
+    assert sorted(paths) == [tmp_path / "a.h5", tmp_path / "b.h5"]
+    api.harmony_client.iterator.assert_called_once_with(
+        "job1", str(tmp_path), overwrite=False
+    )
+    api.harmony_client.download_all.assert_not_called()
+    # the streamed files are not downloaded again once the links are recorded
+    api.harmony_client.download.assert_not_called()
+    assert list(api.state.files("job1").values()) == [
+        "https://harmony/a.h5",
+        "https://harmony/b.h5",
+    ]
+    assert api.state.unfinished_jobs() == []
+    assert all(isinstance(p, Path) for p in paths)
+
+
+def test_download_granules_stream_staged_results(tmp_path):
+    urls = [
+        "https://harmony.earthdata.nasa.gov/service-results/harmony-prod-staging/"
+        f"public/931355e8-0005-4dff-9c76-7903a5be283d/{item}/x.h5"
+        for item in ["1", "2"]
+    ]
+    api = _api()
+    api.job_ids = ["job1"]
+    api.harmony_client.iterator.return_value = iter(
+        [{"path": _fake_download(url, tmp_path)} for url in urls] + [None]
+    )
+    api.harmony_client.status.return_value = {"status": "successful"}
+    api.harmony_client.result_urls.return_value = iter(urls)
+    api.harmony_client.download.side_effect = _fake_download
+
+    paths = api.download_granules(download_dir=tmp_path, stream=True)
+
+    # each streamed file is returned once, and not downloaded again
+    assert sorted(paths) == [tmp_path / "1_x.h5", tmp_path / "2_x.h5"]
+    api.harmony_client.download.assert_not_called()
+
+
+def test_download_granules_stream_paused(tmp_path):
+    api = _api()
+    api.job_ids = ["job1"]
+    api.state.add_job("job1")
+    failed = Future()
+    failed.set_exception(ConnectionError("interrupted"))
+    api.harmony_client.iterator.return_value = iter(
+        [
+            {"path": failed},
+            {"path": _fake_download("https://harmony/a.h5", tmp_path)},
+            None,
+        ]
+    )
+    api.harmony_client.status.return_value = {"status": "paused", "message": "preview"}
+
+    with pytest.raises(ConnectionError):
+        api.download_granules(download_dir=tmp_path, stream=True)
+
+    # the file that did download is recorded, and the paused job can be resumed
+    assert list(api.state.downloaded("job1")) == ["a.h5"]
+    assert api.state.unfinished_jobs() == ["job1"]
+
+
+def test_download_granules_tracks_jobs(tmp_path, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(harmony.time, "sleep", sleeps.append)
+    api = _api()
+    api.job_ids = ["job1", "job2"]
+    statuses = {
+        "job1": iter(
+            [
+                {"status": "running", "progress": 10},
+                {"status": "running", "progress": 10},
+                {"status": "running", "progress": 10},
+                {"status": "successful", "progress": 100},
+            ]
+        ),
+        "job2": iter([{"status": "failed", "progress": 0, "message": "oops"}]),
+    }
+    api.harmony_client.status.side_effect = lambda job_id: next(statuses[job_id])
+    api.harmony_client.result_urls.return_value = iter(["https://harmony/a.h5"])
+    api.harmony_client.download.side_effect = _fake_download
+
+    paths = api.download_granules(download_dir=tmp_path)
+
+    assert paths == [tmp_path / "a.h5"]
+    # the polling interval backs off while the job makes no progress
+    assert sleeps == [2, 3, 4.5]
+    # only the successful job's results are downloaded
+    api.harmony_client.result_urls.assert_called_once_with("job1")
+    assert api.job_statuses["job2"]["status"] == "failed"
+
+
+def test_download_granules_resumes(tmp_path):
+    api = _api()
+    api.job_ids = ["job1"]
+    api.state.add_job("job1")
+    api.state.set_job_status("job1", "successful")
+    api.harmony_client.result_urls.return_value = iter(
+        ["https://harmony/a.h5", "https://harmony/b.h5"]
+    )
+
+    def interrupted(url, directory, overwrite=False):
+        if url.endswith("b.h5"):
+            future = Future()
+            future.set_exception(ConnectionError("interrupted"))
+            return future
+        return _fake_download(url, directory, overwrite)
+
+    api.harmony_client.download.side_effect = interrupted
+    with pytest.raises(ConnectionError):
+        api.download_granules(download_dir=tmp_path)
+
+    # a new process picks up the unfinished job, without listing its results again
+    # or downloading the files it already has
+    api = _api()
+    api.job_ids = []
+    assert api.resume_jobs() == ["job1"]
+    api.harmony_client.download.side_effect = _fake_download
+    paths = api.download_granules(download_dir=tmp_path)
+
+    assert sorted(paths) == [tmp_path / "a.h5", tmp_path / "b.h5"]
+    api.harmony_client.result_urls.assert_not_called()
+    api.harmony_client.status.assert_not_called()
+    api.harmony_client.download.assert_called_once_with(
+        "https://harmony/b.h5", str(tmp_path), overwrite=False
+    )
+    assert api.state.unfinished_jobs() == []
+
+
+def test_download_granules_scheduled(tmp_path, monkeypatch):
+    sched = DownloadScheduler()
+    monkeypatch.setattr(harmony, "scheduler", lambda: sched)
+    api = _api()
+    api.job_ids = ["job1"]
+    api.state.add_job("job1")
+    api.state.set_job_status("job1", "successful")
+    api.harmony_client.result_urls.return_value = iter(
+        ["https://harmony/a.h5", "https://harmony/b.h5"]
+    )
+    bulk_slots = []
+
+    def download(url, directory, overwrite=False):
+        bulk_slots.append(sched._active_priorities["bulk"])
+        return _fake_download(url, directory, overwrite)
+
+    api.harmony_client.download.side_effect = download
+    paths = api.download_granules(download_dir=tmp_path, priority="bulk")
+
+    assert sorted(paths) == [tmp_path / "a.h5", tmp_path / "b.h5"]
+    # each file is downloaded in a bulk slot of the shared scheduler
+    assert len(bulk_slots) == 2
+    assert all(n >= 1 for n in bulk_slots)
+    assert sched.active == 0
+
+
+def test_resume_jobs_scoped(tmp_path, monkeypatch):
+    path = tmp_path / "state.sqlite"
+    StateStore(path, scope="notebook").add_job("job1")
+    StateStore(path, scope="worker").add_job("job2")
+
+    api = _api()
+    api.job_ids = []
+    api.state = StateStore(path, scope="worker")
+    # other scopes' jobs are not resumed
+    assert api.resume_jobs() == ["job2"]
+
+    # nor are jobs whose results have expired
+    now = state.time.time()
+    monkeypatch.setattr(state.time, "time", lambda: now + state.JOB_EXPIRY_SECONDS + 1)
+    assert api.state.unfinished_jobs() == []
+
+
+def test_download_granules_resumes_staged_results(tmp_path):
+    # staged results are saved by harmony-py with their item ID as a prefix
+    url = (
+        "https://harmony.earthdata.nasa.gov/service-results/harmony-prod-staging/"
+        "public/931355e8-0005-4dff-9c76-7903a5be283d/12345/x.h5"
+    )
+    api = _api()
+    api.job_ids = ["job1"]
+    api.state.add_job("job1")
+    api.state.set_job_status("job1", "successful")
+    api.harmony_client.result_urls.return_value = iter([url])
+    api.harmony_client.download.side_effect = _fake_download
+    assert api.download_granules(download_dir=tmp_path) == [tmp_path / "12345_x.h5"]
+    assert api.state.files("job1") == {"12345_x.h5": url}
+
+    # once downloaded, the file is neither downloaded nor returned again
+    api.state.set_job_status("job1", "successful")
+    api.harmony_client.download.reset_mock()
+    assert api.download_granules(download_dir=tmp_path) == [tmp_path / "12345_x.h5"]
+    api.harmony_client.download.assert_not_called()
+
+
+def test_wait_for_job_min_interval(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(harmony.time, "sleep", sleeps.append)
+    api = _api()
+    api.harmony_client.status.side_effect = [
+        {"status": "running", "progress": 10},
+        {"status": "running", "progress": 10},
+        {"status": "successful", "progress": 100},
+    ]
+    assert api.wait_for_job("job1", min_interval=3)["status"] == "successful"
+    assert sleeps == [3, 4.5]
@@ -0,0 +1,24 @@
+import responses
+
+import icepyx.core.http_client as http_client
+
+
+def test_shared_session():
+    assert http_client.session() is http_client.session()
+    adapter = http_client.session().get_adapter("https://cmr.earthdata.nasa.gov")
+    assert 503 in adapter.max_retries.status_forcelist
+
+
+@responses.activate
+def test_configure_recreates_session():
+    old = http_client.session()
+    http_client.configure(max_retries=1)
+    try:
+        new = http_client.session()
+        assert new is not old
+        assert new.get_adapter("https://example.com").max_retries.total == 1
+
+        responses.add(responses.GET, "https://example.com/data", json={"a": 1})
+        assert http_client.get("https://example.com/data").json() == {"a": 1}
+    finally:
+        http_client.configure(max_retries=3)
@@ -1,6 +1,8 @@
 import pytest
+import responses
 
 import icepyx.core.is2ref as is2ref
+from icepyx.core.urls import COLLECTION_SEARCH_BASE_URL
 
 ########## _validate_product ##########
 
@@ -418,6 +420,47 @@ def test_atl23_product():
 #     assert obs == expected
 
 
+@responses.activate
+def test_about_product_fetched_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("ICEPYX_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("ICEPYX_COLLECTION_CACHE_TTL", "3600")
+    responses.add(
+        responses.GET,
+        COLLECTION_SEARCH_BASE_URL,
+        json={"feed": {"entry": [{"version_id": "005"}, {"version_id": "006"}]}},
+    )
+
+    is2ref.clear_collection_cache()
+    assert is2ref.latest_version("ATL06") == "006"
+    assert is2ref.about_product("ATL06")["feed"]["entry"][0]["version_id"] == "005"
+    assert len(responses.calls) == 1
+
+    # a new process reads the metadata persisted on disk
+    is2ref.clear_collection_cache()
+    assert is2ref.latest_version("ATL06") == "006"
+    assert len(responses.calls) == 1
+    is2ref.clear_collection_cache()
+
+
+def test_concept_id_fetched_once(monkeypatch):
+    searches = []
+
+    class Collection:
+        def concept_id(self):
+            return "C0000-NSIDC"
+
+    def search_datasets(**kwargs):
+        searches.append(kwargs)
+        return [Collection()]
+
+    monkeypatch.setattr(is2ref.earthaccess, "search_datasets", search_datasets)
+    is2ref.clear_collection_cache()
+    assert is2ref.concept_id("ATL06", "006") == "C0000-NSIDC"
+    assert is2ref.concept_id("ATL06", "006") == "C0000-NSIDC"
+    assert searches == [{"short_name": "ATL06", "version": "006", "cloud_hosted": True}]
+    is2ref.clear_collection_cache()
+
+
 ########## _get_custom_options ##########
 # Note: requires internet connection + active NSIDC session
 # Thus, the tests for this function are in the test_behind_NSIDC_API_login suite
@@ -0,0 +1,122 @@
+import datetime as dt
+from unittest.mock import Mock
+
+import h5py
+import pytest
+import shapely
+
+import icepyx as ipx
+import icepyx.core.is2ref as is2ref
+from icepyx.core.local_catalog import LocalCatalog
+from icepyx.core.orders import DataOrder
+
+
+def _granule(path, west, south, east, north):
+    with h5py.File(path, "w") as f:
+        f.attrs["geospatial_lon_min"] = west
+        f.attrs["geospatial_lat_min"] = south
+        f.attrs["geospatial_lon_max"] = east
+        f.attrs["geospatial_lat_max"] = north
+        f.attrs["time_coverage_start"] = b"2019-02-21T12:18:51.000000Z"
+        f.attrs["time_coverage_end"] = b"2019-02-21T12:27:20.000000Z"
+
+
+def test_search_and_incremental_update(tmp_path, monkeypatch):
+    _granule(tmp_path / "ATL06_20190221121851_08410203_006_01.h5", -55, 60, -50, 80)
+    (tmp_path / "sub").mkdir()
+    _granule(tmp_path / "sub" / "ATL06_20190225121032_09020203_006_01.h5", 0, 0, 1, 1)
+
+    catalog = LocalCatalog(tmp_path)
+    assert len(catalog) == 2
+    obs = catalog.search(
+        product="ATL06",
+        version="006",
+        extent=shapely.box(-53, 68, -48, 71),
+        start=dt.datetime(2019, 2, 20),
+        end=dt.datetime(2019, 2, 22),
+        cycles=["02"],
+    )
+    assert obs["id"].tolist() == ["ATL06_20190221121851_08410203_006_01.h5"]
+    assert obs["rgt"].tolist() == [841]
+
+    # the saved index is reused, and only new files are read
+    _granule(tmp_path / "ATL06_20190222010344_08490205_006_01.h5", -56, 60, -50, 80)
+    read = []
+    monkeypatch.setattr(
+        "icepyx.core.local_catalog._read_extent", lambda path: read.append(path) or {}
+    )
+    catalog = LocalCatalog(tmp_path)
+    assert len(catalog) == 3
+    assert [p.name for p in read] == ["ATL06_20190222010344_08490205_006_01.h5"]
+
+
+def test_avail_granules_excludes_local(tmp_path, monkeypatch):
+    monkeypatch.setattr(is2ref, "latest_version", lambda product: "006")
+    monkeypatch.setattr(
+        ipx.Query, "_get_concept_id", lambda self, product, version: "C0000-NSIDC"
+    )
+    _granule(tmp_path / "ATL06_20190221121851_08410203_006_01.h5", -55, 60, -50, 80)
+    catalog = LocalCatalog(tmp_path)
+
+    reg_a = ipx.Query("ATL06", [-55, 68, -48, 71], ["2019-02-20", "2019-02-28"])
+    assert reg_a.local_granules(catalog)["id"].tolist() == [
+        "ATL06_20190221121851_08410203_006_01.h5"
+    ]
+
+    ids = [
+        "ATL06_20190221121851_08410203_006_01.h5",
+        "ATL06_20190222010344_08490205_006_01.h5",
+    ]
+    reg_a.granules.avail = [{"producer_granule_id": gid} for gid in ids]
+    reg_a.avail_granules(local_catalog=catalog)
+    assert reg_a.avail_granules(ids=True) == [ids[1:]]
+
+
+def test_exclude_matches_granule_id_of_local_files(tmp_path):
+    # harmony-py prefixes subset results with the job's item ID
+    _granule(
+        tmp_path / "12345_ATL06_20190221121851_08410203_006_01_subsetted.h5",
+        -55,
+        60,
+        -50,
+        80,
+    )
+    catalog = LocalCatalog(tmp_path)
+    ids = [
+        "ATL06_20190221121851_08410203_006_01.h5",
+        "ATL06_20190222010344_08490205_006_01.h5",
+    ]
+    grans = ipx.core.granules.Granules()
+    grans.avail = [{"producer_granule_id": gid} for gid in ids]
+
+    assert grans.exclude(catalog.df["id"]) == 1
+    assert [gran["producer_granule_id"] for gran in grans.avail] == ids[1:]
+
+
+def test_download_updates_catalog(tmp_path):
+    catalog = LocalCatalog(tmp_path)
+    new = tmp_path / "ATL06_20190222010344_08490205_006_01.h5"
+
+    def download_granules(**kwargs):
+        _granule(new, 0, 0, 1, 1)
+        return [str(new)]
+
+    harmony_api = Mock()
+    harmony_api.download_granules.side_effect = download_granules
+    order = DataOrder(
+        job_id="job1", type="subset", granules=[], harmony_client=harmony_api
+    )
+    order.download(tmp_path, local_catalog=catalog)
+
+    assert catalog.df["id"].tolist() == [new.name]
+
+
+def test_download_outside_catalog_rejected(tmp_path):
+    catalog = LocalCatalog(tmp_path / "catalog")
+    harmony_api = Mock()
+    order = DataOrder(
+        job_id="job1", type="subset", granules=[], harmony_client=harmony_api
+    )
+    with pytest.raises(ValueError, match="not within"):
+        order.download_granules(tmp_path / "elsewhere", local_catalog=catalog)
+    harmony_api.download_granules.assert_not_called()
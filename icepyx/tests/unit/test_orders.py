@@ -33,6 +33,30 @@ def test_status_subset():
     mock_harmony_client.check_order_status.assert_called_once_with(123)
 
 
+def test_status_sharded_subset():
+    mock_harmony_client = Mock()
+    mock_harmony_client.check_order_status.side_effect = [
+        {"status": "successful", "progress": 100, "request": "url"},
+        {"status": "failed", "progress": 40, "request": "url", "errors": ["oops"]},
+    ]
+
+    order = DataOrder(
+        job_id=["job1", "job2"],
+        type="subset",
+        granules=["granule1", "granule2"],
+        harmony_client=mock_harmony_client,
+    )
+    result = order.status()
+
+    assert result["status"] == "complete_with_errors"
+    assert result["progress"] == 70
+    assert result["errors"] == ["oops"]
+    assert [s["order_url"].rsplit("/", 1)[-1] for s in result["jobs"]] == [
+        "job1",
+        "job2",
+    ]
+
+
 def test_status_non_subset():
     # Mock the harmony_client (not used in this case)
     mock_harmony_client = Mock()
@@ -67,21 +91,25 @@ def test_download_subset():
 
     with tempfile.TemporaryDirectory() as temp_dir:
         temp_path = Path(temp_dir)
-        result = order.download(temp_path, overwrite=True)
+        result = order.download(temp_path, overwrite=True, max_workers=8)
 
         assert result == "downloaded_subset"
         mock_harmony_client.download_granules.assert_called_once_with(
-            download_dir=str(temp_path), overwrite=True
+            download_dir=str(temp_path),
+            overwrite=True,
+            stream=False,
+            max_workers=8,
+            priority="interactive",
         )
 
 
-@patch("earthaccess.download")  # Patch the earthaccess.download method
-def test_download_non_subset(mock_earthaccess_download):
+@patch("icepyx.core.orders.download_files")
+def test_download_non_subset(mock_download_files):
     # Mock the harmony_client (not used in this case)
     mock_harmony_client = Mock()
 
-    # Mock the earthaccess.download method to return specific file paths
-    mock_earthaccess_download.return_value = [
+    # Mock the download engine to return specific file paths
+    mock_download_files.return_value = [
         "/fake/path/granule1.nc",
         "/fake/path/granule2.nc",
     ]
@@ -92,15 +120,21 @@ def test_download_non_subset(mock_earthaccess_download):
         type="download",
         granules=["granule1", "granule2"],
         harmony_client=mock_harmony_client,
+        file_info={"granule1": {"size": 10}},
     )
 
     # Use a temporary directory for the test
     with tempfile.TemporaryDirectory() as temp_dir:
         temp_path = Path(temp_dir)
-        result = order.download(temp_path)
+        result = order.download(temp_path, max_workers=2)
 
         assert result == ["/fake/path/granule1.nc", "/fake/path/granule2.nc"]
-        mock_earthaccess_download.assert_called_once_with(
-            ["granule1", "granule2"], local_path=temp_path
+        mock_download_files.assert_called_once_with(
+            ["granule1", "granule2"],
+            temp_path,
+            max_workers=2,
+            overwrite=False,
+            file_info={"granule1": {"size": 10}},
+            priority="interactive",
         )
         mock_harmony_client.download_granules.assert_not_called()
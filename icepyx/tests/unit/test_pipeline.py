@@ -0,0 +1,76 @@
+import pytest
+import requests
+import responses
+
+from icepyx.core.exceptions import PipelineError
+from icepyx.core.pipeline import run_pipeline
+
+URLS = [
+    f"https://data.nsidc.org/ATL06_2019022{i}121851_08410203_006_01.h5"
+    for i in range(6)
+]
+
+
+@responses.activate
+def test_pipeline_bounds_files_on_disk(tmp_path):
+    for i, url in enumerate(URLS):
+        responses.add(responses.GET, url, body=bytes([i]) * 100)
+    on_disk = []
+
+    def reduce(path):
+        on_disk.append(len(list(tmp_path.glob("*.h5"))))
+        return path.read_bytes()[0]
+
+    results = run_pipeline(
+        URLS,
+        tmp_path,
+        reduce=reduce,
+        download_workers=2,
+        reduce_workers=1,
+        depth=2,
+        delete=True,
+        session=requests.Session(),
+    )
+
+    assert results == list(range(len(URLS)))
+    assert max(on_disk) <= 2
+    assert list(tmp_path.glob("*.h5")) == []
+
+
+@responses.activate
+def test_pipeline_reports_failures(tmp_path):
+    responses.add(responses.GET, URLS[0], body=b"data")
+    responses.add(responses.GET, URLS[1], status=404)
+
+    def reduce(path):
+        if path.name == "ATL06_20190220121851_08410203_006_01.h5":
+            raise ValueError("unreadable")
+
+    with pytest.raises(PipelineError) as e:
+        run_pipeline(URLS[:2], tmp_path, reduce=reduce, session=requests.Session())
+    assert set(e.value.failed) == set(URLS[:2])
+
+
+@responses.activate
+def test_pipeline_deletes_only_processed_downloads(tmp_path):
+    existing = tmp_path / "ATL06_20190220121851_08410203_006_01.h5"
+    existing.write_bytes(b"local")
+    responses.add(responses.GET, URLS[1], body=b"data")
+    responses.add(responses.GET, URLS[2], body=b"bad")
+
+    def reduce(path):
+        if path.read_bytes() == b"bad":
+            raise ValueError("unreadable")
+        return path.read_bytes()
+
+    with pytest.raises(PipelineError) as e:
+        run_pipeline(
+            URLS[:3], tmp_path, reduce=reduce, delete=True, session=requests.Session()
+        )
+
+    assert list(e.value.failed) == [URLS[2]]
+    # the file that was already there, and the one that failed, are kept
+    assert sorted(p.name for p in tmp_path.glob("*.h5")) == [
+        existing.name,
+        "ATL06_20190222121851_08410203_006_01.h5",
+    ]
@@ -1,4 +1,9 @@
+import pytest
+
 import icepyx as ipx
+import icepyx.core.is2ref as is2ref
+import icepyx.core.query as query
+from icepyx.core.variables import Variables
 
 # ------------------------------------
 # 		Generic Query tests
@@ -51,6 +56,62 @@ def test_temporal_properties_cycles_tracks():
     assert [obs == exp for obs in (reg_a.dates, reg_a.start_time, reg_a.end_time)]
 
 
+def test_order_granules_shards(monkeypatch):
+    monkeypatch.setattr(is2ref, "latest_version", lambda product: "006")
+    monkeypatch.setattr(
+        ipx.Query, "_get_concept_id", lambda self, product, version: "C0000-NSIDC"
+    )
+    reg_a = ipx.Query("ATL06", [-55, 68, -48, 71], ["2019-02-20", "2019-02-28"])
+    ids = [f"ATL06_2019022{i}121851_08410203_006_01.h5" for i in range(5)]
+    reg_a.granules.avail = [{"producer_granule_id": gid} for gid in ids]
+
+    order = reg_a.order_granules(shard_size=2)
+
+    calls = reg_a.harmony_api.place_order.call_args_list
+    assert [call.kwargs["granule_name"] for call in calls] == [
+        ids[0:2],
+        ids[2:4],
+        ids[4:],
+    ]
+    assert all(call.kwargs["skip_preview"] for call in calls)
+    assert len(order.job_id()) == 3
+
+
+def test_order_granules_variables(monkeypatch):
+    monkeypatch.setattr(is2ref, "latest_version", lambda product: "006")
+    monkeypatch.setattr(
+        ipx.Query, "_get_concept_id", lambda self, product, version: "C0000-NSIDC"
+    )
+    query.HarmonyApi.return_value.get_capabilities.return_value = {
+        "variableSubset": True,
+        "variables": [
+            {"name": "/gt1l/land_ice_segments/h_li"},
+            {"name": "/gt1l/land_ice_segments/latitude"},
+            {"name": "/orbit_info/sc_orient"},
+            {"name": "/orbit_info/sc_orient_time"},
+            {"name": "/orbit_info/rgt"},
+            {"name": "/ancillary_data/atlas_sdp_gps_epoch"},
+        ],
+    }
+    reg_a = ipx.Query("ATL06", [-55, 68, -48, 71], ["2019-02-20", "2019-02-28"])
+    reg_a._variables = Variables(
+        product="ATL06", wanted={"h_li": ["gt1l/land_ice_segments/h_li"]}
+    )
+
+    reg_a.order_granules()
+    # with the variables needed to read the subset files with icepyx
+    assert reg_a.harmony_api.place_order.call_args.kwargs["variables"] == [
+        "/gt1l/land_ice_segments/h_li",
+        "/orbit_info/sc_orient",
+        "/orbit_info/rgt",
+        "/ancillary_data/atlas_sdp_gps_epoch",
+    ]
+
+    reg_a._variables.wanted = {"h_li": ["gt2l/land_ice_segments/h_li"]}
+    with pytest.raises(ValueError, match="not available for subsetting"):
+        reg_a.order_granules()
+
+
 # Tests need to add (given can't do them within docstrings/they're behind NSIDC login)
 # reqparams post-order
 # product_all_info
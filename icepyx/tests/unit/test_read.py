@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 import icepyx.core.read as read
@@ -103,3 +104,61 @@ def test_get_track_type_str(
         exp_spot_dim_name,
         exp_spot_var_name,
     )
+
+
+@pytest.fixture
+def atl06_file(tmp_path):
+    h5py = pytest.importorskip("h5py")
+    fn = tmp_path / "ATL06_20190221121851_08410203_006_02.h5"
+    with h5py.File(fn, "w") as f:
+        f.attrs["short_name"] = np.bytes_("ATL06")
+        f.create_group("METADATA/DatasetIdentification").attrs["VersionID"] = np.bytes_(
+            "006"
+        )
+        f["orbit_info/sc_orient"] = np.array([1], dtype="i1")
+        f["orbit_info/rgt"] = np.array([841], dtype="i2")
+        f["orbit_info/cycle_number"] = np.array([2], dtype="i1")
+        f["ancillary_data/atlas_sdp_gps_epoch"] = np.array([1.2e9])
+        f["ancillary_data/data_start_utc"] = np.array([b"2019-02-21T12:19:05.000000Z"])
+        f["ancillary_data/data_end_utc"] = np.array([b"2019-02-21T12:24:16.000000Z"])
+        grp = f.create_group("gt1l/land_ice_segments")
+        grp.create_dataset("delta_time", data=np.arange(1000.0), compression="gzip")
+        grp.create_dataset("h_li", data=np.zeros(1000, "f4"), compression="gzip")
+    return str(fn)
+
+
+def test_estimate_size(atl06_file):
+    reader = read.Read(atl06_file)
+    reader.variables.append(var_list=["h_li"])
+    obs = reader.estimate_size()
+
+    assert (
+        obs["Size in memory per variable (bytes)"]["gt1l/land_ice_segments/h_li"]
+        == 4000
+    )
+    # the group's delta_time coordinate and the photon_idx index are loaded too
+    sizes = obs["Size in memory per variable (bytes)"]
+    assert sizes["gt1l/land_ice_segments/delta_time"] == 8000
+    assert sizes["gt1l/land_ice_segments/photon_idx"] == 8000
+    assert obs["Total size in memory (bytes)"] == (
+        4000 + 8000 + 8000 + 1 + 2 + 1 + 8 + 27 + 27
+    )
+    # the zeros compress well
+    assert obs["Total size on disk (bytes)"] < obs["Total size in memory (bytes)"]
+    # the required variables are counted, but not added to the wanted list
+    assert reader.variables.wanted == {"h_li": ["gt1l/land_ice_segments/h_li"]}
+
+
+def test_estimate_size_matches_loaded_size(atl06_file):
+    reader = read.Read(atl06_file)
+    reader.variables.append(var_list=["h_li"])
+    est = reader.estimate_size()["Total size in memory (bytes)"]
+    ds = reader.load()
+    assert est == pytest.approx(ds.nbytes, rel=0.05)
+
+
+def test_load_over_memory_budget(atl06_file):
+    reader = read.Read(atl06_file)
+    reader.variables.append(var_list=["h_li"])
+    with pytest.raises(MemoryError, match="exceeds the memory budget of 1000 bytes"):
+        reader.load(memory_budget=1000)
@@ -0,0 +1,72 @@
+import geopandas as gpd
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import LineString
+
+import icepyx as ipx
+import icepyx.core.is2ref as is2ref
+from icepyx.core.rgt import RGTIndex
+
+
+@pytest.fixture
+def rgt_file(tmp_path):
+    # two segments (granule regions) of each of two tracks
+    gdf = gpd.GeoDataFrame(
+        {"RGT": [849, 849, 902, 902], "REGION": [2, 3, 2, 3]},
+        geometry=[
+            LineString([(-60, 40), (-56, 60)]),
+            LineString([(-56, 60), (-50, 80)]),
+            LineString([(-24, 40), (-20, 60)]),
+            LineString([(-20, 60), (-14, 80)]),
+        ],
+        crs="epsg:4326",
+    )
+    path = tmp_path / "rgts.geojson"
+    gdf.to_file(path)
+    return path
+
+
+def test_candidates_by_region(rgt_file):
+    index = RGTIndex.from_file(rgt_file, rgt_column="RGT", region_column="REGION")
+    obs = index.candidates(gpd.GeoSeries.from_xy([-53], [70]).buffer(1))
+    assert obs.to_dict("list") == {"rgt": [849], "region": [3]}
+
+
+def test_candidates_by_track(rgt_file):
+    index = RGTIndex.from_file(rgt_file, rgt_column="RGT")
+    assert not index.has_regions
+    # both regions of track 849 are combined
+    assert len(index._gdf) == 2
+    obs = index.candidates(gpd.GeoSeries.from_xy([-53, -22], [70, 50]).buffer(1))
+    assert obs["rgt"].tolist() == [849, 902]
+
+
+def test_candidates_off_centreline():
+    gdf = gpd.GeoDataFrame(
+        {"rgt": [849]}, geometry=[LineString([(-50, 60), (-50, 80)])], crs="epsg:4326"
+    )
+    # a 200 m wide transect 2.5 km east of the RGT at 70N, covered by the right beams
+    dlon = 2500 / (111_320 * np.cos(np.radians(70)))
+    aoi = shapely.box(-50 + dlon, 69.99, -50 + dlon + 0.005, 70.01)
+    assert RGTIndex(gdf).candidates(aoi)["rgt"].tolist() == [849]
+    assert RGTIndex(gdf, swath_buffer=0).candidates(aoi).empty
+
+    # but not one 20 km away
+    far = shapely.box(-50 + 8 * dlon, 69.99, -50 + 8 * dlon + 0.005, 70.01)
+    assert RGTIndex(gdf).candidates(far).empty
+
+
+def test_query_restrict_tracks(rgt_file, monkeypatch):
+    monkeypatch.setattr(is2ref, "latest_version", lambda product: "006")
+    monkeypatch.setattr(
+        ipx.Query, "_get_concept_id", lambda self, product, version: "C0000-NSIDC"
+    )
+    index = RGTIndex.from_file(rgt_file, rgt_column="RGT", region_column="REGION")
+
+    reg_a = ipx.Query("ATL06", [-55, 68, -48, 71], cycles=["03"], tracks=["0849"])
+    reg_a.CMRparams
+    reg_a.restrict_tracks(index)
+    assert reg_a.CMRparams["readable_granule_name[]"] == [
+        "ATL06_??????????????_08490303_*"
+    ]
@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+import requests
+
+import icepyx.core.scheduler as scheduler
+from icepyx.core.scheduler import DownloadScheduler, TokenBucket
+
+
+def test_interactive_before_bulk():
+    sched = DownloadScheduler(
+        min_concurrency=1, max_concurrency=1, initial_concurrency=1
+    )
+    started = []
+
+    def transfer(url, priority):
+        with sched.slot(url, priority=priority):
+            started.append(priority)
+
+    def waiting(n):
+        while sum(len(q) for q in sched._waiting.values()) < n:
+            time.sleep(0.001)
+
+    with sched.slot("https://a.org/0.h5"):
+        bulk = threading.Thread(target=transfer, args=("https://a.org/1.h5", "bulk"))
+        bulk.start()
+        waiting(1)
+        interactive = threading.Thread(
+            target=transfer, args=("https://b.org/2.h5", "interactive")
+        )
+        interactive.start()
+        waiting(2)
+    bulk.join()
+    interactive.join()
+
+    assert started == ["interactive", "bulk"]
+
+
+def test_concurrency_adapts_to_errors():
+    sched = DownloadScheduler(initial_concurrency=8)
+    response = requests.Response()
+    response.status_code = 503
+    with pytest.raises(requests.HTTPError), sched.slot("https://a.org/0.h5"):
+        raise requests.HTTPError(response=response)
+    assert sched.limit == 4
+
+    # a missing file is not a sign of congestion
+    response.status_code = 404
+    with pytest.raises(requests.HTTPError), sched.slot("https://a.org/0.h5"):
+        raise requests.HTTPError(response=response)
+    assert sched.limit == 4
+
+    with sched.slot("https://a.org/0.h5"):
+        pass
+    assert sched.limit == 4.25
+
+
+def test_token_bucket_limits_rate(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(scheduler.time, "sleep", sleeps.append)
+    bucket = TokenBucket(rate=100)
+    bucket.consume(100)
+    assert sleeps == []
+    bucket.consume(50)
+    assert sleeps == [pytest.approx(0.5, abs=0.01)]
+
+
+def test_one_host_uses_the_adaptive_limit():
+    sched = DownloadScheduler(initial_concurrency=8)
+    release = threading.Event()
+    peak = []
+
+    def transfer(i):
+        with sched.slot(f"https://n5eil01u.ecs.nsidc.org/{i}.h5"):
+            peak.append(sched.active)
+            release.wait()
+
+    threads = [threading.Thread(target=transfer, args=(i,)) for i in range(12)]
+    for thread in threads:
+        thread.start()
+    while len(peak) < 8:
+        time.sleep(0.001)
+    time.sleep(0.01)
+    assert sched.active == 8
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert max(peak) == 8
@@ -0,0 +1,114 @@
+import os
+from pathlib import Path
+import socket
+import subprocess
+import sys
+from unittest.mock import Mock
+
+import pytest
+
+import icepyx.core.orders as orders
+from icepyx.core.orders import DataOrder
+from icepyx.core.store import GranuleStore
+
+URLS = [
+    "https://data/ATL06_20190221121851_08410203_006_01.h5",
+    "https://data/ATL06_20190225121032_09020203_006_01.h5",
+]
+
+
+def test_whole_granules_downloaded_once(tmp_path, monkeypatch):
+    downloaded = []
+
+    def fake_download_files(urls, path, **kwargs):
+        # downloads are staged outside the store's granule directories
+        assert Path(path) == tmp_path / "store" / ".incoming"
+        for url in urls:
+            downloaded.append(url)
+            (Path(path) / url.rsplit("/", 1)[-1]).write_text("data")
+
+    monkeypatch.setattr(orders, "download_files", fake_download_files)
+    store = GranuleStore(tmp_path / "store")
+
+    order = DataOrder("nosubset", "whole", URLS[:1], Mock())
+    order.download(tmp_path / "a", store=store)
+    order = DataOrder("nosubset", "whole", URLS, Mock())
+    files = order.download(tmp_path / "b", store=store)
+
+    assert downloaded == URLS
+    assert files == [str(tmp_path / "b" / url.rsplit("/", 1)[-1]) for url in URLS]
+    stored = store.granule_path("ATL06_20190221121851_08410203_006_01.h5")
+    assert stored == tmp_path / "store" / "ATL06" / "006" / stored.name
+    assert os.path.samefile(stored, files[0])
+    assert os.path.samefile(stored, tmp_path / "a" / stored.name)
+    assert list((tmp_path / "store" / ".incoming").iterdir()) == []
+
+
+def test_interrupted_download_resumed(tmp_path, monkeypatch):
+    resumed = []
+
+    def fake_download_files(urls, path, **kwargs):
+        part = Path(path) / (urls[0].rsplit("/", 1)[-1] + ".part")
+        if not part.exists():
+            part.write_text("da")
+            raise ConnectionError("interrupted")
+        resumed.append(part.read_text())
+        part.rename(part.with_suffix(""))
+
+    monkeypatch.setattr(orders, "download_files", fake_download_files)
+    store = GranuleStore(tmp_path / "store")
+    order = DataOrder("nosubset", "whole", URLS[:1], Mock())
+    with pytest.raises(ConnectionError):
+        order.download(tmp_path / "a", store=store)
+    order.download(tmp_path / "a", store=store)
+
+    # the partial download is kept for the next attempt, and the claim released
+    assert resumed == ["da"]
+    assert list(store.incoming.iterdir()) == []
+
+
+def test_granules_claimed_by_others_are_waited_for(tmp_path, monkeypatch):
+    name = URLS[0].rsplit("/", 1)[-1]
+    store = GranuleStore(tmp_path / "store")
+    # another (running) process is downloading the granule
+    assert store.claim(name)
+    assert not store.claim(name)
+
+    def other_process_finishes(seconds):
+        (store.incoming / name).write_text("data")
+        store.add_granule(store.incoming / name)
+        store.release(name)
+
+    monkeypatch.setattr(orders, "download_files", Mock())
+    monkeypatch.setattr(orders.time, "sleep", other_process_finishes)
+    order = DataOrder("nosubset", "whole", URLS[:1], Mock())
+    files = order.download(tmp_path / "a", store=store)
+
+    orders.download_files.assert_not_called()
+    assert Path(files[0]).read_text() == "data"
+
+
+def test_stale_claims_are_broken(tmp_path):
+    store = GranuleStore(tmp_path / "store")
+    name = URLS[0].rsplit("/", 1)[-1]
+    proc = subprocess.run(
+        [sys.executable, "-c", "import os; print(os.getpid())"],
+        capture_output=True,
+        text=True,
+    )
+    (store.incoming / f"{name}.claim").write_text(
+        f"{socket.gethostname()} {proc.stdout.strip()}"
+    )
+    assert store.claim(name)
+
+
+def test_subset_granules_deduplicated(tmp_path):
+    store = GranuleStore(tmp_path / "store")
+    first = tmp_path / "job1" / "ATL06_subsetted.h5"
+    second = tmp_path / "job2" / "ATL06_subsetted.h5"
+    for path in [first, second]:
+        path.parent.mkdir()
+        path.write_text("same content")
+
+    assert store.add_subset(first) == store.add_subset(second)
+    assert os.path.samefile(first, second)
@@ -1,3 +1,10 @@
+import re
+
+import pytest
+import requests
+import responses
+
+from icepyx.core.urls import IS2_VARIABLES_URL
 import icepyx.core.variables as variables
 
 
@@ -22,3 +29,158 @@ def test_list_of_dict_vals():
     ]
 
     assert obs == exp
+
+
+@pytest.fixture
+def variables_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("ICEPYX_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(variables, "_is2variables_memo", {})
+    return tmp_path
+
+
+@responses.activate
+def test_load_is2variables_revalidates_with_etag(variables_cache):
+    listing = {"ATL06": ["orbit_info/sc_orient"]}
+    responses.add(
+        responses.GET, IS2_VARIABLES_URL, json=listing, headers={"ETag": '"abc"'}
+    )
+    assert variables._load_is2variables() == listing
+
+    # a new process only needs a 304 from the server to reuse the cached copy
+    variables._is2variables_memo.clear()
+    responses.replace(responses.GET, IS2_VARIABLES_URL, status=304)
+    assert variables._load_is2variables() == listing
+    assert responses.calls[-1].request.headers["If-None-Match"] == '"abc"'
+
+    # and the in-process memo skips the request entirely
+    variables._load_is2variables()
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_load_is2variables_offline(variables_cache):
+    listing = {"ATL06": ["orbit_info/sc_orient"]}
+    responses.add(responses.GET, IS2_VARIABLES_URL, json=listing)
+    variables._load_is2variables()
+
+    variables._is2variables_memo.clear()
+    responses.replace(
+        responses.GET, IS2_VARIABLES_URL, body=requests.ConnectionError("offline")
+    )
+    with pytest.warns(UserWarning, match="using the cached copy"):
+        assert variables._load_is2variables() == listing
+
+
+@responses.activate
+def test_load_is2variables_server_error(variables_cache):
+    listing = {"ATL06": ["orbit_info/sc_orient"]}
+    responses.add(responses.GET, IS2_VARIABLES_URL, json=listing)
+    variables._load_is2variables()
+
+    # a 5xx that persists through the retries falls back to the cached copy
+    variables._is2variables_memo.clear()
+    responses.replace(responses.GET, IS2_VARIABLES_URL, status=503)
+    with pytest.warns(UserWarning, match="using the cached copy"):
+        assert variables._load_is2variables() == listing
+
+    # but a client error is still raised
+    variables._is2variables_memo.clear()
+    responses.replace(responses.GET, IS2_VARIABLES_URL, status=404)
+    with pytest.raises(requests.HTTPError):
+        variables._load_is2variables()
+
+
+@pytest.fixture
+def atl06_vars(monkeypatch):
+    monkeypatch.setattr(variables.is2ref, "latest_version", lambda product: "006")
+    avail = [
+        "ancillary_data/atlas_sdp_gps_epoch",
+        "orbit_info/sc_orient",
+        "orbit_info/sc_orient_time",
+    ]
+    for gt in ["gt1l", "gt1r", "gt2l"]:
+        avail += [
+            f"{gt}/land_ice_segments/h_li",
+            f"{gt}/land_ice_segments/latitude",
+            f"{gt}/land_ice_segments/geophysical/tide_ocean",
+        ]
+    return variables.Variables(product="ATL06", avail=avail)
+
+
+def test_append_beams_and_keywords(atl06_vars):
+    atl06_vars.append(var_list=["h_li", "sc_orient"])
+    atl06_vars.append(beam_list=["gt1l", "gt2l"], keyword_list=["geophysical"])
+    # repeated appends do not duplicate paths
+    atl06_vars.append(var_list=["h_li"], beam_list=["gt1l"])
+
+    assert atl06_vars.wanted == {
+        "h_li": [
+            "gt1l/land_ice_segments/h_li",
+            "gt1r/land_ice_segments/h_li",
+            "gt2l/land_ice_segments/h_li",
+        ],
+        "sc_orient": ["orbit_info/sc_orient"],
+        "tide_ocean": [
+            "gt1l/land_ice_segments/geophysical/tide_ocean",
+            "gt2l/land_ice_segments/geophysical/tide_ocean",
+        ],
+    }
+
+
+def test_remove_beams_and_keywords(atl06_vars):
+    atl06_vars.append(var_list=["h_li", "latitude", "tide_ocean"])
+    atl06_vars.remove(beam_list=["gt1r"])
+    atl06_vars.remove(var_list=["latitude"], keyword_list=["land_ice_segments"])
+    atl06_vars.remove(beam_list=["gt1l", "gt2l"], keyword_list=["geophysical"])
+
+    assert atl06_vars.wanted == {
+        "h_li": ["gt1l/land_ice_segments/h_li", "gt2l/land_ice_segments/h_li"],
+    }
+
+
+def test_append_patterns(atl06_vars):
+    atl06_vars.append(
+        patterns=["gt?l/land_ice_segments/h_li", re.compile(r".*/geophysical/tide_\w+")]
+    )
+    atl06_vars.append(beam_list=["gt1r"], patterns=["*/latitude"])
+
+    assert atl06_vars.wanted == {
+        "h_li": ["gt1l/land_ice_segments/h_li", "gt2l/land_ice_segments/h_li"],
+        "latitude": ["gt1r/land_ice_segments/latitude"],
+        "tide_ocean": [
+            "gt1l/land_ice_segments/geophysical/tide_ocean",
+            "gt1r/land_ice_segments/geophysical/tide_ocean",
+            "gt2l/land_ice_segments/geophysical/tide_ocean",
+        ],
+    }
+
+    with pytest.raises(ValueError, match="No variable paths match the patterns"):
+        atl06_vars.append(patterns=["gt3*"])
+
+
+def test_avail_from_file_scanned_once(tmp_path, monkeypatch):
+    h5py = pytest.importorskip("h5py")
+    monkeypatch.setattr(variables, "_scanned_avail", {})
+
+    def write(fn, paths):
+        with h5py.File(fn, "w") as f:
+            f.attrs["short_name"] = b"ATL06"
+            f.create_group("METADATA/DatasetIdentification").attrs["VersionID"] = b"006"
+            for vpath in paths:
+                f[vpath] = [0]
+
+    full = tmp_path / "ATL06_20190221121851_08410203_006_02.h5"
+    write(full, ["orbit_info/sc_orient", "gt1l/land_ice_segments/h_li"])
+    exp = ["gt1l/land_ice_segments/h_li", "orbit_info/sc_orient"]
+    assert variables.Variables(path=str(full)).avail() == exp
+    assert list(variables._scanned_avail.values()) == [exp]
+    assert variables.Variables(path=str(full)).avail() == exp
+    assert len(variables._scanned_avail) == 1
+
+    # a variable subset of the same product and version has its own list
+    subset = tmp_path / "processed_ATL06_20190221121851_08410203_006_02.h5"
+    write(subset, ["gt1l/land_ice_segments/h_li"])
+    assert variables.Variables(path=str(subset)).avail() == [
+        "gt1l/land_ice_segments/h_li"
+    ]
+    assert len(variables._scanned_avail) == 2